@@ -0,0 +1,54 @@
+"""HTTP response caches for raw pages: file-per-URL DiskCache or SQLite PackCache."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from .base import VALIDATOR_HEADERS, CacheEntry, CacheStats, cache_key
+from .disk import DiskCache
+from .memory import MemoryCache
+from .pack import PACK_FILENAME, PackCache
+
+if TYPE_CHECKING:
+    from fightmatch.config import CacheConfig
+    from fightmatch.rawstore import ObjectStore
+
+CACHE_BACKENDS = ("files", "sqlite")
+
+# Anything fetch() can read through.
+Cache = DiskCache | PackCache | MemoryCache
+
+
+def open_cache(
+    config: CacheConfig, objects: ObjectStore | None = None
+) -> Cache:
+    """Cache for config.backend: "files" (DiskCache on objects) or "sqlite" (PackCache).
+
+    Wrapped in a MemoryCache tier when config.memory_bytes > 0.
+    """
+    backend: DiskCache | PackCache
+    if config.backend == "files":
+        backend = DiskCache.from_config(config, objects)
+    elif config.backend == "sqlite":
+        backend = PackCache.from_config(config)
+    else:
+        choices = ", ".join(CACHE_BACKENDS)
+        raise ValueError(f"Unknown cache backend {config.backend!r} (use: {choices})")
+    if config.memory_bytes > 0:
+        return MemoryCache(backend, config.memory_bytes)
+    return backend
+
+
+__all__ = [
+    "CACHE_BACKENDS",
+    "Cache",
+    "CacheEntry",
+    "CacheStats",
+    "DiskCache",
+    "MemoryCache",
+    "PACK_FILENAME",
+    "PackCache",
+    "VALIDATOR_HEADERS",
+    "cache_key",
+    "open_cache",
+]
@@ -0,0 +1,306 @@
+"""Pieces shared by cache backends: keys, validators, TTL policy, stats and eviction."""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+import tempfile
+import threading
+import time
+import zlib
+from abc import ABC, abstractmethod
+from collections.abc import Iterator, Sequence
+from contextlib import AbstractContextManager, contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows: KeyLocks then only serialize threads of one process
+    fcntl = None  # type: ignore[assignment]
+
+# Response headers kept next to a cached body so expired entries can be revalidated.
+VALIDATOR_HEADERS = ("ETag", "Last-Modified")
+LOCK_FILENAME = "cache.lock"
+LOCK_STRIPES = 64
+
+
+def cache_key(url: str) -> str:
+    """Stable key from URL (safe filename)."""
+    return hashlib.sha256(url.encode()).hexdigest()[:32]
+
+
+def atomic_write(path: Path, data: bytes) -> None:
+    """Write via a temp file in the same dir + rename: readers never see a partial file."""
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+class _LockFile:
+    """A lock file's descriptor and per-stripe thread locks, shared within a process."""
+
+    def __init__(self, path: Path, stripes: int):
+        self.path = path
+        self.threads = [threading.Lock() for _ in range(stripes)]
+        self.users = 0
+        self._fd: int | None = None
+        self._opening = threading.Lock()
+
+    def fileno(self) -> int:
+        with self._opening:
+            if self._fd is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            return self._fd
+
+    def close(self) -> None:
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+
+_lock_files: dict[str, _LockFile] = {}
+_lock_files_guard = threading.Lock()
+
+
+class KeyLocks:
+    """Advisory exclusive lock per key, shared by threads and processes.
+
+    Keys hash onto LOCK_STRIPES byte-range stripes of one lock file, held with
+    lockf(). Record locks drop when any descriptor of the process closes, so all
+    KeyLocks on a file share one descriptor and a threading.Lock per stripe.
+    """
+
+    def __init__(self, lock_path: Path, stripes: int = LOCK_STRIPES):
+        self.lock_path = Path(lock_path)
+        self._name = os.path.abspath(self.lock_path)
+        with _lock_files_guard:
+            shared = _lock_files.get(self._name)
+            if shared is None:
+                shared = _lock_files[self._name] = _LockFile(self.lock_path, stripes)
+            shared.users += 1
+        self._shared: _LockFile | None = shared
+
+    def stripe(self, key: str) -> int:
+        # crc32, not hash(): every process must map a key to the same stripe.
+        return zlib.crc32(key.encode()) % len(self._shared.threads)
+
+    @contextmanager
+    def hold(self, key: str) -> Iterator[None]:
+        stripe = self.stripe(key)
+        with self._shared.threads[stripe]:
+            if fcntl is None:
+                yield
+                return
+            fd = self._shared.fileno()
+            fcntl.lockf(fd, fcntl.LOCK_EX, 1, stripe)
+            try:
+                yield
+            finally:
+                fcntl.lockf(fd, fcntl.LOCK_UN, 1, stripe)
+
+    def close(self) -> None:
+        """Release this handle; the descriptor closes with the file's last handle."""
+        shared, self._shared = self._shared, None
+        if shared is None:
+            return
+        with _lock_files_guard:
+            shared.users -= 1
+            if shared.users == 0:
+                del _lock_files[self._name]
+                shared.close()
+
+
+class TTLPolicyMixin:
+    """ttl_for(url): first matching (regex, ttl) in ttl_policy, else ttl_seconds."""
+
+    ttl_seconds: float
+    ttl_policy: list[tuple[re.Pattern[str], float]]
+
+    def _set_ttl(
+        self, ttl_seconds: float, ttl_policy: Sequence[tuple[str, float]]
+    ) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.ttl_policy = [(re.compile(pat), ttl) for pat, ttl in ttl_policy]
+
+    def ttl_for(self, url: str) -> float:
+        """TTL for url: first matching ttl_policy pattern, else ttl_seconds."""
+        for pattern, ttl in self.ttl_policy:
+            if pattern.search(url):
+                return ttl
+        return self.ttl_seconds
+
+
+# Upper bound (seconds) of each age bucket in CacheStats.age_histogram.
+AGE_BUCKETS: tuple[tuple[str, float], ...] = (
+    ("<1h", 3600),
+    ("<1d", 86400),
+    ("<7d", 86400 * 7),
+    ("<30d", 86400 * 30),
+    (">=30d", float("inf")),
+)
+
+
+@dataclass
+class CacheEntry:
+    """One cached response as seen by stats/prune/verify."""
+
+    key: str
+    url: str | None
+    size: int  # bytes this entry keeps on disk (its object's, for a ref)
+    fetched_at: float
+    accessed_at: float
+    sha: str | None = None  # ObjectStore address the entry refers to, if any
+
+
+@dataclass
+class CacheStats:
+    entries: int = 0
+    bytes: int = 0
+    expired: int = 0
+    hits: int = 0
+    misses: int = 0
+    age_histogram: dict[str, int] = field(
+        default_factory=lambda: {label: 0 for label, _ in AGE_BUCKETS}
+    )
+
+    @property
+    def hit_rate(self) -> float | None:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else None
+
+
+class CacheAdminMixin(TTLPolicyMixin, ABC):
+    """Hit/miss counters, stats, and expiry/LRU pruning shared by cache backends.
+
+    Backends implement the abstract hooks. With max_bytes set, LRU entries are
+    evicted each time about a tenth of the budget is written, and on close().
+    lock(url) collapses concurrent misses for one URL into one download.
+    """
+
+    max_bytes: int | None
+
+    def _init_admin(self, max_bytes: int | None, lock_path: Path) -> None:
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._written_since_prune = 0
+        self._admin_lock = threading.Lock()
+        self._locks = KeyLocks(lock_path)
+
+    def lock(self, url: str) -> AbstractContextManager[None]:
+        """Context manager holding the advisory lock for url's cache key."""
+        return self._locks.hold(cache_key(url))
+
+    @abstractmethod
+    def iter_entries(self) -> Iterator[CacheEntry]:
+        ...
+
+    @abstractmethod
+    def remove(self, key: str) -> None:
+        ...
+
+    def invalidate(self, url: str) -> None:
+        """Drop url's entry, so the next fetch goes to the network whatever its TTL."""
+        self.remove(cache_key(url))
+
+    @abstractmethod
+    def _stored_counters(self) -> tuple[int, int]:
+        ...
+
+    @abstractmethod
+    def _save_counters(self, hits: int, misses: int) -> None:
+        ...
+
+    def _collect(self, removed: list[CacheEntry], kept: list[CacheEntry]) -> None:
+        """After prune(): free storage the removed entries shared; no-op by default."""
+
+    def _count(self, hit: bool) -> None:
+        with self._admin_lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def _wrote(self, nbytes: int) -> None:
+        if self.max_bytes is None:
+            return
+        with self._admin_lock:
+            self._written_since_prune += nbytes
+            due = self._written_since_prune >= max(1, self.max_bytes // 10)
+            if due:
+                self._written_since_prune = 0
+        if due:
+            self.prune()
+
+    def flush_counters(self) -> None:
+        """Add this session's hits/misses to the persisted totals."""
+        with self._admin_lock:
+            hits, misses = self.hits, self.misses
+            self.hits = self.misses = 0
+        if hits or misses:
+            # Read-modify-write; other processes may be flushing theirs too.
+            with self._locks.hold("counters"):
+                stored_hits, stored_misses = self._stored_counters()
+                self._save_counters(stored_hits + hits, stored_misses + misses)
+
+    def is_expired(self, entry: CacheEntry, now: float | None = None) -> bool:
+        ttl = self.ttl_for(entry.url) if entry.url else self.ttl_seconds
+        return (now or time.time()) - entry.fetched_at > ttl
+
+    def stats(self) -> CacheStats:
+        now = time.time()
+        stored_hits, stored_misses = self._stored_counters()
+        out = CacheStats(
+            hits=stored_hits + self.hits, misses=stored_misses + self.misses
+        )
+        for e in self.iter_entries():
+            out.entries += 1
+            out.bytes += e.size
+            if self.is_expired(e, now):
+                out.expired += 1
+            age = now - e.fetched_at
+            label = next(label for label, bound in AGE_BUCKETS if age < bound)
+            out.age_histogram[label] += 1
+        return out
+
+    def prune(
+        self, max_bytes: int | None = None, expired: bool = False
+    ) -> tuple[int, int]:
+        """Drop expired entries (if `expired`), then LRU entries until within budget.
+
+        Budget is max_bytes, else self.max_bytes. Returns (entries removed, bytes
+        freed). Expired entries are kept by default: fetch() revalidates them cheaply.
+        """
+        budget = self.max_bytes if max_bytes is None else max_bytes
+        now = time.time()
+        removed: list[CacheEntry] = []
+        live: list[CacheEntry] = []
+        for e in self.iter_entries():
+            if expired and self.is_expired(e, now):
+                self.remove(e.key)
+                removed.append(e)
+            else:
+                live.append(e)
+        if budget is not None:
+            total = sum(e.size for e in live)
+            live.sort(key=lambda e: e.accessed_at)
+            evicted = 0
+            for e in live:
+                if total <= budget:
+                    break
+                self.remove(e.key)
+                total -= e.size
+                removed.append(e)
+                evicted += 1
+            del live[:evicted]
+        if removed:
+            self._collect(removed, live)
+        return len(removed), sum(e.size for e in removed)
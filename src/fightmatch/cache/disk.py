@@ -0,0 +1,319 @@
+"""Disk cache with TTL for raw HTTP responses."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import time
+from collections.abc import Iterator, Sequence
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from .base import (
+    LOCK_FILENAME,
+    VALIDATOR_HEADERS,
+    CacheAdminMixin,
+    CacheEntry,
+    atomic_write,
+    cache_key,
+)
+
+if TYPE_CHECKING:
+    from fightmatch.config import CacheConfig
+    from fightmatch.rawstore import Body, ObjectStore
+
+COUNTERS_FILENAME = "counters.json"
+# `.cache` files start with this, then the body's sha256 hex and a newline.
+ENTRY_MAGIC = b"fmc1:"
+ENTRY_HEADER_SIZE = len(ENTRY_MAGIC) + 64 + 1
+# Temp files older than this are leftovers of a killed writer (see verify()).
+_STALE_TMP_SECONDS = 3600
+
+
+def _seal(data: bytes) -> bytes:
+    return ENTRY_MAGIC + hashlib.sha256(data).hexdigest().encode() + b"\n" + data
+
+
+def _unseal(raw: bytes) -> bytes | None:
+    """Body of a `.cache` file, or None if it fails its checksum."""
+    if not raw.startswith(ENTRY_MAGIC):
+        return raw  # written before entries carried a checksum
+    checksum = raw[len(ENTRY_MAGIC) : ENTRY_HEADER_SIZE - 1].decode("ascii", "replace")
+    data = raw[ENTRY_HEADER_SIZE:]
+    return data if hashlib.sha256(data).hexdigest() == checksum else None
+
+
+class DiskCache(CacheAdminMixin):
+    """TTL-based disk cache: cache_key(url) -> path, is_valid(ttl), read/write bytes.
+
+    Each body has a `<key>.meta` sidecar with its URL and validators; expired
+    bodies stay until overwritten so fetch() can revalidate them. With `objects`
+    set, an entry is a `<key>.ref` to the body's sha256 in that ObjectStore and
+    prune() frees objects nothing references. LRU order is each entry's atime,
+    set on every hit. Writes are atomic and checksummed, so a torn or corrupt
+    entry reads as a miss.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path,
+        ttl_seconds: float = 86400 * 7,
+        ttl_policy: Sequence[tuple[str, float]] = (),
+        objects: ObjectStore | None = None,
+        max_bytes: int | None = None,
+    ):
+        self.cache_dir = Path(cache_dir)
+        self._set_ttl(ttl_seconds, ttl_policy)
+        self._init_admin(max_bytes, self.cache_dir / LOCK_FILENAME)
+        self.objects = objects
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    @classmethod
+    def from_config(
+        cls, config: CacheConfig, objects: ObjectStore | None = None
+    ) -> DiskCache:
+        return cls(
+            config.dir, config.ttl_seconds, config.ttl_policy, objects, config.max_bytes
+        )
+
+    def _path(self, key: str) -> Path:
+        legacy = self.cache_dir / f"{key}.cache"
+        if self.objects is None:
+            return legacy
+        ref = self.cache_dir / f"{key}.ref"
+        # Entries written before the object store existed are still readable.
+        return legacy if not ref.exists() and legacy.exists() else ref
+
+    def _load(self, p: Path) -> bytes | None:
+        if p.suffix == ".ref" and self.objects is not None:
+            sha = p.read_text(encoding="ascii").strip()
+            data = self.objects.get(sha)
+            if data is None or hashlib.sha256(data).hexdigest() != sha:
+                return None
+            return data
+        return _unseal(p.read_bytes())
+
+    def _meta_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.meta"
+
+    def _meta(self, key: str) -> dict[str, str]:
+        try:
+            data = json.loads(self._meta_path(key).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def is_valid(self, key: str, ttl_seconds: float | None = None) -> bool:
+        """True if cached entry exists and is within TTL (default: self.ttl_seconds)."""
+        p = self._path(key)
+        if not p.exists():
+            return False
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        age = time.time() - p.stat().st_mtime
+        return age <= ttl
+
+    def read(self, key: str, ttl_seconds: float | None = None) -> bytes | None:
+        """Return cached bytes or None if missing/expired."""
+        if not self.is_valid(key, ttl_seconds):
+            return None
+        try:
+            return self._load(self._path(key))
+        except OSError:
+            return None
+
+    def read_stale(self, key: str) -> bytes | None:
+        """Return cached bytes regardless of TTL, or None if missing."""
+        try:
+            return self._load(self._path(key))
+        except OSError:
+            return None
+
+    def write(
+        self,
+        key: str,
+        data: bytes,
+        validators: dict[str, str] | None = None,
+        url: str | None = None,
+    ) -> None:
+        """Write bytes to cache, replacing any stored validators."""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        if self.objects is not None:
+            self._write_ref(key, self.objects.put(data))
+        else:
+            atomic_write(self._path(key), _seal(data))
+        self._write_meta(key, validators, url)
+
+    def _ref_sha(self, p: Path) -> str | None:
+        try:
+            return p.read_text(encoding="ascii").strip() or None
+        except (OSError, UnicodeDecodeError):
+            return None
+
+    def _size(self, p: Path, sha: str | None = None) -> int:
+        """Bytes entry file p keeps on disk: its object's for a ref, else its own."""
+        try:
+            if p.suffix != ".ref":
+                return p.stat().st_size
+            sha = sha or self._ref_sha(p)
+            return self.objects.path(sha).stat().st_size if self.objects and sha else 0
+        except OSError:
+            return 0
+
+    def _write_ref(self, key: str, sha: str) -> None:
+        atomic_write(self.cache_dir / f"{key}.ref", sha.encode("ascii"))
+        (self.cache_dir / f"{key}.cache").unlink(missing_ok=True)
+
+    def _write_meta(
+        self, key: str, validators: dict[str, str] | None, url: str | None
+    ) -> None:
+        meta = {**(validators or {}), **({"url": url} if url else {})}
+        if meta:
+            atomic_write(self._meta_path(key), json.dumps(meta).encode("utf-8"))
+        else:
+            self._meta_path(key).unlink(missing_ok=True)
+
+    def validators(self, key: str) -> dict[str, str]:
+        """Stored response validators for key ({} if none)."""
+        meta = self._meta(key)
+        return {h: meta[h] for h in VALIDATOR_HEADERS if meta.get(h)}
+
+    def touch(self, key: str) -> None:
+        """Mark an entry fresh again (e.g. after a 304 Not Modified)."""
+        try:
+            os.utime(self._path(key))
+        except OSError:
+            pass
+
+    def _mark_used(self, key: str) -> None:
+        """Bump atime (LRU order) without changing mtime (TTL)."""
+        p = self._path(key)
+        try:
+            os.utime(p, (time.time(), p.stat().st_mtime))
+        except OSError:
+            pass
+
+    def get_or_none(self, url: str) -> bytes | None:
+        """Convenience: key from url, return cached body or None (TTL from ttl_for)."""
+        hit = self.lookup(url)
+        return hit[0] if hit is not None else None
+
+    def lookup(self, url: str) -> tuple[bytes, float] | None:
+        """get_or_none(), plus the time the body was fetched (or last revalidated)."""
+        key = cache_key(url)
+        try:
+            fetched_at = self._path(key).stat().st_mtime
+        except OSError:
+            fetched_at = None
+        body = self.read(key, self.ttl_for(url)) if fetched_at is not None else None
+        self._count(body is not None)
+        if body is None:
+            return None
+        self._mark_used(key)
+        return body, fetched_at
+
+    def peek(self, url: str) -> bytes | None:
+        """get_or_none() without counting a lookup or bumping LRU order."""
+        return self.read(cache_key(url), self.ttl_for(url))
+
+    def get_stale(self, url: str) -> tuple[bytes, dict[str, str]] | None:
+        """Convenience: (expired body, validators) for url, or None if never cached."""
+        key = cache_key(url)
+        body = self.read_stale(key)
+        if body is None:
+            return None
+        return body, self.validators(key)
+
+    def set(
+        self, url: str, data: bytes, validators: dict[str, str] | None = None
+    ) -> None:
+        """Convenience: key from url, write body (and validators, if any)."""
+        key = cache_key(url)
+        self.write(key, data, validators, url=url)
+        self._wrote(self._size(self._path(key)))
+
+    def set_body(
+        self, url: str, body: Body, validators: dict[str, str] | None = None
+    ) -> None:
+        """set() for a streamed Body; a body already in `objects` is just referenced."""
+        if self.objects is None or not self.objects.exists(body.sha):
+            self.set(url, body.read(), validators)
+            return
+        key = cache_key(url)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._write_ref(key, body.sha)
+        self._write_meta(key, validators, url)
+        self._wrote(self._size(self.cache_dir / f"{key}.ref", body.sha))
+
+    def revalidated(self, url: str) -> None:
+        """Convenience: key from url, refresh mtime without rewriting the body."""
+        self.touch(cache_key(url))
+
+    # -- admin (stats / prune / verify) -------------------------------------
+
+    def iter_entries(self) -> Iterator[CacheEntry]:
+        for p in self.cache_dir.iterdir():
+            if p.suffix not in (".cache", ".ref"):
+                continue
+            try:
+                st = p.stat()
+            except OSError:
+                continue
+            sha = self._ref_sha(p) if p.suffix == ".ref" else None
+            yield CacheEntry(
+                key=p.stem,
+                url=self._meta(p.stem).get("url"),
+                size=self._size(p, sha),
+                fetched_at=st.st_mtime,
+                accessed_at=st.st_atime,
+                sha=sha,
+            )
+
+    def remove(self, key: str) -> None:
+        for suffix in (".cache", ".ref", ".meta"):
+            (self.cache_dir / f"{key}{suffix}").unlink(missing_ok=True)
+
+    def _collect(self, removed: list[CacheEntry], kept: list[CacheEntry]) -> None:
+        if self.objects is not None:
+            self.objects.discard({e.sha for e in removed if e.sha} - {e.sha for e in kept})
+
+    def verify(self, repair: bool = False) -> list[str]:
+        """Keys whose body cannot be read back (missing object, bad checksum).
+
+        With repair, also removes temp files left behind by killed writers.
+        """
+        bad = []
+        for e in self.iter_entries():
+            if self.read_stale(e.key) is None:
+                bad.append(e.key)
+                if repair:
+                    self.remove(e.key)
+        if repair:
+            cutoff = time.time() - _STALE_TMP_SECONDS
+            for p in self.cache_dir.glob(".*.tmp"):
+                try:
+                    if p.stat().st_mtime < cutoff:
+                        p.unlink()
+                except OSError:
+                    pass
+        return bad
+
+    def _stored_counters(self) -> tuple[int, int]:
+        try:
+            data = json.loads((self.cache_dir / COUNTERS_FILENAME).read_text())
+            return int(data.get("hits", 0)), int(data.get("misses", 0))
+        except (OSError, ValueError):
+            return 0, 0
+
+    def _save_counters(self, hits: int, misses: int) -> None:
+        atomic_write(
+            self.cache_dir / COUNTERS_FILENAME,
+            json.dumps({"hits": hits, "misses": misses}).encode("utf-8"),
+        )
+
+    def close(self) -> None:
+        """Persist hit/miss counters and enforce max_bytes."""
+        self.flush_counters()
+        if self.max_bytes is not None:
+            self.prune()
+        self._locks.close()
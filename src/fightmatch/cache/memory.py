@@ -0,0 +1,114 @@
+"""In-process LRU tier layered over a DiskCache/PackCache, bounded in bytes."""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any
+
+from .disk import DiskCache
+from .pack import PackCache
+
+if TYPE_CHECKING:
+    from fightmatch.rawstore import Body
+
+
+class MemoryCache:
+    """Keeps recently used bodies in memory so hot pages hit disk once per process.
+
+    Reads check memory first (honouring the backend's per-URL TTL), then fall back
+    to the backend and keep the result. Writes go to both tiers. hits/misses count
+    this tier only; everything else (stats, prune, verify, max_bytes, ...) is
+    delegated to the backend.
+    """
+
+    def __init__(self, backend: DiskCache | PackCache, capacity: int):
+        self.backend = backend
+        self.capacity = capacity  # bytes of bodies kept in memory
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, tuple[bytes, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.backend, name)
+
+    @property
+    def entries(self) -> int:
+        return len(self._entries)
+
+    def _put(self, url: str, data: bytes, fresh_at: float) -> None:
+        """Insert/refresh url; caller holds the lock."""
+        old = self._entries.pop(url, None)
+        if old is not None:
+            self.bytes -= len(old[0])
+        if len(data) > self.capacity:
+            return
+        self._entries[url] = (data, fresh_at)
+        self.bytes += len(data)
+        while self.bytes > self.capacity:
+            _, (evicted, _) = self._entries.popitem(last=False)
+            self.bytes -= len(evicted)
+
+    def get_or_none(self, url: str) -> bytes | None:
+        hit = self.lookup(url)
+        return hit[0] if hit is not None else None
+
+    def lookup(self, url: str) -> tuple[bytes, float] | None:
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is not None:
+                if time.time() - entry[1] <= self.backend.ttl_for(url):
+                    self._entries.move_to_end(url)
+                    self.hits += 1
+                    return entry
+                self.bytes -= len(entry[0])
+                del self._entries[url]
+            self.misses += 1
+        hit = self.backend.lookup(url)
+        if hit is None:
+            return None
+        body, fetched_at = hit
+        # Keep the backend's fetch time, so the copy expires when the entry does.
+        with self._lock:
+            self._put(url, body, fetched_at)
+        return hit
+
+    def get_stale(self, url: str) -> tuple[bytes, dict[str, str]] | None:
+        return self.backend.get_stale(url)
+
+    def set(
+        self, url: str, data: bytes, validators: dict[str, str] | None = None
+    ) -> None:
+        fetched_at = time.time()  # no later than the backend's own stamp
+        self.backend.set(url, data, validators)
+        with self._lock:
+            self._put(url, data, fetched_at)
+
+    def set_body(
+        self, url: str, body: Body, validators: dict[str, str] | None = None
+    ) -> None:
+        """Streamed bodies skip the memory tier; the next read loads them."""
+        self.backend.set_body(url, body, validators)
+        with self._lock:
+            old = self._entries.pop(url, None)
+            if old is not None:
+                self.bytes -= len(old[0])
+
+    def revalidated(self, url: str) -> None:
+        self.backend.revalidated(url)
+
+    def invalidate(self, url: str) -> None:
+        self.backend.invalidate(url)
+        with self._lock:
+            old = self._entries.pop(url, None)
+            if old is not None:
+                self.bytes -= len(old[0])
+
+    def close(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+        self.backend.close()
@@ -0,0 +1,241 @@
+"""SQLite pack cache: all cached bodies as BLOBs in one WAL-mode database file."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections.abc import Iterator, Sequence
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from .base import CacheAdminMixin, CacheEntry, cache_key
+
+if TYPE_CHECKING:
+    from fightmatch.config import CacheConfig
+    from fightmatch.rawstore import Body
+
+PACK_FILENAME = "cache.sqlite"
+CHUNK_SIZE = 64 * 1024
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key        TEXT PRIMARY KEY,
+    url        TEXT NOT NULL,
+    fetched_at REAL NOT NULL,  -- unix time; refreshed on 304 revalidation
+    size       INTEGER NOT NULL,
+    checksum   TEXT NOT NULL,  -- sha256 of body
+    validators TEXT,           -- JSON {ETag, Last-Modified}
+    body       BLOB NOT NULL,
+    accessed_at REAL           -- unix time of last hit (LRU order)
+);
+CREATE TABLE IF NOT EXISTS counters (
+    name  TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+# Hits only bump accessed_at in memory; rows are updated in batches of this size.
+_TOUCH_BATCH = 256
+
+
+class PackCache(CacheAdminMixin):
+    """Drop-in alternative to DiskCache keyed by cache_key(url).
+
+    Same URL-level API (get_or_none / set / get_stale / revalidated / ttl_for) and
+    the same admin API (stats / prune / verify); lookups are primary-key point
+    reads and the whole cache is one file to copy.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        ttl_seconds: float = 86400 * 7,
+        ttl_policy: Sequence[tuple[str, float]] = (),
+        max_bytes: int | None = None,
+    ):
+        self.path = Path(path)
+        self._set_ttl(ttl_seconds, ttl_policy)
+        self._init_admin(max_bytes, self.path.with_name(f"{self.path.name}.lock"))
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._touched: dict[str, float] = {}
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        columns = {r[1] for r in self._conn.execute("PRAGMA table_info(entries)")}
+        if "accessed_at" not in columns:  # packs created before LRU eviction
+            self._conn.execute("ALTER TABLE entries ADD COLUMN accessed_at REAL")
+        self._conn.commit()
+
+    @classmethod
+    def from_config(cls, config: CacheConfig) -> PackCache:
+        return cls(
+            config.dir / PACK_FILENAME,
+            config.ttl_seconds,
+            config.ttl_policy,
+            config.max_bytes,
+        )
+
+    def _row(self, url: str, columns: str) -> tuple | None:
+        with self._lock:
+            return self._conn.execute(
+                f"SELECT {columns} FROM entries WHERE key = ?", (cache_key(url),)
+            ).fetchone()
+
+    def get_or_none(self, url: str) -> bytes | None:
+        """Cached body for url, or None if missing/expired (TTL from ttl_for)."""
+        hit = self.lookup(url)
+        return hit[0] if hit is not None else None
+
+    def lookup(self, url: str) -> tuple[bytes, float] | None:
+        """get_or_none(), plus the time the body was fetched (or last revalidated)."""
+        row = self._row(url, "body, fetched_at")
+        if row is None or time.time() - row[1] > self.ttl_for(url):
+            self._count(False)
+            return None
+        self._count(True)
+        with self._lock:
+            self._touched[cache_key(url)] = time.time()
+            if len(self._touched) >= _TOUCH_BATCH:
+                self._flush_touched()
+        return bytes(row[0]), row[1]
+
+    def peek(self, url: str) -> bytes | None:
+        """get_or_none() without counting a lookup or bumping LRU order."""
+        row = self._row(url, "body, fetched_at")
+        if row is None or time.time() - row[1] > self.ttl_for(url):
+            return None
+        return bytes(row[0])
+
+    def get_stale(self, url: str) -> tuple[bytes, dict[str, str]] | None:
+        """(body regardless of TTL, validators) for url, or None if never cached."""
+        row = self._row(url, "body, validators")
+        if row is None:
+            return None
+        validators = json.loads(row[1]) if row[1] else {}
+        return bytes(row[0]), validators
+
+    def set(
+        self, url: str, data: bytes, validators: dict[str, str] | None = None
+    ) -> None:
+        checksum = hashlib.sha256(data).hexdigest()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (key, url, fetched_at, size, "
+                "checksum, validators, body, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    cache_key(url),
+                    url,
+                    time.time(),
+                    len(data),
+                    checksum,
+                    json.dumps(validators) if validators else None,
+                    sqlite3.Binary(data),
+                    time.time(),
+                ),
+            )
+            self._conn.commit()
+        self._wrote(len(data))
+
+    def set_body(
+        self, url: str, body: Body, validators: dict[str, str] | None = None
+    ) -> None:
+        """set() for a streamed Body: the BLOB is filled in chunks from its view."""
+        with self._lock, body.view() as buf:
+            cur = self._conn.execute(
+                "INSERT OR REPLACE INTO entries (key, url, fetched_at, size, "
+                "checksum, validators, body, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, zeroblob(?), ?)",
+                (
+                    cache_key(url),
+                    url,
+                    time.time(),
+                    body.size,
+                    body.sha,
+                    json.dumps(validators) if validators else None,
+                    body.size,
+                    time.time(),
+                ),
+            )
+            if body.size:
+                with self._conn.blobopen("entries", "body", cur.lastrowid) as blob:
+                    for start in range(0, body.size, CHUNK_SIZE):
+                        blob.write(buf[start : start + CHUNK_SIZE])
+            self._conn.commit()
+        self._wrote(body.size)
+
+    def revalidated(self, url: str) -> None:
+        """Refresh fetched_at without rewriting the body (after a 304)."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE entries SET fetched_at = ? WHERE key = ?",
+                (time.time(), cache_key(url)),
+            )
+            self._conn.commit()
+
+    # -- admin (stats / prune / verify) -------------------------------------
+
+    def _flush_touched(self) -> None:
+        """Write pending accessed_at updates; caller holds self._lock."""
+        if self._touched:
+            self._conn.executemany(
+                "UPDATE entries SET accessed_at = ? WHERE key = ?",
+                [(ts, key) for key, ts in self._touched.items()],
+            )
+            self._conn.commit()
+            self._touched.clear()
+
+    def iter_entries(self) -> Iterator[CacheEntry]:
+        with self._lock:
+            self._flush_touched()
+            rows = self._conn.execute(
+                "SELECT key, url, size, fetched_at, "
+                "COALESCE(accessed_at, fetched_at) FROM entries"
+            ).fetchall()
+        for key, url, size, fetched_at, accessed_at in rows:
+            yield CacheEntry(key, url, size, fetched_at, accessed_at)
+
+    def remove(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def verify(self, repair: bool = False) -> list[str]:
+        """Keys whose body no longer matches its stored checksum."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key, checksum, body FROM entries"
+            ).fetchall()
+        bad = [k for k, c, body in rows if hashlib.sha256(body).hexdigest() != c]
+        if repair:
+            for key in bad:
+                self.remove(key)
+        return bad
+
+    def _stored_counters(self) -> tuple[int, int]:
+        with self._lock:
+            rows = dict(self._conn.execute("SELECT name, value FROM counters"))
+        return rows.get("hits", 0), rows.get("misses", 0)
+
+    def _save_counters(self, hits: int, misses: int) -> None:
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO counters (name, value) VALUES (?, ?)",
+                [("hits", hits), ("misses", misses)],
+            )
+            self._conn.commit()
+
+    def close(self) -> None:
+        """Persist counters and LRU timestamps, enforce max_bytes, close the file."""
+        self.flush_counters()
+        if self.max_bytes is not None:
+            self.prune()
+        with self._lock:
+            self._flush_touched()
+            self._conn.close()
+        self._locks.close()
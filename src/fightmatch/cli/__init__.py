@@ -10,10 +10,21 @@ from __future__ import annotations
 import argparse
 import sys
 
+from fightmatch.cache import CACHE_BACKENDS
 from fightmatch.engine.whatif import SCENARIOS
 
+from ._util import parse_size
 from .analytics import cmd_fighter_profile, cmd_simulate
-from .ingest import cmd_build_dataset, cmd_features, cmd_scrape
+from .bench import cmd_bench
+from .cache import cmd_cache
+from .ingest import (
+    cmd_build_dataset,
+    cmd_features,
+    cmd_ingest,
+    cmd_scrape,
+    cmd_scrape_fighters,
+    cmd_scrape_worker,
+)
 from .recommend import cmd_demo, cmd_divisions, cmd_recommend, cmd_recommend_all
 
 
@@ -29,13 +40,251 @@ def main() -> int:
     p_scrape.add_argument("--since", default="2020-01-01")
     p_scrape.add_argument("--out", default="data/raw")
     p_scrape.add_argument("--division", default="")
+    p_scrape.add_argument(
+        "--concurrency",
+        type=int,
+        default=None,
+        help="Parallel fetch workers sharing one rate limit (default: 2)",
+    )
+    p_scrape.add_argument(
+        "--max-rate",
+        type=float,
+        default=None,
+        dest="max_rate",
+        help="Ceiling for the adaptive rate limiter in requests/second (default: 1 / rate limit interval)",
+    )
+    p_scrape.add_argument(
+        "--resume",
+        action="store_true",
+        default=False,
+        help="Skip events/fights the scrape manifest marks done; retry the rest",
+    )
+    p_scrape.add_argument(
+        "--incremental",
+        action="store_true",
+        default=False,
+        help="Read the paginated listing newest-first; stop at the first known event",
+    )
+    p_scrape.add_argument(
+        "--no-fighters",
+        action="store_true",
+        default=False,
+        dest="no_fighters",
+        help="Skip fighter-details pages (height, reach, stance, date of birth)",
+    )
+    p_scrape.add_argument(
+        "--enqueue",
+        action="store_true",
+        default=False,
+        help="Only discover events and queue them for 'fightmatch scrape-worker'",
+    )
+    p_scrape.add_argument(
+        "--cache-backend",
+        choices=CACHE_BACKENDS,
+        default="files",
+        dest="cache_backend",
+        help="HTTP cache storage: one file per URL, or a single SQLite pack file",
+    )
+    p_scrape.add_argument(
+        "--cache-max-bytes",
+        type=parse_size,
+        default=None,
+        dest="cache_max_bytes",
+        help="Evict least-recently-used cache entries beyond this size (e.g. 2G)",
+    )
+    p_scrape.add_argument(
+        "--cache-memory-bytes",
+        type=parse_size,
+        default=None,
+        dest="cache_memory_bytes",
+        help="In-memory LRU tier in front of the cache (default 64M; 0 disables)",
+    )
     p_scrape.set_defaults(func=cmd_scrape)
 
+    # ingest
+    p_ingest = sub.add_parser(
+        "ingest",
+        help="Scrape and build the dataset in one pass, parsing pages as they arrive",
+    )
+    p_ingest.add_argument("--since", default="2020-01-01")
+    p_ingest.add_argument("--raw", default="data/raw")
+    p_ingest.add_argument("--out", default="data/processed")
+    p_ingest.add_argument("--division", default="")
+    p_ingest.add_argument("--concurrency", type=int, default=None)
+    p_ingest.add_argument(
+        "--parse-workers",
+        type=int,
+        default=2,
+        dest="parse_workers",
+        help="Threads parsing fetched pages while the scrape continues (default: 2)",
+    )
+    p_ingest.add_argument("--max-rate", type=float, default=None, dest="max_rate")
+    p_ingest.add_argument("--resume", action="store_true", default=False)
+    p_ingest.add_argument("--incremental", action="store_true", default=False)
+    p_ingest.add_argument(
+        "--no-fighters", action="store_true", default=False, dest="no_fighters"
+    )
+    p_ingest.add_argument(
+        "--cache-backend",
+        choices=CACHE_BACKENDS,
+        default="files",
+        dest="cache_backend",
+    )
+    p_ingest.add_argument(
+        "--cache-max-bytes", type=parse_size, default=None, dest="cache_max_bytes"
+    )
+    p_ingest.add_argument(
+        "--cache-memory-bytes", type=parse_size, default=None, dest="cache_memory_bytes"
+    )
+    p_ingest.set_defaults(func=cmd_ingest)
+
+    # scrape-worker
+    p_worker = sub.add_parser(
+        "scrape-worker",
+        help="Claim and fetch jobs queued by 'scrape --enqueue' until drained",
+    )
+    p_worker.add_argument("--raw", default="data/raw")
+    p_worker.add_argument("--concurrency", type=int, default=None)
+    p_worker.add_argument(
+        "--max-rate",
+        type=float,
+        default=None,
+        dest="max_rate",
+        help="Ceiling for the rate limiter all workers share (requests/second)",
+    )
+    p_worker.add_argument(
+        "--lease-seconds",
+        type=float,
+        default=60.0,
+        dest="lease_seconds",
+        help="A job is handed to another worker if not renewed within this time",
+    )
+    p_worker.add_argument(
+        "--worker-id", default=None, dest="worker_id", help="Default: host:pid"
+    )
+    p_worker.add_argument(
+        "--cache-backend",
+        choices=CACHE_BACKENDS,
+        default="files",
+        dest="cache_backend",
+    )
+    p_worker.add_argument(
+        "--cache-max-bytes", type=parse_size, default=None, dest="cache_max_bytes"
+    )
+    p_worker.add_argument(
+        "--cache-memory-bytes", type=parse_size, default=None, dest="cache_memory_bytes"
+    )
+    p_worker.set_defaults(func=cmd_scrape_worker)
+
+    # scrape-fighters
+    p_fighters = sub.add_parser(
+        "scrape-fighters",
+        help="Fetch fighter-details pages for every fighter in scraped events",
+    )
+    p_fighters.add_argument("--raw", default="data/raw")
+    p_fighters.add_argument("--concurrency", type=int, default=None)
+    p_fighters.add_argument("--max-rate", type=float, default=None, dest="max_rate")
+    p_fighters.add_argument(
+        "--resume",
+        action="store_true",
+        default=False,
+        help="Skip fighters the scrape manifest marks done",
+    )
+    p_fighters.add_argument(
+        "--cache-backend",
+        choices=CACHE_BACKENDS,
+        default="files",
+        dest="cache_backend",
+    )
+    p_fighters.add_argument(
+        "--cache-max-bytes", type=parse_size, default=None, dest="cache_max_bytes"
+    )
+    p_fighters.add_argument(
+        "--cache-memory-bytes", type=parse_size, default=None, dest="cache_memory_bytes"
+    )
+    p_fighters.set_defaults(func=cmd_scrape_fighters)
+
+    # cache
+    p_cache = sub.add_parser("cache", help="Inspect and maintain the raw HTTP cache")
+    p_cache.add_argument("action", choices=["stats", "prune", "verify", "warm"])
+    p_cache.add_argument("--raw", default="data/raw")
+    p_cache.add_argument("--backend", choices=CACHE_BACKENDS, default="files")
+    p_cache.add_argument(
+        "--max-bytes",
+        type=parse_size,
+        default=None,
+        dest="max_bytes",
+        help="prune: evict least-recently-used entries beyond this size (e.g. 500M)",
+    )
+    p_cache.add_argument(
+        "--expired", action="store_true", help="prune: also drop expired entries"
+    )
+    p_cache.add_argument(
+        "--repair", action="store_true", help="verify: remove unreadable entries"
+    )
+    p_cache.add_argument(
+        "--concurrency", type=int, default=None, help="warm: parallel fetch workers"
+    )
+    p_cache.set_defaults(func=cmd_cache)
+
+    # bench
+    p_bench = sub.add_parser(
+        "bench", help="Offline benchmarks against a replayed scrape corpus"
+    )
+    p_bench.add_argument("scenario", choices=["scrape"])
+    p_bench.add_argument(
+        "--corpus", default="data/raw", help="Raw dir recorded by a previous scrape"
+    )
+    p_bench.add_argument("--since", default="2000-01-01")
+    p_bench.add_argument("--concurrency", type=int, default=None)
+    p_bench.add_argument(
+        "--latency-ms", type=float, default=50.0, help="Simulated server latency"
+    )
+    p_bench.add_argument("--jitter-ms", type=float, default=20.0)
+    p_bench.add_argument(
+        "--error-rate", type=float, default=0.0, help="Fraction of 503 responses"
+    )
+    p_bench.add_argument(
+        "--throttle-rate", type=float, default=0.0, help="Fraction of 429 responses"
+    )
+    p_bench.add_argument(
+        "--retry-after", type=float, default=1.0, help="Retry-After sent with 429s"
+    )
+    p_bench.add_argument(
+        "--rate",
+        type=float,
+        default=0.0,
+        help="Starting rate limit in requests/second (default: unlimited)",
+    )
+    p_bench.add_argument("--max-rate", type=float, default=None, dest="max_rate")
+    p_bench.add_argument(
+        "--cache-backend", choices=CACHE_BACKENDS, default="files", dest="cache_backend"
+    )
+    p_bench.add_argument(
+        "--cache-memory-bytes", type=parse_size, default=None, dest="cache_memory_bytes"
+    )
+    p_bench.add_argument("--seed", type=int, default=0)
+    p_bench.add_argument("--json", action="store_true", help="Print results as JSON")
+    p_bench.set_defaults(func=cmd_bench)
+
     # build-dataset
     p_build = sub.add_parser("build-dataset", help="Parse raw HTML into JSON/JSONL")
     p_build.add_argument("--raw", default="data/raw")
     p_build.add_argument("--out", default="data/processed")
     p_build.add_argument("--division", default="")
+    p_build.add_argument(
+        "--no-parse-cache",
+        action="store_true",
+        default=False,
+        dest="no_parse_cache",
+        help="Re-parse every page instead of reusing results for unchanged HTML",
+    )
+    p_build.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Parse pages in N processes (output is identical to --jobs 1)",
+    )
     p_build.set_defaults(func=cmd_build_dataset)
 
     # features
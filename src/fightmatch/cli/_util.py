@@ -2,12 +2,14 @@
 
 from __future__ import annotations
 
+import argparse
 import json
 from datetime import datetime
 from pathlib import Path
 
 from fightmatch.config import normalize_division
 from fightmatch.match import load_features_csv
+from fightmatch.scrape.columnar import ColumnTable, load_table
 
 
 def parse_since(s: str) -> str:
@@ -16,6 +18,27 @@ def parse_since(s: str) -> str:
     raise ValueError("--since must be YYYY-MM-DD")
 
 
+_SIZE_UNITS = {"": 1, "K": 1024, "M": 1024**2, "G": 1024**3, "T": 1024**4}
+
+
+def parse_size(s: str) -> int:
+    """'500M' / '2G' / '1048576' -> bytes (argparse type)."""
+    text = s.strip().upper().removesuffix("B").removesuffix("I")
+    unit = text[-1:] if text[-1:] in _SIZE_UNITS else ""
+    try:
+        return int(float(text[: len(text) - len(unit)]) * _SIZE_UNITS[unit])
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid size: {s!r} (e.g. 500M, 2G)")
+
+
+def format_bytes(n: float) -> str:
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if abs(n) < 1024:
+            return f"{n:.0f} {unit}" if unit == "B" else f"{n:.1f} {unit}"
+        n /= 1024
+    return f"{n:.1f} TiB"
+
+
 def division_slug(label: str) -> str:
     norm = normalize_division(label) or label.strip().lower()
     slug = norm.replace(" ", "-").replace("/", "-")
@@ -37,7 +60,13 @@ def detect_divisions(
             norm = normalize_division(wc)
             if norm and norm not in divisions:
                 divisions[norm] = wc or norm.title()
-    if not divisions:
+    if not divisions and (table := _load_bouts_table(processed_dir)) is not None:
+        # Dictionary order is first-appearance order, as in bouts.json.
+        for wc in table.dictionary("weight_class"):
+            norm = normalize_division(wc)
+            if norm and norm not in divisions:
+                divisions[norm] = wc or norm.title()
+    elif not divisions:
         bouts_path = processed_dir / "bouts.json"
         if bouts_path.exists():
             try:
@@ -52,8 +81,26 @@ def detect_divisions(
     return sorted(divisions.items(), key=lambda kv: kv[1].lower())
 
 
+def _load_bouts_table(processed_dir: Path) -> ColumnTable | None:
+    try:
+        return load_table(processed_dir, "bouts")
+    except (OSError, ValueError):
+        return None
+
+
 def load_recent_pairs(processed_dir: Path) -> set[tuple[str, str]]:
     recent_pairs: set[tuple[str, str]] = set()
+    table = _load_bouts_table(processed_dir)
+    if table is not None:
+        # Dedupe on dictionary codes, then decode each distinct pair once.
+        code_pairs = set(zip(table.raw("red_fighter_id"), table.raw("blue_fighter_id")))
+        ids = table.dictionary("red_fighter_id"), table.dictionary("blue_fighter_id")
+        for r, bl in code_pairs:
+            if r >= 0 and bl >= 0:
+                a, b = ids[0][r], ids[1][bl]
+                if a and b:
+                    recent_pairs.add((min(a, b), max(a, b)))
+        return recent_pairs
     bouts_path = processed_dir / "bouts.json"
     if processed_dir.exists() and bouts_path.exists():
         try:
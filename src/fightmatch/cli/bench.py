@@ -0,0 +1,86 @@
+"""CLI command: bench (offline performance scenarios)."""
+
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+
+from fightmatch.config import CacheConfig, ScrapeConfig
+from fightmatch.scrape.bench import BenchPass, bench_scrape
+from fightmatch.scrape.replay import ReplayAdapter, load_corpus
+from fightmatch.utils.log import log
+
+from ._util import format_bytes
+
+
+def cmd_bench(args: argparse.Namespace) -> int:
+    # Only one scenario so far; argparse restricts args.scenario to it.
+    config = ScrapeConfig(rate_limit_seconds=0, rate_limit_jitter=0)
+    if args.rate:
+        config.rate_limit_seconds = 1.0 / args.rate
+        config.max_rate = args.max_rate or args.rate
+    try:
+        pages = load_corpus(Path(args.corpus), config)
+    except FileNotFoundError as e:
+        log(str(e))
+        log(
+            "  Record a corpus first: "
+            f"fightmatch scrape --since YYYY-MM-DD --out {args.corpus}"
+        )
+        return 1
+    log(f"Replaying {len(pages)} recorded pages from {args.corpus}")
+    adapter = ReplayAdapter(
+        pages,
+        latency=args.latency_ms / 1000,
+        latency_jitter=args.jitter_ms / 1000,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        retry_after=args.retry_after,
+        seed=args.seed,
+    )
+    cache_config = CacheConfig(backend=args.cache_backend)
+    if args.cache_memory_bytes is not None:
+        cache_config.memory_bytes = args.cache_memory_bytes
+    results = bench_scrape(
+        pages,
+        since_date=args.since,
+        config=config,
+        cache_config=cache_config,
+        concurrency=args.concurrency,
+        adapter=adapter,
+    )
+    if args.json:
+        print(json.dumps([r.as_dict() for r in results], indent=2))
+    else:
+        for r in results:
+            _print_pass(r)
+    return 0
+
+
+def _print_pass(r: BenchPass) -> None:
+    def ms(v: float | None) -> str:
+        return "n/a" if v is None else f"{v:.1f} ms"
+
+    hit_rate = "n/a" if r.cache_hit_rate is None else f"{r.cache_hit_rate:.1%}"
+    print(
+        f"[{r.name}] {r.pages} pages in {r.seconds:.2f}s "
+        f"= {r.pages_per_sec:.1f} pages/sec"
+    )
+    print(f"  fetch latency  p50 {ms(r.p50_ms)}  p99 {ms(r.p99_ms)}")
+    print(
+        f"  cache          hit rate {hit_rate} "
+        f"(hit={r.outcomes.get('hit', 0)}, "
+        f"revalidated={r.outcomes.get('revalidated', 0)}, "
+        f"miss={r.outcomes.get('miss', 0)})"
+    )
+    t = r.time_seconds
+    print(
+        f"  time           network {t['network']:.2f}s, "
+        f"rate limit {t['rate_limit']:.2f}s, backoff {t['backoff']:.2f}s, "
+        f"disk {t['disk']:.2f}s"
+    )
+    print(
+        f"  network        {r.requests} requests, {format_bytes(r.network_bytes)}, "
+        f"{r.errors} errors"
+    )
@@ -0,0 +1,65 @@
+"""CLI command: cache (stats, prune, verify, warm) for the raw HTTP cache."""
+
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+
+from fightmatch.config import CacheConfig, ScrapeConfig
+from fightmatch.scrape.manifest import ScrapeManifest
+from fightmatch.scrape.ufcstats_client import open_stores, warm_cache
+from fightmatch.utils.log import log
+
+from ._util import format_bytes
+
+
+def cmd_cache(args: argparse.Namespace) -> int:
+    raw = Path(args.raw)
+    if not (raw / "ufcstats").exists():
+        log(f"No cache found under {raw / 'ufcstats'}")
+        log(f"  Run: fightmatch scrape --since YYYY-MM-DD --out {raw}")
+        return 1
+    raw_store, cache = open_stores(
+        raw, CacheConfig(backend=args.backend, max_bytes=args.max_bytes)
+    )
+    try:
+        if args.action == "stats":
+            _print_stats(cache)
+        elif args.action == "prune":
+            if cache.max_bytes is None and not args.expired:
+                log("Nothing to do: pass --max-bytes SIZE and/or --expired")
+                return 1
+            removed, freed = cache.prune(expired=args.expired)
+            print(f"Pruned {removed} entries, freed {format_bytes(freed)}")
+        elif args.action == "verify":
+            bad = cache.verify(repair=args.repair)
+            for key in bad:
+                print(f"  bad entry: {key}")
+            verb = "removed" if args.repair else "found"
+            print(f"Verify: {len(bad)} bad entries {verb}")
+            return 1 if bad and not args.repair else 0
+        elif args.action == "warm":
+            manifest = ScrapeManifest.for_raw_dir(raw)
+            urls = manifest.urls()
+            manifest.close()
+            fetched = warm_cache(
+                urls, cache, ScrapeConfig(), concurrency=args.concurrency
+            )
+            print(f"Warm: {fetched} of {len(urls)} manifest URLs fetched")
+        return 0
+    finally:
+        cache.close()
+        raw_store.close()
+
+
+def _print_stats(cache) -> None:
+    st = cache.stats()
+    hit_rate = f"{st.hit_rate:.1%}" if st.hit_rate is not None else "n/a"
+    print(f"Entries:  {st.entries} ({st.expired} expired)")
+    print(f"Size:     {format_bytes(st.bytes)}")
+    if cache.max_bytes is not None:
+        print(f"Budget:   {format_bytes(cache.max_bytes)}")
+    print(f"Hits:     {st.hits}  Misses: {st.misses}  Hit rate: {hit_rate}")
+    print("Age:")
+    for label, n in st.age_histogram.items():
+        print(f"  {label:>6}  {n}")
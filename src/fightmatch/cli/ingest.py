@@ -1,4 +1,4 @@
-"""CLI commands: scrape, build-dataset, features."""
+"""CLI commands: scrape, ingest, build-dataset, features."""
 
 from __future__ import annotations
 
@@ -8,11 +8,14 @@ from pathlib import Path
 
 import requests
 
-from fightmatch.config import ScrapeConfig
+from fightmatch.config import CacheConfig, ScrapeConfig
 from fightmatch.match import load_features_csv
 from fightmatch.match.features import build_features
-from fightmatch.scrape import scrape_since
+from fightmatch.rawstore import RawStore
+from fightmatch.scrape import ingest_since, scrape_fighters, scrape_since
+from fightmatch.scrape.parse import parser_backend
 from fightmatch.scrape.store import build_dataset
+from fightmatch.scrape.worker import enqueue_since, run_worker
 from fightmatch.utils.log import log
 
 from ._util import parse_since
@@ -27,7 +30,30 @@ def cmd_scrape(args: argparse.Namespace) -> int:
         + (f" (division={division})" if division else "")
     )
     try:
-        scrape_since(since, out, config=ScrapeConfig(), division=division)
+        if args.enqueue:
+            enqueue_since(
+                since,
+                out,
+                config=_scrape_config(args),
+                division=division,
+                resume=args.resume,
+                incremental=args.incremental,
+                fighters=not args.no_fighters,
+                cache_config=_cache_config(args),
+            )
+            log(f"Start workers with: fightmatch scrape-worker --raw {out}")
+            return 0
+        scrape_since(
+            since,
+            out,
+            config=_scrape_config(args),
+            division=division,
+            concurrency=args.concurrency,
+            resume=args.resume,
+            incremental=args.incremental,
+            fighters=not args.no_fighters,
+            cache_config=_cache_config(args),
+        )
         return 0
     except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
         log(f"Network error: could not reach UFCStats ({type(e).__name__}).")
@@ -43,12 +69,98 @@ def cmd_scrape(args: argparse.Namespace) -> int:
         return 1
 
 
-def _suggest_offline_path(raw_dir: Path) -> None:
-    cached_events = (
-        list((raw_dir / "ufcstats" / "events").glob("*.html"))
-        if raw_dir.exists()
-        else []
+def cmd_ingest(args: argparse.Namespace) -> int:
+    raw = Path(args.raw)
+    out = Path(args.out)
+    since = parse_since(args.since)
+    division = (args.division or "").strip()
+    log(
+        f"Ingesting UFCStats since {since} -> {raw} -> {out}"
+        + (f" (division={division})" if division else "")
+        + f" [HTML parser: {parser_backend()}, {args.parse_workers} parse workers]"
     )
+    try:
+        ingest_since(
+            since,
+            raw,
+            out,
+            config=_scrape_config(args),
+            division=division,
+            concurrency=args.concurrency,
+            parse_workers=max(1, args.parse_workers),
+            resume=args.resume,
+            incremental=args.incremental,
+            fighters=not args.no_fighters,
+            cache_config=_cache_config(args),
+        )
+    except requests.exceptions.RequestException as e:
+        log(f"UFCStats request failed: {e}")
+        _suggest_offline_path(raw)
+        return 1
+    return 0
+
+
+def cmd_scrape_worker(args: argparse.Namespace) -> int:
+    raw = Path(args.raw)
+    if not (raw / "ufcstats" / "queue.sqlite").exists():
+        log(f"No work queue under {raw}. Seed one with 'fightmatch scrape --enqueue'.")
+        return 1
+    try:
+        run_worker(
+            raw,
+            config=_scrape_config(args),
+            concurrency=args.concurrency,
+            cache_config=_cache_config(args),
+            worker_id=args.worker_id,
+            lease_seconds=args.lease_seconds,
+        )
+    except KeyboardInterrupt:
+        log("Worker stopped; its leased jobs return to the queue when leases expire.")
+        return 130
+    return 0
+
+
+def cmd_scrape_fighters(args: argparse.Namespace) -> int:
+    raw = Path(args.raw)
+    if not (raw / "ufcstats").exists():
+        log(f"No scraped events under {raw}. Run 'fightmatch scrape' first.")
+        return 1
+    log(f"Fetching fighter-details pages for fighters in {raw}")
+    try:
+        saved = scrape_fighters(
+            raw,
+            config=_scrape_config(args),
+            concurrency=args.concurrency,
+            resume=args.resume,
+            cache_config=_cache_config(args),
+        )
+    except requests.exceptions.RequestException as e:
+        log(f"UFCStats request failed: {e}")
+        return 1
+    log(f"Saved {saved} fighter page(s)")
+    return 0
+
+
+def _scrape_config(args: argparse.Namespace) -> ScrapeConfig:
+    config = ScrapeConfig()
+    if args.max_rate is not None:
+        config.max_rate = args.max_rate
+    return config
+
+
+def _cache_config(args: argparse.Namespace) -> CacheConfig:
+    config = CacheConfig(backend=args.cache_backend, max_bytes=args.cache_max_bytes)
+    if args.cache_memory_bytes is not None:
+        config.memory_bytes = args.cache_memory_bytes
+    return config
+
+
+def _suggest_offline_path(raw_dir: Path) -> None:
+    cached_events: list[str] = []
+    if (raw_dir / "ufcstats").exists():
+        raw_store = RawStore(raw_dir / "ufcstats")
+        cached_events = raw_store.ids("events")
+        raw_store.close()
     if cached_events:
         log(
             f"Cached HTML found in {raw_dir} ({len(cached_events)} event file(s)). "
@@ -77,8 +189,16 @@ def cmd_build_dataset(args: argparse.Namespace) -> int:
     log(
         f"Building dataset from {raw} -> {out}"
         + (f" (division={division})" if division else "")
+        + f" [HTML parser: {parser_backend()}"
+        + (f", {args.jobs} jobs]" if args.jobs > 1 else "]")
+    )
+    build_dataset(
+        raw,
+        out,
+        division=division,
+        parse_cache=not args.no_parse_cache,
+        jobs=max(1, args.jobs),
     )
-    build_dataset(raw, out, division=division)
     bouts_path = out / "bouts.json"
     try:
         bouts = json.loads(bouts_path.read_text(encoding="utf-8"))
@@ -18,6 +18,28 @@ class ScrapeConfig:
     max_retries: int = 3
     retry_backoff_base: float = 2.0
     user_agent: str = "FightMatch/0.1 (UFC decision-support; rate-limited)"
+    concurrency: int = 2  # fetch workers; all share one rate limiter
+    # Adaptive limiter: start at 1 / rate_limit_seconds, creep up to max_rate while
+    # responses are healthy, halve on 429/5xx. Retry-After pauses every worker (capped below).
+    max_rate: float | None = None  # requests per second; None = 1 / rate_limit_seconds
+    min_rate: float = 0.1
+    rate_increase: float = 0.1  # req/s gained per second of healthy traffic
+    rate_decrease: float = 0.5  # multiplier on 429/5xx
+    max_retry_after: float = 300.0
+
+
+# Cache TTL per URL class: (regex searched in the URL, TTL seconds); first match wins.
+# Upcoming cards are skipped at discovery, and the scraper drops an event page
+# still waiting for results (no fight links, or dated today) from the cache, so
+# only finished events' event/fight pages are kept forever. The events index is
+# the one page that gains rows and is kept short-lived.
+FOREVER = float("inf")
+DEFAULT_TTL_POLICY: tuple[tuple[str, float], ...] = (
+    (r"/statistics/events/completed", 3600),  # 1 hour
+    (r"/event-details/", FOREVER),
+    (r"/fight-details/", FOREVER),
+    (r"/fighter-details/", 86400 * 30),  # record/bio change slowly; refresh monthly
+)
 
 
 @dataclass
@@ -25,7 +47,13 @@ class CacheConfig:
     """Disk cache for raw responses."""
 
     dir: Path = field(default_factory=lambda: Path("data/raw/ufcstats"))
-    ttl_seconds: int = 86400 * 7  # 7 days
+    ttl_seconds: int = 86400 * 7  # 7 days; URLs not matched by ttl_policy
+    ttl_policy: list[tuple[str, float]] = field(
+        default_factory=lambda: list(DEFAULT_TTL_POLICY)
+    )
+    backend: str = "files"  # "files" (one file per URL) | "sqlite" (single pack file)
+    max_bytes: int | None = None  # LRU-evict beyond this many bytes; None = unbounded
+    memory_bytes: int = 64 * 1024 * 1024  # in-process LRU tier; 0 disables it
 
 
 @dataclass
@@ -4,9 +4,21 @@ Canonical implementations live in fightmatch.scrape.store and
 fightmatch.match.features.  Import from here for convenience:
 
     from fightmatch.data import build_dataset, build_features
+
+load_table() and StatsStore read the columnar copies build_dataset() writes.
 """
 
 from fightmatch.match.features import build_features
+from fightmatch.scrape.columnar import ColumnTable, load_table
+from fightmatch.scrape.registry import IdRegistry
+from fightmatch.scrape.stats_store import StatsStore
 from fightmatch.scrape.store import build_dataset
 
-__all__ = ["build_dataset", "build_features"]
+__all__ = [
+    "ColumnTable",
+    "IdRegistry",
+    "StatsStore",
+    "build_dataset",
+    "build_features",
+    "load_table",
+]
@@ -8,6 +8,7 @@ Usage
 
 Source files
     features/features.csv  → fighters table  (primary source of fighter data)
+    processed/fighters.json → fighters table (height/reach/stance/dob, if scraped)
     processed/bouts.json   → bouts table     (optional — only if non-empty)
     processed/events.json  → events table    (optional — only if non-empty)
     processed/stats.jsonl  → fight_stats table (optional — only if non-empty)
@@ -24,6 +25,8 @@ from pathlib import Path
 
 from sqlalchemy.exc import IntegrityError
 
+from fightmatch.scrape.columnar import load_table
+
 from .models import Base, Bout, Event, Fighter, FightStats, SessionLocal, engine
 
 logger = logging.getLogger(__name__)
@@ -82,6 +85,22 @@ def _load_jsonl(path: Path) -> list[dict]:
     return records
 
 
+def _load_processed(processed_dir: Path, table: str, filename: str) -> list[dict]:
+    """Records of a processed table: its `.col` file if built and current, else JSON."""
+    try:
+        columns = load_table(processed_dir, table)
+    except (OSError, ValueError) as exc:
+        logger.warning("Ignoring columnar %s table: %s", table, exc)
+        columns = None
+    if columns is not None:
+        records = columns.records()
+        if records:
+            logger.info("Loaded %d records from %s.col", len(records), table)
+        return records
+    path = processed_dir / filename
+    return _load_jsonl(path) if filename.endswith(".jsonl") else _load_json(path)
+
+
 def _safe_float(val: str | None) -> float | None:
     if val is None or val == "":
         return None
@@ -143,8 +162,37 @@ def ingest_fighters_from_csv(session, features_path: Path) -> int:
     return inserted
 
 
+def ingest_fighter_details(session, processed_dir: Path) -> int:
+    """Fill height/reach/stance/dob of known fighters from fighters.json.
+
+    Only non-null values are written, so a dataset built without fighter
+    pages never blanks out details already in the table.
+    """
+    records = _load_processed(processed_dir, "fighters", "fighters.json")
+    if not records:
+        return 0
+    updated = 0
+    for raw in records:
+        fighter = session.get(Fighter, raw.get("fighter_id"))
+        if fighter is None:
+            continue
+        details = {
+            k: raw[k]
+            for k in ("height", "reach", "stance", "dob")
+            if raw.get(k) is not None
+        }
+        if not details:
+            continue
+        for k, v in details.items():
+            setattr(fighter, k, v)
+        updated += 1
+    session.flush()
+    logger.info("fighters  — details for %d", updated)
+    return updated
+
+
 def ingest_events(session, processed_dir: Path) -> None:
-    records = _load_json(processed_dir / "events.json")
+    records = _load_processed(processed_dir, "events", "events.json")
     if not records:
         return
     inserted = skipped = 0
@@ -161,7 +209,7 @@ def ingest_events(session, processed_dir: Path) -> None:
 
 
 def ingest_bouts(session, processed_dir: Path) -> None:
-    records = _load_json(processed_dir / "bouts.json")
+    records = _load_processed(processed_dir, "bouts", "bouts.json")
     if not records:
         return
     inserted = skipped = 0
@@ -178,7 +226,7 @@ def ingest_bouts(session, processed_dir: Path) -> None:
 
 
 def ingest_fight_stats(session, processed_dir: Path) -> None:
-    records = _load_jsonl(processed_dir / "stats.jsonl")
+    records = _load_processed(processed_dir, "stats", "stats.jsonl")
     if not records:
         return
     existing = {
@@ -226,6 +274,7 @@ def run(
                 "  fightmatch build-dataset --raw data/raw --out data/processed\n"
                 "  fightmatch features --in data/processed --out data/features/features.csv"
             )
+        ingest_fighter_details(session, processed_dir)
         ingest_events(session, processed_dir)
         ingest_bouts(session, processed_dir)
         ingest_fight_stats(session, processed_dir)
@@ -6,8 +6,11 @@ import csv
 import json
 from datetime import datetime
 from pathlib import Path
+from typing import NamedTuple
 
 from fightmatch.config import normalize_division
+from fightmatch.scrape.columnar import SCHEMAS, ColumnTable, load_table
+from fightmatch.scrape.registry import IdRegistry
 from fightmatch.utils.log import log
 
 
@@ -25,11 +28,34 @@ def _parse_date(s: str | None) -> datetime | None:
     return None
 
 
+_TABLES = ("fighters", "events", "bouts", "stats")
+
+
+class _Bout(NamedTuple):
+    """One bout in a fighter's history; ids are IdRegistry ints."""
+
+    date: datetime
+    opponent: int
+    won: bool
+    weight_class: str | None
+    stats_row: int  # row in the stats table, -1 if none
+    round_minutes: float
+
+
 def load_processed(
     processed_dir: Path,
 ) -> tuple[list[dict], list[dict], list[dict], list[dict]]:
-    """Load fighters, events, bouts, stats from processed dir."""
+    """Load fighters, events, bouts, stats from processed dir.
+
+    Reads the columnar `.col` tables when build_dataset() wrote them and they
+    are not older than the JSON (no JSON decoding), else the JSON files.
+    """
     p = Path(processed_dir)
+    registry = IdRegistry.for_processed_dir(p)
+    tables = [load_table(p, t, registry) for t in _TABLES]
+    if all(t is not None for t in tables):
+        fighters, events, bouts, stats_list = (t.records() for t in tables)
+        return fighters, events, bouts, stats_list
     fighters = (
         json.loads((p / "fighters.json").read_text(encoding="utf-8"))
         if (p / "fighters.json").exists()
@@ -54,57 +80,81 @@ def load_processed(
     return fighters, events, bouts, stats_list
 
 
-def build_features(processed_dir: Path, out_path: Path, division: str = "") -> None:
-    """Build per-fighter features CSV. If division is set, only output rows for that weight class."""
-    fighters, events, bouts, stats_list = load_processed(processed_dir)
-    event_dates = {
-        e["event_id"]: _parse_date(e.get("date")) for e in events if e.get("event_id")
+def _load_tables(processed_dir: Path) -> dict[str, ColumnTable]:
+    """The processed tables as columns sharing one IdRegistry.
+
+    Uses the `.col` files when build_dataset() wrote them; otherwise (or for
+    tables written before ids were interned) the records are encoded in memory.
+    """
+    p = Path(processed_dir)
+    registry = IdRegistry.for_processed_dir(p)
+    tables = {t: load_table(p, t, registry) for t in _TABLES}
+    if all(t is not None and t.kinds == dict(SCHEMAS[t.table]) for t in tables.values()):
+        return tables
+    registry = IdRegistry()
+    return {
+        t: ColumnTable.from_records(t, records, registry)
+        for t, records in zip(_TABLES, load_processed(p))
     }
-    event_dates = {k: v for k, v in event_dates.items() if v is not None}
-    stats_by_bout: dict[str, list[dict]] = {}
-    for s in stats_list:
-        bid = s.get("bout_id")
-        if bid:
-            stats_by_bout.setdefault(bid, []).append(s)
-
-    fighter_bouts: dict[str, list[dict]] = {}
-    for b in bouts:
-        eid = b.get("event_id")
-        if not eid or eid not in event_dates:
+
+
+def build_features(processed_dir: Path, out_path: Path, division: str = "") -> None:
+    """Build per-fighter features CSV. If division is set, only output rows for that weight class.
+
+    Joins run on the registry's integer ids and stats row numbers; slugs are
+    looked up only for the output rows.
+    """
+    tables = _load_tables(processed_dir)
+    events, bouts, stats, fighters = (
+        tables[t] for t in ("events", "bouts", "stats", "fighters")
+    )
+    registry = fighters.registry
+    event_dates = dict(zip(events.raw("event_id"), map(_parse_date, events.column("date"))))
+    event_dates = {k: v for k, v in event_dates.items() if k >= 0 and v is not None}
+
+    # bout id -> first stats row of each corner
+    corners = stats.dictionary("corner")
+    red_code = corners.index("red") if "red" in corners else None
+    blue_code = corners.index("blue") if "blue" in corners else None
+    red_rows: dict[int, int] = {}
+    blue_rows: dict[int, int] = {}
+    for i, (bid, corner) in enumerate(zip(stats.raw("bout_id"), stats.raw("corner"))):
+        if bid < 0:
+            continue
+        if corner == red_code:
+            red_rows.setdefault(bid, i)
+        elif corner == blue_code:
+            blue_rows.setdefault(bid, i)
+    # Stat columns get a trailing None so row -1 (no stats) reads as missing.
+    sig_landed = stats.column("sig_str_landed") + [None]
+    td_landed_col = stats.column("td_landed") + [None]
+    td_att_col = stats.column("td_att") + [None]
+    ctrl_col = stats.column("ctrl_time_seconds") + [None]
+
+    fighter_bouts: dict[int, list[_Bout]] = {}
+    for eid, bid, red_id, blue_id, wc, winner in zip(
+        bouts.raw("event_id"),
+        bouts.raw("bout_id"),
+        bouts.raw("red_fighter_id"),
+        bouts.raw("blue_fighter_id"),
+        bouts.column("weight_class"),
+        bouts.column("winner"),
+    ):
+        dt = event_dates.get(eid)
+        if dt is None:
             continue
-        dt = event_dates[eid]
-        bid = b.get("bout_id")
-        red_id = b.get("red_fighter_id")
-        blue_id = b.get("blue_fighter_id")
-        winner = b.get("winner")
-        wc = b.get("weight_class")
-        stat_rows = stats_by_bout.get(bid, [])
-        red_s = next((r for r in stat_rows if r.get("corner") == "red"), {})
-        blue_s = next((r for r in stat_rows if r.get("corner") == "blue"), {})
-        for fid, opp, corner, st in [
-            (red_id, blue_id, "red", red_s),
-            (blue_id, red_id, "blue", blue_s),
-        ]:
-            if not fid:
+        for fid, opp, won, row in (
+            (red_id, blue_id, winner == "red", red_rows.get(bid, -1)),
+            (blue_id, red_id, winner == "blue", blue_rows.get(bid, -1)),
+        ):
+            if fid < 0:
                 continue
-            won = (winner == "red" and corner == "red") or (
-                winner == "blue" and corner == "blue"
-            )
-            fighter_bouts.setdefault(fid, []).append(
-                {
-                    "date": dt,
-                    "opponent_id": opp,
-                    "won": won,
-                    "weight_class": wc,
-                    "stat": st,
-                    "round_minutes": 5.0,
-                }
-            )
-
-    fighter_weight_class: dict[str, str] = {}
+            fighter_bouts.setdefault(fid, []).append(_Bout(dt, opp, won, wc, row, 5.0))
+
+    fighter_weight_class: dict[int, str] = {}
     for fid, h in fighter_bouts.items():
         if h:
-            wc = max(h, key=lambda x: x["date"]).get("weight_class")
+            wc = max(h, key=lambda x: x.date).weight_class
             if wc:
                 fighter_weight_class[fid] = wc
 
@@ -127,53 +177,55 @@ def build_features(processed_dir: Path, out_path: Path, division: str = "") -> N
     out_path.parent.mkdir(parents=True, exist_ok=True)
     ref = datetime.now()
     rows: list[dict] = []
-    for f in fighters:
-        fid = f.get("fighter_id")
-        if not fid:
+    for fid, name in zip(fighters.raw("fighter_id"), fighters.column("name")):
+        if fid < 0:
             continue
+        slug = registry.slug("fighter", fid)
+        if name is None:
+            name = slug
         history = sorted(
-            fighter_bouts.get(fid, []), key=lambda x: x["date"], reverse=True
+            fighter_bouts.get(fid, []), key=lambda x: x.date, reverse=True
         )
         wc = fighter_weight_class.get(fid)
         if not history:
             rows.append({k: None for k in fieldnames})
-            rows[-1]["fighter_id"] = fid
-            rows[-1]["name"] = f.get("name", fid)
+            rows[-1]["fighter_id"] = slug
+            rows[-1]["name"] = name
             rows[-1]["weight_class"] = wc
             rows[-1]["win_streak"] = 0
             continue
-        recency = (ref - history[0]["date"]).days
+        recency = (ref - history[0].date).days
         win_streak = 0
         for h in history:
-            if h["won"]:
+            if h.won:
                 win_streak += 1
             else:
                 break
         last_5 = history[:5]
         last_5_win_pct = (
-            sum(1 for h in last_5 if h["won"]) / len(last_5) if last_5 else None
+            sum(1 for h in last_5 if h.won) / len(last_5) if last_5 else None
         )
-        finishes = sum(1 for h in history if (h.get("round_minutes") or 5) < 4)
+        finishes = sum(1 for h in history if (h.round_minutes or 5) < 4)
         finish_rate = finishes / len(history) if history else None
         sig_per_min = 0.0
         td_landed = td_att = ctrl = 0
         total_mins = 0.1
         for h in history:
-            st = h.get("stat") or {}
-            m = h.get("round_minutes") or 5.0
+            row = h.stats_row
+            m = h.round_minutes or 5.0
             total_mins += m
-            sig_per_min += (st.get("sig_str_landed") or 0) / m
-            td_landed += st.get("td_landed") or 0
-            td_att += st.get("td_att") or 1
-            ctrl += st.get("ctrl_time_seconds") or 0
+            sig_per_min += (sig_landed[row] or 0) / m
+            td_landed += td_landed_col[row] or 0
+            td_att += td_att_col[row] or 1
+            ctrl += ctrl_col[row] or 0
         td_rate = td_landed / max(1, td_att)
         td_per_15 = (td_landed + td_att) / max(0.01, total_mins) * 15
         ctrl_per_15 = ctrl / max(0.01, total_mins) * 15 * 60
         opp_avg = None
         rows.append(
             {
-                "fighter_id": fid,
-                "name": f.get("name", fid),
+                "fighter_id": slug,
+                "name": name,
                 "weight_class": wc,
                 "activity_recency_days": recency,
                 "win_streak": win_streak,
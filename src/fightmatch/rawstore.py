@@ -0,0 +1,339 @@
+"""Content-addressed, compressed store for raw HTML pages.
+
+Every page body is written once, gzip-compressed, under objects/<sha[:2]>/<sha>.gz;
+the HTTP cache and the events/fights views only reference those objects.
+Bodies can be streamed in (ObjectStore.put_stream) through a temp file under
+objects/tmp, so a page is never held in memory whole.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import mmap
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+INDEX_FILENAME = "index.sqlite"
+CHUNK_SIZE = 64 * 1024
+# Writers' temp files live under objects/tmp; ones older than this were left by
+# a killed process and are deleted when an ObjectStore is opened.
+TMP_DIRNAME = "tmp"
+STALE_TMP_SECONDS = 3600
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS refs (
+    kind    TEXT NOT NULL,  -- "events" | "fights" | "fighters"
+    item_id TEXT NOT NULL,
+    sha256  TEXT NOT NULL,
+    PRIMARY KEY (kind, item_id)
+);
+CREATE INDEX IF NOT EXISTS refs_sha256 ON refs (sha256);
+"""
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+class Body:
+    """A page body: bytes already in memory, a spooled temp file, or a stored object.
+
+    view() yields a read-only buffer (the bytes, or an mmap of the spool file) that
+    is valid inside the with-block; text() decodes it. close() removes the spool.
+    """
+
+    def __init__(
+        self,
+        data: bytes | None = None,
+        *,
+        path: Path | None = None,
+        sha: str | None = None,
+        size: int | None = None,
+        objects: ObjectStore | None = None,
+    ):
+        self._data = data
+        self.path = path
+        self._sha = sha
+        self.size = len(data) if data is not None else (size or 0)
+        self._objects = objects
+
+    @property
+    def sha(self) -> str:
+        if self._sha is None:
+            self._sha = content_hash(self.read())
+        return self._sha
+
+    @contextmanager
+    def view(self) -> Iterator[bytes | mmap.mmap]:
+        if self._data is None and (self.path is None or self.size == 0):
+            self._data = self._load()
+        if self._data is not None:
+            yield self._data
+            return
+        with open(self.path, "rb") as fh:
+            with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                yield mm
+
+    def _load(self) -> bytes:
+        if self.size == 0:
+            return b""
+        data = self._objects.get(self._sha) if self._objects and self._sha else None
+        if data is None:
+            raise FileNotFoundError(f"body {self._sha} is not available")
+        return data
+
+    def read(self) -> bytes:
+        with self.view() as buf:
+            return buf if isinstance(buf, bytes) else buf[:]
+
+    def text(self) -> str:
+        with self.view() as buf:
+            return str(buf, "utf-8", "replace")
+
+    def close(self) -> None:
+        if self.path is not None:
+            self.path.unlink(missing_ok=True)
+            self.path = None
+
+    def __enter__(self) -> Body:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+class ObjectStore:
+    """sha256 -> gzip-compressed blob; writes are idempotent and atomic."""
+
+    def __init__(self, root: Path, compresslevel: int = 6):
+        self.root = Path(root)
+        self.compresslevel = compresslevel
+        self.tmp_dir = self.root / TMP_DIRNAME
+        self.tmp_dir.mkdir(parents=True, exist_ok=True)
+        self._holders: list[Callable[[set[str]], set[str]]] = []
+        self._sweep_tmp()
+
+    def _sweep_tmp(self) -> None:
+        cutoff = time.time() - STALE_TMP_SECONDS
+        # Older versions wrote put_stream() temp files straight into root.
+        legacy = [*self.root.glob("*.tmp"), *self.root.glob("*.spool")]
+        for p in [*self.tmp_dir.iterdir(), *legacy]:
+            try:
+                if p.stat().st_mtime < cutoff:
+                    p.unlink()
+            except OSError:
+                pass
+
+    def add_holder(self, held: Callable[[set[str]], set[str]]) -> None:
+        """Register held(shas) -> those of shas it still references; discard() keeps them."""
+        self._holders.append(held)
+
+    def discard(self, shas: Iterable[str]) -> int:
+        """Delete the objects of shas that no holder references; returns bytes freed."""
+        doomed = set(shas)
+        for held in self._holders:
+            doomed -= held(doomed)
+        freed = 0
+        for sha in doomed:
+            p = self.path(sha)
+            try:
+                size = p.stat().st_size
+                p.unlink()
+            except OSError:
+                continue
+            freed += size
+        return freed
+
+    def path(self, sha: str) -> Path:
+        return self.root / sha[:2] / f"{sha}.gz"
+
+    def exists(self, sha: str) -> bool:
+        return self.path(sha).exists()
+
+    def put(self, data: bytes) -> str:
+        """Store data (if not already present) and return its sha256."""
+        sha = content_hash(data)
+        p = self.path(sha)
+        if p.exists():
+            return sha
+        p.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.tmp_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as fh:
+                fh.write(gzip.compress(data, self.compresslevel, mtime=0))
+            os.replace(tmp, p)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+        return sha
+
+    def put_stream(self, chunks: Iterable[bytes], spool: bool = False) -> Body:
+        """Store a body arriving in chunks without holding it in memory.
+
+        Chunks are hashed and gzip-compressed into a temp file that is renamed to
+        its content address (or dropped if that object already exists). With
+        spool=True an uncompressed copy is kept for Body.view().
+        """
+        self.tmp_dir.mkdir(parents=True, exist_ok=True)
+        hasher = hashlib.sha256()
+        size = 0
+        fd, gz_tmp = tempfile.mkstemp(dir=self.tmp_dir, suffix=".tmp")
+        raw_tmp: str | None = None
+        try:
+            raw = None
+            if spool:
+                raw_fd, raw_tmp = tempfile.mkstemp(dir=self.tmp_dir, suffix=".spool")
+                raw = os.fdopen(raw_fd, "wb")
+            with os.fdopen(fd, "wb") as fh, gzip.GzipFile(
+                filename="",
+                mode="wb",
+                fileobj=fh,
+                compresslevel=self.compresslevel,
+                mtime=0,
+            ) as gz:
+                for chunk in chunks:
+                    if not chunk:
+                        continue
+                    hasher.update(chunk)
+                    gz.write(chunk)
+                    if raw is not None:
+                        raw.write(chunk)
+                    size += len(chunk)
+            if raw is not None:
+                raw.close()
+            sha = hasher.hexdigest()
+            p = self.path(sha)
+            if p.exists():
+                Path(gz_tmp).unlink()
+            else:
+                p.parent.mkdir(parents=True, exist_ok=True)
+                os.replace(gz_tmp, p)
+        except BaseException:
+            Path(gz_tmp).unlink(missing_ok=True)
+            if raw_tmp is not None:
+                Path(raw_tmp).unlink(missing_ok=True)
+            raise
+        spooled = Path(raw_tmp) if raw_tmp is not None else None
+        return Body(path=spooled, sha=sha, size=size, objects=self)
+
+    def get(self, sha: str) -> bytes | None:
+        try:
+            return gzip.decompress(self.path(sha).read_bytes())
+        except (OSError, EOFError):
+            return None
+
+
+class RawStore:
+    """events/fights views over an ObjectStore, indexed by (kind, item_id).
+
+    Layout under base (raw_dir/ufcstats): objects/ plus index.sqlite. Pages
+    written by older versions as plain events/<id>.html or fights/<id>.html
+    are still found by get() and ids().
+    """
+
+    def __init__(self, base: Path):
+        self.base = Path(base)
+        self.objects = ObjectStore(self.base / "objects")
+        self._lock = threading.Lock()
+        self._closed = False
+        self._conn = sqlite3.connect(
+            self.base / INDEX_FILENAME, check_same_thread=False, timeout=30
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")  # shared by worker processes
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+        self.objects.add_holder(self._held)
+
+    def put(self, kind: str, item_id: str, data: bytes) -> str:
+        """Store page body (deduplicated by content) and point kind/item_id at it."""
+        sha = self.objects.put(data)
+        self._index(kind, item_id, sha)
+        return sha
+
+    def put_body(self, kind: str, item_id: str, body: Body) -> str:
+        """Like put(), but only index the ref if body is already an object here."""
+        if body._sha is not None and self.objects.exists(body._sha):
+            self._index(kind, item_id, body._sha)
+            return body._sha
+        return self.put(kind, item_id, body.read())
+
+    def _index(self, kind: str, item_id: str, sha: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO refs (kind, item_id, sha256) VALUES (?, ?, ?)",
+                (kind, item_id, sha),
+            )
+            self._conn.commit()
+
+    def _held(self, shas: set[str]) -> set[str]:
+        held: set[str] = set()
+        todo = list(shas)
+        with self._lock:
+            if self._closed:
+                return set(shas)  # cannot tell any more: keep them all
+            for i in range(0, len(todo), 500):
+                chunk = todo[i : i + 500]
+                rows = self._conn.execute(
+                    "SELECT DISTINCT sha256 FROM refs WHERE sha256 IN "
+                    f"({', '.join('?' * len(chunk))})",
+                    chunk,
+                ).fetchall()
+                held.update(r[0] for r in rows)
+        return held
+
+    def _sha(self, kind: str, item_id: str) -> str | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT sha256 FROM refs WHERE kind = ? AND item_id = ?",
+                (kind, item_id),
+            ).fetchone()
+        return row[0] if row else None
+
+    def sha(self, kind: str, item_id: str) -> str | None:
+        """Content hash of the page get() would return, without reading indexed pages."""
+        sha = self._sha(kind, item_id)
+        if sha and self.objects.exists(sha):
+            return sha
+        try:
+            return content_hash((self.base / kind / f"{item_id}.html").read_bytes())
+        except OSError:
+            return None
+
+    def get(self, kind: str, item_id: str) -> bytes | None:
+        sha = self._sha(kind, item_id)
+        if sha:
+            data = self.objects.get(sha)
+            if data is not None:
+                return data
+        try:
+            return (self.base / kind / f"{item_id}.html").read_bytes()
+        except OSError:
+            return None
+
+    def read_text(self, kind: str, item_id: str) -> str | None:
+        data = self.get(kind, item_id)
+        return None if data is None else data.decode("utf-8", errors="replace")
+
+    def ids(self, kind: str) -> list[str]:
+        """Sorted item ids for kind, from the index plus any legacy .html files."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT item_id FROM refs WHERE kind = ?", (kind,)
+            ).fetchall()
+        found = {r[0] for r in rows}
+        legacy_dir = self.base / kind
+        if legacy_dir.is_dir():
+            found.update(p.stem for p in legacy_dir.glob("*.html"))
+        return sorted(found)
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            self._conn.close()
@@ -1,28 +1,46 @@
 """Scraping UFCStats: client, parse, schemas."""
 
+from .manifest import ScrapeManifest
 from .parse import (
     parse_event_page,
     parse_events_list,
     parse_fight_details,
+    parse_fighter_page,
 )
+from .pipeline import ingest_since
 from .schemas import Bout, Event, Fighter, FightStats
 from .ufcstats_client import (
+    AdaptiveRateLimiter,
     RateLimiter,
+    TokenBucket,
     discover_events_since,
+    discover_new_events,
     fetch,
+    make_session,
+    scrape_fighter_page,
+    scrape_fighters,
     scrape_since,
 )
 
 __all__ = [
+    "AdaptiveRateLimiter",
     "Bout",
     "Event",
     "Fighter",
     "FightStats",
     "RateLimiter",
+    "ScrapeManifest",
+    "TokenBucket",
     "discover_events_since",
+    "discover_new_events",
     "fetch",
+    "ingest_since",
+    "make_session",
     "parse_event_page",
     "parse_events_list",
     "parse_fight_details",
+    "parse_fighter_page",
+    "scrape_fighter_page",
+    "scrape_fighters",
     "scrape_since",
 ]
@@ -0,0 +1,102 @@
+"""Offline scrape benchmark: scrape_since() against a ReplayAdapter, cold then warm."""
+
+from __future__ import annotations
+
+import tempfile
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+from fightmatch.config import CacheConfig, ScrapeConfig
+
+from .metrics import ERROR, HIT, REVALIDATED, FetchRecorder
+from .replay import ReplayAdapter, replay_session
+from .ufcstats_client import scrape_since
+
+
+@dataclass
+class BenchPass:
+    """One scrape_since() run over the replayed corpus."""
+
+    name: str
+    seconds: float
+    pages: int  # fetch() calls that returned a body
+    errors: int
+    requests: int  # HTTP requests that reached the replay server
+    network_bytes: int
+    p50_ms: float | None
+    p99_ms: float | None
+    outcomes: dict[str, int] = field(default_factory=dict)
+    time_seconds: dict[str, float] = field(default_factory=dict)
+
+    @property
+    def pages_per_sec(self) -> float:
+        return self.pages / self.seconds if self.seconds > 0 else 0.0
+
+    @property
+    def cache_hit_rate(self) -> float | None:
+        """Share of pages served without transferring a body (hits + 304s)."""
+        if not self.pages:
+            return None
+        served = self.outcomes.get(HIT, 0) + self.outcomes.get(REVALIDATED, 0)
+        return served / self.pages
+
+    def as_dict(self) -> dict:
+        d = asdict(self)
+        d["pages_per_sec"] = round(self.pages_per_sec, 2)
+        d["cache_hit_rate"] = self.cache_hit_rate
+        return d
+
+
+def bench_scrape(
+    pages: dict[str, bytes],
+    since_date: str = "2000-01-01",
+    config: ScrapeConfig | None = None,
+    cache_config: CacheConfig | None = None,
+    concurrency: int | None = None,
+    adapter: ReplayAdapter | None = None,
+    passes: tuple[str, ...] = ("cold", "warm"),
+) -> list[BenchPass]:
+    """Scrape the replayed corpus into a scratch raw dir once per entry in passes.
+
+    The first pass starts from an empty cache; later passes reuse it, so "warm"
+    measures cache efficiency. Default config disables the rate limiter so the
+    numbers reflect the fetch layer, not politeness.
+    """
+    config = config or ScrapeConfig(rate_limit_seconds=0, rate_limit_jitter=0)
+    adapter = adapter or ReplayAdapter(pages)
+    results: list[BenchPass] = []
+    with tempfile.TemporaryDirectory(prefix="fightmatch-bench-") as tmp:
+        raw_dir = Path(tmp)
+        for name in passes:
+            recorder = FetchRecorder()
+            requests_before, bytes_before = adapter.requests, adapter.bytes_sent
+            session = replay_session(adapter, config)
+            start = time.monotonic()
+            scrape_since(
+                since_date,
+                raw_dir,
+                config=config,
+                concurrency=concurrency,
+                cache_config=cache_config,
+                session=session,
+                recorder=recorder,
+            )
+            seconds = time.monotonic() - start
+            summary = recorder.summary()
+            outcomes = summary["outcomes"]
+            results.append(
+                BenchPass(
+                    name=name,
+                    seconds=seconds,
+                    pages=summary["requests"] - outcomes[ERROR],
+                    errors=outcomes[ERROR],
+                    requests=adapter.requests - requests_before,
+                    network_bytes=adapter.bytes_sent - bytes_before,
+                    p50_ms=summary["p50_ms"],
+                    p99_ms=summary["p99_ms"],
+                    outcomes=outcomes,
+                    time_seconds=summary["time_seconds"],
+                )
+            )
+    return results
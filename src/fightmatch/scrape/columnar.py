@@ -0,0 +1,381 @@
+"""Typed columnar copy of the processed dataset (stdlib `array`, no numpy/arrow).
+
+build_dataset() writes one `<table>.col` next to each JSON output: one
+contiguous block per column, then a JSON header. Column kinds:
+
+    "id:<entity>" - int32 IdRegistry ids (-1 = None)
+    "dict"  - int32 codes into the header's distinct strings (-1 = None)
+    "int"   - int64, INT_NULL = None
+    "float" - float64, NaN = None
+
+Rows lacking a field are listed per column, so records() match the JSON. A
+`.col` older than its JSON file is stale and not loaded.
+"""
+
+from __future__ import annotations
+
+import array
+import json
+import math
+import os
+import struct
+import sys
+import tempfile
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import Any
+
+from .registry import IdRegistry
+
+COLUMNAR_SUFFIX = ".col"
+MAGIC = b"FMCOL1\n"
+INT_NULL = -(2**63)
+DICT_NULL = -1
+# Rows buffered per column before they are spilled to a temp file.
+SPILL_ROWS = 65536
+
+_TYPECODES = {"id": "i", "dict": "i", "int": "q", "float": "d"}
+# The JSON output each table mirrors.
+JSON_FILENAMES = {
+    "fighters": "fighters.json",
+    "events": "events.json",
+    "bouts": "bouts.json",
+    "stats": "stats.jsonl",
+}
+_HEADER_LEN = struct.Struct("<I")
+
+# table -> ((column, kind), ...) in the key order the parsers emit.
+SCHEMAS: dict[str, tuple[tuple[str, str], ...]] = {
+    "fighters": (
+        ("fighter_id", "id:fighter"),
+        ("name", "dict"),
+        ("height", "dict"),
+        ("reach", "dict"),
+        ("stance", "dict"),
+        ("dob", "dict"),
+    ),
+    "events": (
+        ("event_id", "id:event"),
+        ("name", "dict"),
+        ("date", "dict"),
+        ("location", "dict"),
+    ),
+    "bouts": (
+        ("bout_id", "id:bout"),
+        ("event_id", "id:event"),
+        ("red_fighter_id", "id:fighter"),
+        ("blue_fighter_id", "id:fighter"),
+        ("weight_class", "dict"),
+        ("method", "dict"),
+        ("round", "int"),
+        ("time", "dict"),
+        ("winner", "dict"),
+        ("ref", "dict"),
+    ),
+    "stats": (
+        ("bout_id", "id:bout"),
+        ("fighter_id", "id:fighter"),
+        ("corner", "dict"),
+        ("sig_str_landed", "int"),
+        ("sig_str_att", "int"),
+        ("total_str_landed", "int"),
+        ("total_str_att", "int"),
+        ("td_landed", "int"),
+        ("td_att", "int"),
+        ("sub_att", "int"),
+        ("rev", "int"),
+        ("ctrl_time_seconds", "float"),
+    ),
+}
+
+
+def table_path(processed_dir: Path, table: str) -> Path:
+    return Path(processed_dir) / f"{table}{COLUMNAR_SUFFIX}"
+
+
+def _entity(kind: str) -> str | None:
+    """Entity of an id column kind ("id:fighter" -> "fighter"); None otherwise."""
+    return kind[3:] if kind.startswith("id:") else None
+
+
+def _typecode(kind: str) -> str:
+    return _TYPECODES["id" if _entity(kind) else kind]
+
+
+class _Column:
+    """One column being written: values buffered in an array, spilled in chunks."""
+
+    def __init__(
+        self, name: str, kind: str, registry: IdRegistry, spill_dir: Path | None
+    ):
+        self.name = name
+        self.kind = kind
+        self.entity = _entity(kind)
+        self.registry = registry
+        self.values = array.array(_typecode(kind))
+        self.dictionary: dict[str, int] = {}
+        self.missing: list[int] = []  # rows whose record lacked this field
+        self._spill_dir = spill_dir  # None: keep everything in memory
+        self._spill = None
+
+    def add(self, record: dict, row: int) -> None:
+        if self.name not in record:
+            self.missing.append(row)
+        self.append(record.get(self.name))
+
+    def append(self, v: Any) -> None:
+        if self.entity:
+            self.values.append(
+                self.registry.intern(self.entity, str(v)) if v else DICT_NULL
+            )
+        elif self.kind == "dict":
+            if v is None:
+                self.values.append(DICT_NULL)
+            else:
+                v = str(v)
+                code = self.dictionary.get(v)
+                if code is None:
+                    code = self.dictionary[v] = len(self.dictionary)
+                self.values.append(code)
+        elif self.kind == "int":
+            self.values.append(INT_NULL if v is None else int(v))
+        else:
+            self.values.append(math.nan if v is None else float(v))
+        if self._spill_dir is not None and len(self.values) >= SPILL_ROWS:
+            self.spill()
+
+    def spill(self) -> None:
+        if self._spill is None:
+            self._spill = tempfile.TemporaryFile(dir=self._spill_dir)
+        self.values.tofile(self._spill)
+        del self.values[:]
+
+    def copy_to(self, fh) -> int:
+        """Write the whole column to fh; returns its byte length."""
+        self.spill()
+        self._spill.seek(0)
+        n = 0
+        while chunk := self._spill.read(1 << 20):
+            fh.write(chunk)
+            n += len(chunk)
+        self._spill.close()
+        return n
+
+    def discard(self) -> None:
+        if self._spill is not None:
+            self._spill.close()
+
+
+class ColumnarWriter:
+    """Appends records to a `.col` table; same write/close/abort shape as the JSON writers.
+
+    Columns are spilled to temp files every SPILL_ROWS rows, so memory holds
+    one chunk per column plus each dictionary (the distinct strings). Id columns
+    are interned into registry, which the caller saves next to the table.
+    """
+
+    def __init__(self, path: Path, table: str, registry: IdRegistry):
+        self.path = Path(path)
+        self.table = table
+        self.count = 0
+        self._columns = [
+            _Column(name, kind, registry, self.path.parent)
+            for name, kind in SCHEMAS[table]
+        ]
+
+    def write(self, record: dict) -> None:
+        for col in self._columns:
+            col.add(record, self.count)
+        self.count += 1
+
+    def close(self) -> None:
+        tmp = self.path.with_name(f".{self.path.name}.tmp")
+        try:
+            with open(tmp, "wb") as fh:
+                # The header (with column offsets) goes after the data; its length
+                # is patched in right after the magic.
+                fh.write(MAGIC + _HEADER_LEN.pack(0))
+                start = fh.tell()
+                lengths = [col.copy_to(fh) for col in self._columns]
+                header = self._header(start, lengths)
+                fh.write(header)
+                fh.seek(len(MAGIC))
+                fh.write(_HEADER_LEN.pack(len(header)))
+            os.replace(tmp, self.path)
+        except BaseException:
+            tmp.unlink(missing_ok=True)
+            raise
+
+    def _header(self, start: int, lengths: list[int]) -> bytes:
+        columns = []
+        offset = start
+        for col, length in zip(self._columns, lengths):
+            entry: dict[str, Any] = {
+                "name": col.name,
+                "kind": col.kind,
+                "offset": offset,
+                "length": length,
+            }
+            if col.kind == "dict":
+                entry["values"] = list(col.dictionary)
+            if col.missing:
+                entry["missing"] = col.missing
+            columns.append(entry)
+            offset += length
+        return json.dumps(
+            {
+                "table": self.table,
+                "rows": self.count,
+                "byteorder": sys.byteorder,
+                "columns": columns,
+            }
+        ).encode("utf-8")
+
+    def abort(self) -> None:
+        for col in self._columns:
+            col.discard()
+
+
+def write_table(
+    path: Path, table: str, records: Iterable[dict], registry: IdRegistry
+) -> int:
+    """Write records as a `.col` table; returns the row count."""
+    writer = ColumnarWriter(path, table, registry)
+    try:
+        for r in records:
+            writer.write(r)
+    except BaseException:
+        writer.abort()
+        raise
+    writer.close()
+    return writer.count
+
+
+class ColumnTable:
+    """A loaded table: typed column arrays plus what decodes them.
+
+    Id columns hold registry ids, so e.g. red_fighter_id, blue_fighter_id and
+    the fighters table's fighter_id can be compared as plain ints.
+    """
+
+    def __init__(
+        self,
+        table: str,
+        rows: int,
+        kinds: dict[str, str],
+        arrays: dict[str, array.array],
+        dictionaries: dict[str, list[str]],
+        registry: IdRegistry,
+        missing: dict[str, list[int]] | None = None,
+    ):
+        self.table = table
+        self.rows = rows
+        self.names = list(kinds)
+        self.kinds = kinds
+        self.registry = registry
+        self._arrays = arrays
+        self._dictionaries = dictionaries
+        self._missing = missing or {}
+
+    @classmethod
+    def read(cls, path: Path, registry: IdRegistry) -> ColumnTable:
+        data = Path(path).read_bytes()
+        if not data.startswith(MAGIC):
+            raise ValueError(f"{path} is not a columnar table")
+        (header_len,) = _HEADER_LEN.unpack_from(data, len(MAGIC))
+        header = json.loads(data[len(data) - header_len :])
+        swap = header["byteorder"] != sys.byteorder
+        view = memoryview(data)
+        arrays: dict[str, array.array] = {}
+        for c in header["columns"]:
+            values = array.array(_typecode(c["kind"]))
+            values.frombytes(view[c["offset"] : c["offset"] + c["length"]])
+            if swap:
+                values.byteswap()
+            arrays[c["name"]] = values
+        return cls(
+            header["table"],
+            header["rows"],
+            {c["name"]: c["kind"] for c in header["columns"]},
+            arrays,
+            {c["name"]: c["values"] for c in header["columns"] if c["kind"] == "dict"},
+            registry,
+            {c["name"]: c["missing"] for c in header["columns"] if "missing" in c},
+        )
+
+    @classmethod
+    def from_records(
+        cls, table: str, records: Iterable[dict], registry: IdRegistry
+    ) -> ColumnTable:
+        """Encode records in memory (e.g. JSON outputs built before .col files)."""
+        columns = [_Column(name, kind, registry, None) for name, kind in SCHEMAS[table]]
+        rows = 0
+        for r in records:
+            for col in columns:
+                col.add(r, rows)
+            rows += 1
+        return cls(
+            table,
+            rows,
+            dict(SCHEMAS[table]),
+            {c.name: c.values for c in columns},
+            {c.name: list(c.dictionary) for c in columns if c.kind == "dict"},
+            registry,
+            {c.name: c.missing for c in columns if c.missing},
+        )
+
+    def raw(self, name: str) -> array.array:
+        """The stored array: ids/codes for id and "dict" columns, INT_NULL/NaN for None."""
+        return self._arrays[name]
+
+    def dictionary(self, name: str) -> list[str]:
+        """Strings the codes of column name index: its dictionary or registry slugs."""
+        entity = _entity(self.kinds[name])
+        if entity:
+            return self.registry.slugs(entity)
+        return self._dictionaries[name]
+
+    def column(self, name: str) -> list[Any]:
+        """Decoded values, None where null."""
+        values = self._arrays[name]
+        kind = self.kinds[name]
+        if kind == "dict" or _entity(kind):
+            lookup = self.dictionary(name) + [None]  # code -1 -> None
+            return [lookup[c] for c in values]
+        if kind == "int":
+            return [None if v == INT_NULL else v for v in values]
+        return [None if math.isnan(v) else v for v in values]
+
+    def records(self) -> list[dict]:
+        names = self.names
+        records = [dict(zip(names, row)) for row in zip(*map(self.column, names))]
+        for name, rows in self._missing.items():
+            for i in rows:
+                del records[i][name]
+        return records
+
+    def __iter__(self) -> Iterator[dict]:
+        return iter(self.records())
+
+    def __len__(self) -> int:
+        return self.rows
+
+
+def load_table(
+    processed_dir: Path, table: str, registry: IdRegistry | None = None
+) -> ColumnTable | None:
+    """The `<table>.col` file in processed_dir, or None if it was not built.
+
+    Also None when the table's JSON file is newer (rewritten by something other
+    than build_dataset()), so callers fall back to the JSON.
+    Pass the registry when loading several tables of one dir to read ids.json once.
+    """
+    path = table_path(processed_dir, table)
+    if not path.exists():
+        return None
+    json_path = Path(processed_dir) / JSON_FILENAMES[table]
+    if json_path.exists() and json_path.stat().st_mtime_ns > path.stat().st_mtime_ns:
+        return None
+    if registry is None:
+        registry = IdRegistry.for_processed_dir(processed_dir)
+    return ColumnTable.read(path, registry)
@@ -0,0 +1,137 @@
+"""Persistent scrape manifest: status, hash and timestamp of every scraped page."""
+
+from __future__ import annotations
+
+import hashlib
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+
+MANIFEST_FILENAME = "manifest.sqlite"
+
+# Item status values. An event is "done" only once every one of its fight pages is done;
+# "partial" means some fights failed or were filtered out (e.g. by --division).
+DONE = "done"
+PARTIAL = "partial"
+FAILED = "failed"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    kind       TEXT NOT NULL,  -- "event" | "fight" | "fighter"
+    item_id    TEXT NOT NULL,
+    parent_id  TEXT,           -- event_id for fights
+    url        TEXT,
+    status     TEXT NOT NULL,
+    sha256     TEXT,
+    error      TEXT,
+    updated_at TEXT NOT NULL,
+    PRIMARY KEY (kind, item_id)
+)
+"""
+
+
+class ScrapeManifest:
+    """SQLite manifest under raw_dir/ufcstats/; safe to share between fetch workers.
+
+    WAL mode with a generous busy timeout lets several scrape-worker processes
+    write to it at once.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(_SCHEMA)
+        self._conn.commit()
+
+    @classmethod
+    def for_raw_dir(cls, raw_dir: Path) -> ScrapeManifest:
+        return cls(Path(raw_dir) / "ufcstats" / MANIFEST_FILENAME)
+
+    def mark(
+        self,
+        kind: str,
+        item_id: str,
+        status: str,
+        *,
+        url: str | None = None,
+        parent_id: str | None = None,
+        body: bytes | None = None,
+        sha256: str | None = None,
+        error: str | None = None,
+    ) -> None:
+        """Insert or update one item; url/parent/hash are kept if not given.
+
+        The content hash is sha256 if given, else computed from body.
+        """
+        sha = sha256
+        if sha is None and body is not None:
+            sha = hashlib.sha256(body).hexdigest()
+        now = datetime.now(timezone.utc).isoformat(timespec="seconds")
+        with self._lock:
+            self._conn.execute(
+                """
+                INSERT INTO items
+                    (kind, item_id, parent_id, url, status, sha256, error, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (kind, item_id) DO UPDATE SET
+                    parent_id = COALESCE(excluded.parent_id, parent_id),
+                    url = COALESCE(excluded.url, url),
+                    status = excluded.status,
+                    sha256 = COALESCE(excluded.sha256, sha256),
+                    error = excluded.error,
+                    updated_at = excluded.updated_at
+                """,
+                (kind, item_id, parent_id, url, status, sha, error, now),
+            )
+            self._conn.commit()
+
+    def status(self, kind: str, item_id: str) -> str | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT status FROM items WHERE kind = ? AND item_id = ?",
+                (kind, item_id),
+            ).fetchone()
+        return row[0] if row else None
+
+    def ids_with_status(self, kind: str, status: str = DONE) -> set[str]:
+        """All item ids of `kind` currently in `status` (one indexed query)."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT item_id FROM items WHERE kind = ? AND status = ?",
+                (kind, status),
+            ).fetchall()
+        return {r[0] for r in rows}
+
+    def urls(self) -> list[str]:
+        """Every recorded page URL (events first), e.g. to warm a fresh cache."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT url FROM items WHERE url IS NOT NULL "
+                "ORDER BY kind = 'fight', item_id"
+            ).fetchall()
+        return [r[0] for r in rows]
+
+    def pages(self) -> list[tuple[str, str]]:
+        """(url, sha256) of every page whose body was recorded."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT url, sha256 FROM items "
+                "WHERE url IS NOT NULL AND sha256 IS NOT NULL"
+            ).fetchall()
+        return [(url, sha) for url, sha in rows]
+
+    def counts(self) -> dict[tuple[str, str], int]:
+        """(kind, status) -> number of items, for end-of-run summaries."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT kind, status, COUNT(*) FROM items GROUP BY kind, status"
+            ).fetchall()
+        return {(k, s): n for k, s, n in rows}
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
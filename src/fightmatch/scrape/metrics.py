@@ -0,0 +1,172 @@
+"""Per-fetch metrics: one FetchRecord per fetch() call, aggregated per run.
+
+Time is split into where a fetch spent it: network (HTTP round trips), rate
+limit (waiting on the shared limiter), backoff (sleeping between retries) and
+disk (cache reads/writes plus raw-store/manifest writes). Sums are worker time,
+so with N workers they exceed wall time; their shares show what bounds a run.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import re
+import threading
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+
+RUNS_DIRNAME = "runs"
+
+# How fetch() satisfied a URL.
+HIT = "hit"  # fresh in the cache, no network
+MISS = "miss"  # full body from the network
+REVALIDATED = "revalidated"  # conditional GET answered 304
+ERROR = "error"  # gave up after retries
+OUTCOMES = (HIT, MISS, REVALIDATED, ERROR)
+
+# (regex searched in the URL, class); first match wins, like the cache TTL policy.
+URL_CLASSES: tuple[tuple[str, str], ...] = (
+    (r"/statistics/events/completed", "events_index"),
+    (r"/event-details/", "event"),
+    (r"/fight-details/", "fight"),
+    (r"/fighter-details/", "fighter"),
+)
+
+
+def url_class(url: str) -> str:
+    for pattern, name in URL_CLASSES:
+        if re.search(pattern, url):
+            return name
+    return "other"
+
+
+@dataclass
+class FetchRecord:
+    url: str
+    url_class: str
+    outcome: str = ERROR
+    status: int | None = None
+    bytes: int = 0
+    seconds: float = 0.0
+    attempts: int = 0
+    wait_seconds: float = 0.0
+    network_seconds: float = 0.0
+    backoff_seconds: float = 0.0
+    cache_seconds: float = 0.0
+
+    @property
+    def retries(self) -> int:
+        return max(0, self.attempts - 1)
+
+
+class FetchRecorder:
+    """Thread-safe sink for FetchRecords; pass one to fetch()/scrape_since()."""
+
+    def __init__(self) -> None:
+        self.records: list[FetchRecord] = []
+        self.store_seconds = 0.0  # raw store + manifest writes outside fetch()
+        self._lock = threading.Lock()
+
+    def add(self, record: FetchRecord) -> None:
+        with self._lock:
+            self.records.append(record)
+
+    def add_store_time(self, seconds: float) -> None:
+        with self._lock:
+            self.store_seconds += seconds
+
+    def outcomes(self) -> dict[str, int]:
+        with self._lock:
+            counts = dict.fromkeys(OUTCOMES, 0)
+            for r in self.records:
+                counts[r.outcome] = counts.get(r.outcome, 0) + 1
+        return counts
+
+    def latencies(self) -> list[float]:
+        with self._lock:
+            return sorted(r.seconds for r in self.records)
+
+    def summary(self) -> dict:
+        """Aggregate counts, bytes, latency percentiles and time split per run."""
+        with self._lock:
+            records = list(self.records)
+            store_seconds = self.store_seconds
+        time_split = {
+            "network": sum(r.network_seconds for r in records),
+            "rate_limit": sum(r.wait_seconds for r in records),
+            "backoff": sum(r.backoff_seconds for r in records),
+            "disk": sum(r.cache_seconds for r in records) + store_seconds,
+        }
+        busiest = max(time_split, key=time_split.__getitem__)
+        return {
+            **_aggregate(records),
+            "retries": sum(r.retries for r in records),
+            "time_seconds": {k: round(v, 3) for k, v in time_split.items()},
+            "bound_by": busiest if time_split[busiest] > 0 else None,
+            "by_class": {
+                name: _aggregate([r for r in records if r.url_class == name])
+                for name in sorted({r.url_class for r in records})
+            },
+        }
+
+    def report(self, **run: object) -> dict:
+        """JSON-ready run report: run metadata, summary and every FetchRecord."""
+        with self._lock:
+            records = [asdict(r) for r in self.records]
+        return {"run": run, "summary": self.summary(), "requests": records}
+
+
+def _aggregate(records: list[FetchRecord]) -> dict:
+    latencies = sorted(r.seconds for r in records)
+    outcomes = dict.fromkeys(OUTCOMES, 0)
+    for r in records:
+        outcomes[r.outcome] = outcomes.get(r.outcome, 0) + 1
+    p50, p99 = percentile(latencies, 50), percentile(latencies, 99)
+    return {
+        "requests": len(records),
+        "outcomes": outcomes,
+        "network_bytes": sum(r.bytes for r in records if r.outcome == MISS),
+        "p50_ms": None if p50 is None else round(p50 * 1000, 2),
+        "p99_ms": None if p99 is None else round(p99 * 1000, 2),
+    }
+
+
+def percentile(sorted_values: list[float], q: float) -> float | None:
+    """Nearest-rank percentile (q in 0..100) of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(q / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def format_summary(summary: dict) -> str:
+    """One-line end-of-run summary for the log."""
+    o = summary["outcomes"]
+    t = summary["time_seconds"]
+    p50 = summary["p50_ms"]
+    p99 = summary["p99_ms"]
+    latency = "" if p50 is None else f", p50 {p50:.0f} ms / p99 {p99:.0f} ms"
+    bound = f" -> {summary['bound_by']}-bound" if summary["bound_by"] else ""
+    return (
+        f"Fetch: {summary['requests']} pages (hit={o[HIT]}, miss={o[MISS]}, "
+        f"revalidated={o[REVALIDATED]}, error={o[ERROR]}), "
+        f"{summary['retries']} retries, {summary['network_bytes']} bytes{latency}; "
+        f"time network {t['network']:.1f}s, rate limit {t['rate_limit']:.1f}s, "
+        f"backoff {t['backoff']:.1f}s, disk {t['disk']:.1f}s{bound}"
+    )
+
+
+def write_run_report(base: Path, report: dict, started_at: datetime) -> Path:
+    """Write report as base/runs/<command>-<UTC start>.json; returns the path."""
+    runs = Path(base) / RUNS_DIRNAME
+    runs.mkdir(parents=True, exist_ok=True)
+    command = report.get("run", {}).get("command", "run")
+    stem = f"{command}-{started_at.strftime('%Y%m%dT%H%M%SZ')}"
+    path = runs / f"{stem}.json"
+    n = 1
+    while path.exists():  # several runs within one second
+        path = runs / f"{stem}-{n}.json"
+        n += 1
+    path.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+    return path
@@ -1,12 +1,66 @@
-"""Parse UFCStats HTML into structured records. Robust: missing -> None, no crash."""
+"""Parse UFCStats HTML into structured records. Robust: missing -> None, no crash.
+
+Uses lxml when installed (`fightmatch[fast]`), else html.parser;
+FIGHTMATCH_HTML_PARSER forces one.
+"""
 
 from __future__ import annotations
 
+import os
 import re
+from datetime import datetime
+from html.parser import HTMLParser
 from typing import Any, Optional
 
 from bs4 import BeautifulSoup
 
+try:
+    import lxml  # noqa: F401  (only needed as BeautifulSoup's tree builder)
+except ImportError:
+    lxml = None
+
+PARSER_BACKENDS = ("lxml", "html.parser")
+# Bump whenever a parse_* function changes what it returns: cached parse results
+# (see parse_cache.py) are keyed by it, so old entries stop matching.
+PARSER_VERSION = 2
+# Relative hrefs resolve against this unless a parse_* call passes base_url.
+DEFAULT_BASE_URL = "https://www.ufcstats.com"
+
+
+def available_backends() -> list[str]:
+    return [b for b in PARSER_BACKENDS if b != "lxml" or lxml is not None]
+
+
+def _pick_backend() -> str:
+    wanted = os.environ.get("FIGHTMATCH_HTML_PARSER", "")
+    if wanted in available_backends():
+        return wanted
+    return available_backends()[0]
+
+
+_backend = _pick_backend()
+
+
+def parser_backend() -> str:
+    """Name of the backend parse_* functions currently use."""
+    return _backend
+
+
+def set_parser_backend(name: str) -> str:
+    """Switch backend (e.g. for parity tests); returns the previous one."""
+    global _backend
+    if name not in available_backends():
+        raise ValueError(
+            f"HTML parser backend {name!r} not available "
+            f"(have: {', '.join(available_backends())})"
+        )
+    previous, _backend = _backend, name
+    return previous
+
+
+def _soup(html: str) -> BeautifulSoup:
+    return BeautifulSoup(html, _backend)
+
 
 def _text(soup: Any) -> str:
     if soup is None:
@@ -37,17 +91,20 @@ def _float(s: str) -> Optional[float]:
 def _slug_from_href(a: Any) -> Optional[str]:
     if a is None or not getattr(a, "get", None):
         return None
-    href = a.get("href") or ""
+    return _slug(a.get("href") or "")
+
+
+def _slug(href: str) -> Optional[str]:
     # e.g. /fighter-details/abc123 or /event-details/abc123
     parts = href.rstrip("/").split("/")
     return parts[-1] if parts else None
 
 
 def parse_events_list(
-    html: str, base_url: str = "https://www.ufcstats.com"
+    html: str, base_url: str = DEFAULT_BASE_URL
 ) -> list[dict[str, Any]]:
     """Parse events completed page. Returns list of {event_id, name, date, url}."""
-    soup = BeautifulSoup(html, "html.parser")
+    soup = _soup(html)
     out: list[dict[str, Any]] = []
     # UFCStats: table with links to event-details
     for link in soup.select("a[href*='event-details']"):
@@ -88,7 +145,7 @@ def parse_events_list(
 def parse_event_page(
     html: str,
     event_id: str,
-    base_url: str = "https://www.ufcstats.com",
+    base_url: str = DEFAULT_BASE_URL,
 ) -> tuple[Optional[dict], list[dict], list[dict]]:
     """
     Parse single event page. Returns (event_info, bouts[], fight_links_for_stats[]).
@@ -96,7 +153,7 @@ def parse_event_page(
     bouts: list of bout dicts (bout_id, event_id, red/blue fighter_id, weight_class, method, round, time, winner).
     fight_links_for_stats: [{bout_id, url}, ...] to fetch fight details for stats.
     """
-    soup = BeautifulSoup(html, "html.parser")
+    soup = _soup(html)
     event_name = _text(
         soup.select_one(
             "h2.b-content__title, .b-content__title a, span.b-content__title"
@@ -213,6 +270,194 @@ def parse_event_page(
     return event_info, bouts, fight_links
 
 
+# Fight-details stat rows: (label regex, record fields, value kind); the first
+# pattern that matches a row's lower-cased label wins. "pair" cells read
+# "X of Y" (landed, attempted), "int" a count, "time" an M:SS duration. Labels
+# may span lines, hence DOTALL ("td" anywhere in a label without "sub").
+_STAT_RULES: tuple[tuple[re.Pattern[str], tuple[str, ...], str], ...] = (
+    (re.compile(r"sig\. str|significant"), ("sig_str_landed", "sig_str_att"), "pair"),
+    (re.compile(r"total str|total strike"), ("total_str_landed", "total_str_att"), "pair"),
+    (re.compile(r"takedown|^(?!.*sub).*td", re.DOTALL), ("td_landed", "td_att"), "pair"),
+    (re.compile(r"sub"), ("sub_att",), "int"),
+    (re.compile(r"reversal|rev"), ("rev",), "int"),
+    (re.compile(r"control|ctrl"), ("ctrl_time_seconds",), "time"),
+)
+_OF = re.compile(r"\s+of\s+")
+_NO_RULE = (None, (), "")
+# label -> rule; labels repeat on every page, so each is matched once per process.
+_rule_for_label: dict[str, tuple] = {}
+
+
+def _stat_rule(label: str) -> tuple:
+    rule = _rule_for_label.get(label)
+    if rule is None:
+        rule = next((r for r in _STAT_RULES if r[0].search(label)), _NO_RULE)
+        if len(_rule_for_label) < 1024:
+            _rule_for_label[label] = rule
+    return rule
+
+
+def _to_seconds(s: str) -> Optional[float]:
+    if not s:
+        return None
+    if ":" in s:
+        parts = s.strip().split(":")
+        if len(parts) == 2:
+            try:
+                return int(parts[0]) * 60 + float(parts[1])
+            except ValueError:
+                return None
+    return _float(s)
+
+
+def _apply_stat(record: dict[str, Any], fields: tuple[str, ...], kind: str, v: str) -> None:
+    if kind == "pair":
+        parts = _OF.split(v)
+        record[fields[0]] = _int(parts[0])
+        record[fields[1]] = _int(parts[1]) if len(parts) > 1 else None
+    elif kind == "int":
+        record[fields[0]] = _int(v)
+    else:
+        record[fields[0]] = _to_seconds(v)
+
+
+# Elements without end tags, and elements whose text BeautifulSoup's get_text()
+# leaves out (the tree-based parse reads cells and links with it).
+_VOID_TAGS = frozenset(
+    {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta",
+     "param", "source", "track", "wbr"}
+)
+_HIDDEN_TEXT_TAGS = frozenset({"script", "style", "template", "rt", "rp"})
+
+
+class _FightDetailsExtractor(HTMLParser):
+    """Streaming pass over a fight-details page that keeps only what is used.
+
+    Collects the first two fighter links and the cells of each stats table row.
+    Markup a tree could read differently sets `irregular`, and
+    parse_fight_details() falls back to the tree.
+    """
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.fighters: list[tuple[str, list[str]]] = []  # (href, text parts)
+        self.rows: list[list[str]] = []
+        self.irregular = False
+        self._open: list[str] = []  # open elements, innermost last
+        self._table_at: int | None = None  # index in _open of the stats table
+        self._link_at: int | None = None  # index in _open of the fighter link
+        self._row: list[str] | None = None
+        self._cell: list[str] | None = None
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        if self.irregular or tag in _VOID_TAGS:
+            return
+        in_table = self._table_at is not None
+        if in_table or self._link_at is not None:
+            if tag in _HIDDEN_TEXT_TAGS or (tag == "a" and self._link_at is not None):
+                self.irregular = True
+            elif in_table and tag in ("table", "tr", "td", "th"):
+                inner = self._open[self._table_at + 1 :]
+                self.irregular = (
+                    tag == "table"
+                    or (tag == "tr" and "tr" in inner)
+                    or (tag in ("td", "th") and ("td" in inner or "th" in inner))
+                )
+        self._open.append(tag)
+        if tag == "a":
+            if self._link_at is None and len(self.fighters) < 2:
+                href = next((v for k, v in attrs if k == "href"), None) or ""
+                if "fighter-details" in href:
+                    self.fighters.append((href, []))
+                    self._link_at = len(self._open) - 1
+        elif tag == "table":
+            if not in_table:
+                classes = next((v for k, v in attrs if k == "class"), None) or ""
+                if "b-fight-details__table" in classes.split():
+                    self._table_at = len(self._open) - 1
+        elif not in_table:
+            return
+        elif tag == "tr":
+            self._row = []
+        elif tag == "td" and self._row is not None:
+            self._cell = []
+
+    def handle_endtag(self, tag: str) -> None:
+        if self.irregular or tag in _VOID_TAGS:
+            return
+        if not self._open or self._open[-1] != tag:
+            if self._table_at is not None or self._link_at is not None:
+                self.irregular = True
+            elif tag in self._open:  # close what it implies, as a tree builder would
+                del self._open[len(self._open) - 1 - self._open[::-1].index(tag) :]
+            return
+        self._open.pop()
+        depth = len(self._open)
+        if depth == self._link_at:
+            self._link_at = None
+        if depth == self._table_at:
+            self._table_at = None
+        elif self._table_at is None:
+            return
+        elif tag == "td" and self._cell is not None and self._row is not None:
+            self._row.append("".join(self._cell).strip())
+            self._cell = None
+        elif tag == "tr":
+            if self._row is not None and len(self._row) >= 2:
+                self.rows.append(self._row)
+            self._row = None
+
+    def handle_data(self, data: str) -> None:
+        if self._link_at is not None:
+            self.fighters[-1][1].append(data)
+        if self._cell is not None:
+            self._cell.append(data)
+
+    def unknown_decl(self, data: str) -> None:
+        # CDATA text is part of get_text(); this pass never sees it.
+        if self._table_at is not None or self._link_at is not None:
+            self.irregular = True
+
+
+def _stats_from_rows(
+    bout_id: str, rows: list[list[str]], fighter_infos: list[dict[str, Any]]
+) -> tuple[dict, dict, list[dict]]:
+    red_s: dict[str, Any] = {"bout_id": bout_id, "fighter_id": "", "corner": "red"}
+    blue_s: dict[str, Any] = {"bout_id": bout_id, "fighter_id": "", "corner": "blue"}
+    for cells in rows:
+        _, fields, kind = _stat_rule(cells[0].lower())
+        if fields:
+            _apply_stat(red_s, fields, kind, cells[1])
+            _apply_stat(blue_s, fields, kind, cells[2] if len(cells) > 2 else "")
+    if fighter_infos:
+        red_s["fighter_id"] = fighter_infos[0].get("fighter_id", "")
+        blue_s["fighter_id"] = (
+            fighter_infos[1].get("fighter_id", "") if len(fighter_infos) > 1 else ""
+        )
+    return red_s, blue_s, fighter_infos
+
+
+def _fight_details_from_tree(html: str, bout_id: str) -> tuple[dict, dict, list[dict]]:
+    """parse_fight_details() over a tree, for pages the streaming pass flags irregular.
+
+    Uses html.parser like the tree-based parser it replaced, so such pages keep
+    exactly the records they had (rows of nested tables included).
+    """
+    soup = BeautifulSoup(html, "html.parser")
+    fighter_infos: list[dict[str, Any]] = []
+    for a in soup.find_all("a", href=re.compile(r"fighter-details"))[:2]:
+        fid = _slug_from_href(a)
+        if fid:
+            fighter_infos.append({"fighter_id": fid, "name": _text(a)})
+    rows = []
+    for table in soup.select("table.b-fight-details__table"):
+        for tr in table.find_all("tr"):
+            cells = [_text(td) for td in tr.find_all("td")]
+            if len(cells) >= 2:
+                rows.append(cells)
+    return _stats_from_rows(bout_id, rows, fighter_infos)
+
+
 def parse_fight_details(
     html: str,
     bout_id: str,
@@ -220,97 +465,56 @@ def parse_fight_details(
     """
     Parse fight details page for stats. Returns (red_stats, blue_stats, fighter_infos).
     Each stats dict: FightStats fields. fighter_infos: list of {fighter_id, name, ...} from page.
+    Only the stats table rows and the two fighter links are extracted (one
+    streaming pass, no tree); rows are matched against _STAT_RULES.
     """
-    soup = BeautifulSoup(html, "html.parser")
+    extractor = _FightDetailsExtractor()
+    extractor.feed(html)
+    extractor.close()
+    if extractor.irregular:
+        return _fight_details_from_tree(html, bout_id)
     fighter_infos: list[dict[str, Any]] = []
-    # Two sides: red and blue. UFCStats uses .b-fight-details__person or similar.
-    persons = soup.select(".b-fight-details__person, .b-fight-details__persons")
-    if not persons:
-        persons = soup.select("[class*='fight-details'] [class*='person']")
-    links = soup.find_all("a", href=re.compile(r"fighter-details"))
-    for a in links[:2]:
-        fid = _slug_from_href(a)
+    for href, parts in extractor.fighters:
+        fid = _slug(href)
         if fid:
-            fighter_infos.append({"fighter_id": fid, "name": _text(a)})
+            fighter_infos.append({"fighter_id": fid, "name": "".join(parts).strip()})
+    return _stats_from_rows(bout_id, extractor.rows, fighter_infos)
 
-    # Stats table: Sig str, TD, etc. Often two columns (red | blue) or two rows.
-    def _parse_stats_table() -> tuple[Optional[dict], Optional[dict]]:
-        red_s: dict[str, Any] = {"bout_id": bout_id, "fighter_id": "", "corner": "red"}
-        blue_s: dict[str, Any] = {
-            "bout_id": bout_id,
-            "fighter_id": "",
-            "corner": "blue",
-        }
-        tables = soup.select("table.b-fight-details__table")
-        for table in tables:
-            rows = table.find_all("tr")
-            for row in rows:
-                cells = row.find_all("td")
-                if len(cells) < 2:
-                    continue
-                label = _text(cells[0]).lower()
-                v1 = _text(cells[1]) if len(cells) > 1 else ""
-                v2 = _text(cells[2]) if len(cells) > 2 else ""
-                if "sig. str" in label or "significant" in label:
-                    parts1 = re.split(r"\s+of\s+", v1)
-                    parts2 = re.split(r"\s+of\s+", v2)
-                    red_s["sig_str_landed"] = _int(parts1[0]) if parts1 else _int(v1)
-                    red_s["sig_str_att"] = _int(parts1[1]) if len(parts1) > 1 else None
-                    blue_s["sig_str_landed"] = _int(parts2[0]) if parts2 else _int(v2)
-                    blue_s["sig_str_att"] = _int(parts2[1]) if len(parts2) > 1 else None
-                elif "total str" in label or "total strike" in label:
-                    parts1 = re.split(r"\s+of\s+", v1)
-                    parts2 = re.split(r"\s+of\s+", v2)
-                    red_s["total_str_landed"] = _int(parts1[0]) if parts1 else _int(v1)
-                    red_s["total_str_att"] = (
-                        _int(parts1[1]) if len(parts1) > 1 else None
-                    )
-                    blue_s["total_str_landed"] = _int(parts2[0]) if parts2 else _int(v2)
-                    blue_s["total_str_att"] = (
-                        _int(parts2[1]) if len(parts2) > 1 else None
-                    )
-                elif "takedown" in label or (
-                    label and "td" in label and "sub" not in label
-                ):
-                    parts1 = re.split(r"\s+of\s+", v1)
-                    parts2 = re.split(r"\s+of\s+", v2)
-                    red_s["td_landed"] = _int(parts1[0]) if parts1 else _int(v1)
-                    red_s["td_att"] = _int(parts1[1]) if len(parts1) > 1 else None
-                    blue_s["td_landed"] = _int(parts2[0]) if parts2 else _int(v2)
-                    blue_s["td_att"] = _int(parts2[1]) if len(parts2) > 1 else None
-                elif "sub" in label:
-                    red_s["sub_att"] = _int(v1)
-                    blue_s["sub_att"] = _int(v2)
-                elif "reversal" in label or "rev" in label:
-                    red_s["rev"] = _int(v1)
-                    blue_s["rev"] = _int(v2)
-                elif "control" in label or "ctrl" in label:
-
-                    def to_seconds(s: str) -> Optional[float]:
-                        if not s:
-                            return None
-                        if ":" in s:
-                            parts = s.strip().split(":")
-                            if len(parts) == 2:
-                                try:
-                                    return int(parts[0]) * 60 + float(parts[1])
-                                except ValueError:
-                                    return None
-                        return _float(s)
-
-                    red_s["ctrl_time_seconds"] = to_seconds(v1)
-                    blue_s["ctrl_time_seconds"] = to_seconds(v2)
-        if fighter_infos:
-            red_s["fighter_id"] = fighter_infos[0].get("fighter_id", "")
-            blue_s["fighter_id"] = (
-                fighter_infos[1].get("fighter_id", "") if len(fighter_infos) > 1 else ""
-            )
-        return red_s, blue_s
 
-    red_stats, blue_stats = _parse_stats_table()
-    if fighter_infos and red_stats and blue_stats:
-        red_stats["fighter_id"] = fighter_infos[0].get("fighter_id", "")
-        blue_stats["fighter_id"] = (
-            fighter_infos[1].get("fighter_id", "") if len(fighter_infos) > 1 else ""
-        )
-    return red_stats, blue_stats, fighter_infos
+# Fighter page bio labels (lower-cased, without the colon) -> Fighter field.
+_FIGHTER_FIELDS = {"height": "height", "reach": "reach", "stance": "stance", "dob": "dob"}
+
+
+def parse_fighter_page(html: str, fighter_id: str) -> dict[str, Any]:
+    """
+    Parse fighter details page. Returns {fighter_id, name, height, reach, stance, dob}.
+    "--" placeholders become None; dob is normalized to YYYY-MM-DD when possible.
+    """
+    soup = _soup(html)
+    name = _text(soup.select_one(".b-content__title-highlight")) or None
+    out: dict[str, Any] = {"fighter_id": fighter_id, "name": name}
+    out.update(dict.fromkeys(_FIGHTER_FIELDS.values()))
+    for item in soup.select(".b-list__box-list-item"):
+        title = item.select_one(".b-list__box-item-title")
+        if title is None:
+            continue
+        label = _text(title).rstrip(":").strip().lower()
+        field = _FIGHTER_FIELDS.get(label)
+        if field is None:
+            continue
+        value = re.sub(r"\s+", " ", _text(item)[len(_text(title)) :]).strip()
+        if not value or value.strip("-") == "":
+            continue
+        if field == "dob":
+            value = _iso_date(value) or value
+        out[field] = value
+    return out
+
+
+def _iso_date(s: str) -> Optional[str]:
+    for fmt in ("%b %d, %Y", "%B %d, %Y", "%Y-%m-%d"):
+        try:
+            return datetime.strptime(s.strip(), fmt).strftime("%Y-%m-%d")
+        except ValueError:
+            continue
+    return None
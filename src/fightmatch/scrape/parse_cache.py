@@ -0,0 +1,78 @@
+"""Parse results cached by (page kind, item id, content hash, parser version).
+
+build_dataset() looks each raw page up by the sha256 the raw store already
+indexes, so unchanged pages are neither decompressed nor parsed again. Entries
+written by another PARSER_VERSION never match and are dropped on open.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any
+
+from .parse import PARSER_VERSION
+
+PARSE_CACHE_FILENAME = "parsed.sqlite"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS parsed (
+    kind    TEXT NOT NULL,     -- raw store kind: "events" | "fights" | "fighters"
+    item_id TEXT NOT NULL,
+    sha256  TEXT NOT NULL,     -- content hash of the parsed page
+    version INTEGER NOT NULL,  -- PARSER_VERSION that produced `data`
+    data    TEXT NOT NULL,     -- JSON of the parse function's return value
+    PRIMARY KEY (kind, item_id)
+)
+"""
+
+
+class ParseCache:
+    """JSON parse results keyed by page content; one row per (kind, item_id)."""
+
+    def __init__(self, path: Path, version: int = PARSER_VERSION):
+        self.path = Path(path)
+        self.version = version
+        self.hits = 0
+        self.misses = 0
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(_SCHEMA)
+        self._conn.execute("DELETE FROM parsed WHERE version != ?", (version,))
+        self._conn.commit()
+
+    @classmethod
+    def for_raw_dir(cls, raw_dir: Path) -> ParseCache:
+        return cls(Path(raw_dir) / "ufcstats" / PARSE_CACHE_FILENAME)
+
+    def get(self, kind: str, item_id: str, sha: str) -> Any | None:
+        """Cached result for this exact page content, or None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM parsed "
+                "WHERE kind = ? AND item_id = ? AND sha256 = ? AND version = ?",
+                (kind, item_id, sha, self.version),
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, kind: str, item_id: str, sha: str, value: Any) -> None:
+        """Store a result; committed on close() (one transaction per build)."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO parsed (kind, item_id, sha256, version, data) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (kind, item_id, sha, self.version, json.dumps(value)),
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.commit()
+            self._conn.close()
@@ -0,0 +1,147 @@
+"""Streaming ingest: parse pages on worker threads while the scrape is still fetching.
+
+scrape_since() hands every saved page to a ParsePipeline, whose parser threads
+fill the parse cache through a bounded queue; build_dataset() then reads the
+results instead of parsing any page again.
+"""
+
+from __future__ import annotations
+
+import queue
+import threading
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import requests
+
+from fightmatch.config import CacheConfig, ScrapeConfig
+from fightmatch.rawstore import Body
+from fightmatch.utils.log import log
+
+from .metrics import FetchRecorder
+from .parse import parse_event_page, parse_fight_details, parse_fighter_page
+from .parse_cache import ParseCache
+
+DEFAULT_PARSE_WORKERS = 2
+DEFAULT_MAX_PENDING = 64
+
+# Raw store kind -> parse(html, item_id), as build_dataset() calls them.
+PAGE_PARSERS: dict[str, Callable[[str, str], Any]] = {
+    "events": parse_event_page,
+    "fights": parse_fight_details,
+    "fighters": parse_fighter_page,
+}
+
+
+class ParsePipeline:
+    """Parser threads fed by a bounded queue of (kind, item_id, Body)."""
+
+    def __init__(
+        self,
+        cache: ParseCache,
+        workers: int = DEFAULT_PARSE_WORKERS,
+        max_pending: int = DEFAULT_MAX_PENDING,
+    ):
+        self.cache = cache
+        self.parsed_pages = 0
+        self.failed = 0
+        self._queue: queue.Queue[tuple[str, str, Body] | None] = queue.Queue(
+            maxsize=max(1, max_pending)
+        )
+        self._lock = threading.Lock()
+        self._threads = [
+            threading.Thread(target=self._work, daemon=True)
+            for _ in range(max(1, workers))
+        ]
+        for t in self._threads:
+            t.start()
+
+    def parsed(self, kind: str, item_id: str, sha: str, result: Any) -> None:
+        """Record a page the scraper already parsed itself."""
+        self.cache.put(kind, item_id, sha, result)
+        with self._lock:
+            self.parsed_pages += 1
+
+    def submit(self, kind: str, item_id: str, body: Body) -> None:
+        """Queue a saved page for parsing; blocks while the queue is full.
+
+        The pipeline takes ownership of body and closes it once parsed.
+        """
+        self._queue.put((kind, item_id, body))
+
+    def _work(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            kind, item_id, body = item
+            try:
+                with body:
+                    html = body.text()
+                result = PAGE_PARSERS[kind](html, item_id)
+                self.cache.put(kind, item_id, body.sha, result)
+                with self._lock:
+                    self.parsed_pages += 1
+            except Exception as e:
+                # build_dataset() skips unparseable pages too; it will retry this one.
+                log(f"Parse failed for {kind} {item_id}: {e}")
+                with self._lock:
+                    self.failed += 1
+
+    def close(self) -> None:
+        """Parse everything still queued, then stop the threads."""
+        for _ in self._threads:
+            self._queue.put(None)
+        for t in self._threads:
+            t.join()
+
+
+def ingest_since(
+    since_date: str,
+    raw_dir: Path,
+    out_dir: Path,
+    config: ScrapeConfig | None = None,
+    division: str = "",
+    concurrency: int | None = None,
+    parse_workers: int = DEFAULT_PARSE_WORKERS,
+    max_pending: int = DEFAULT_MAX_PENDING,
+    resume: bool = False,
+    incremental: bool = False,
+    fighters: bool = True,
+    cache_config: CacheConfig | None = None,
+    session: requests.Session | None = None,
+    recorder: FetchRecorder | None = None,
+) -> None:
+    """scrape_since() + build_dataset() with every fetched page parsed exactly once.
+
+    Pages are parsed by `parse_workers` threads as they are saved. The processed
+    outputs are then written from those results (and the parse cache for pages
+    this run did not fetch), so they are byte-identical to running scrape and
+    build-dataset separately.
+    """
+    from .store import build_dataset
+    from .ufcstats_client import scrape_since
+
+    cache = ParseCache.for_raw_dir(raw_dir)
+    pipeline = ParsePipeline(cache, workers=parse_workers, max_pending=max_pending)
+    try:
+        scrape_since(
+            since_date,
+            raw_dir,
+            config=config,
+            division=division,
+            concurrency=concurrency,
+            resume=resume,
+            cache_config=cache_config,
+            session=session,
+            recorder=recorder,
+            incremental=incremental,
+            fighters=fighters,
+            pipeline=pipeline,
+        )
+    finally:
+        pipeline.close()
+        cache.close()
+    log(f"Parsed {pipeline.parsed_pages} pages while scraping ({pipeline.failed} failed)")
+    build_dataset(raw_dir, out_dir, division=division)
@@ -0,0 +1,386 @@
+"""SQLite work queue for multi-process scrapes: leased jobs plus a shared rate limit.
+
+`fightmatch scrape --enqueue` seeds event jobs; `fightmatch scrape-worker`
+processes claim them with a heartbeat-renewed lease, so a dead worker's jobs
+are claimed again once it expires. The file lives in raw_dir/ufcstats/.
+"""
+
+from __future__ import annotations
+
+import random
+import sqlite3
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+
+from fightmatch.config import ScrapeConfig
+
+from .ufcstats_client import UNLIMITED_RATE, AdaptiveRateLimiter
+
+QUEUE_FILENAME = "queue.sqlite"
+DEFAULT_LEASE_SECONDS = 60.0
+DEFAULT_MAX_ATTEMPTS = 3
+
+# Job status values.
+PENDING = "pending"
+LEASED = "leased"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id        INTEGER PRIMARY KEY,
+    kind          TEXT NOT NULL,     -- "event" | "fight" | "fighter"
+    item_id       TEXT NOT NULL,
+    url           TEXT NOT NULL,
+    parent_id     TEXT,              -- event_id for fights
+    status        TEXT NOT NULL,
+    attempts      INTEGER NOT NULL DEFAULT 0,
+    not_before    REAL NOT NULL DEFAULT 0,  -- unix time; retry backoff
+    lease_owner   TEXT,
+    lease_expires REAL,
+    generation    INTEGER NOT NULL,  -- enqueue run that last scheduled the job
+    result        TEXT,              -- e.g. "complete" | "partial" for events
+    error         TEXT,
+    updated_at    REAL NOT NULL,
+    UNIQUE (kind, item_id)
+);
+CREATE INDEX IF NOT EXISTS jobs_claim ON jobs (status, not_before);
+CREATE INDEX IF NOT EXISTS jobs_parent ON jobs (parent_id);
+CREATE TABLE IF NOT EXISTS meta (
+    name  TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS limiter (
+    id        INTEGER PRIMARY KEY CHECK (id = 0),
+    rate      REAL NOT NULL,
+    next_at   REAL NOT NULL,  -- unix time of the next free request slot
+    throttles INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+
+@dataclass(frozen=True)
+class Job:
+    job_id: int
+    kind: str
+    item_id: str
+    url: str
+    parent_id: str | None
+    attempts: int  # including the current one
+    lease_owner: str
+
+
+class WorkQueue:
+    """Leased job queue in one SQLite file; safe to share between threads and processes."""
+
+    def __init__(self, path: Path, max_attempts: int = DEFAULT_MAX_ATTEMPTS):
+        self.path = Path(path)
+        self.max_attempts = max_attempts
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            self.path, check_same_thread=False, timeout=30, isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    @classmethod
+    def for_raw_dir(cls, raw_dir: Path, **kwargs) -> WorkQueue:
+        return cls(Path(raw_dir) / "ufcstats" / QUEUE_FILENAME, **kwargs)
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """Write transaction that holds the database lock from its first statement."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    # -- run metadata -------------------------------------------------------
+
+    def set_meta(self, **values: str) -> None:
+        with self.transaction() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO meta (name, value) VALUES (?, ?)",
+                list(values.items()),
+            )
+
+    def meta(self) -> dict[str, str]:
+        with self._lock:
+            return dict(self._conn.execute("SELECT name, value FROM meta"))
+
+    def new_generation(self) -> int:
+        """Start an enqueue run; finished jobs from older runs may be scheduled again."""
+        with self.transaction() as conn:
+            row = conn.execute(
+                "SELECT value FROM meta WHERE name = 'generation'"
+            ).fetchone()
+            generation = int(row[0]) + 1 if row else 1
+            conn.execute(
+                "INSERT OR REPLACE INTO meta (name, value) VALUES ('generation', ?)",
+                (str(generation),),
+            )
+        return generation
+
+    def generation(self) -> int:
+        return int(self.meta().get("generation", 0))
+
+    # -- producers ----------------------------------------------------------
+
+    def enqueue(
+        self,
+        kind: str,
+        item_id: str,
+        url: str,
+        parent_id: str | None = None,
+        generation: int | None = None,
+    ) -> bool:
+        """Schedule one job; True if it was added or rescheduled.
+
+        A job already pending or leased is left alone, as is a finished one from
+        the same generation, so each page is fetched at most once per run.
+        """
+        generation = self.generation() if generation is None else generation
+        with self.transaction() as conn:
+            cur = conn.execute(
+                """
+                INSERT INTO jobs
+                    (kind, item_id, url, parent_id, status, generation, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (kind, item_id) DO UPDATE SET
+                    url = excluded.url,
+                    parent_id = COALESCE(excluded.parent_id, parent_id),
+                    status = excluded.status,
+                    attempts = 0,
+                    not_before = 0,
+                    generation = excluded.generation,
+                    result = NULL,
+                    error = NULL,
+                    updated_at = excluded.updated_at
+                WHERE jobs.status IN (?, ?) AND jobs.generation < excluded.generation
+                """,
+                (
+                    kind,
+                    item_id,
+                    url,
+                    parent_id,
+                    PENDING,
+                    generation,
+                    time.time(),
+                    JOB_DONE,
+                    JOB_FAILED,
+                ),
+            )
+            return cur.rowcount > 0
+
+    # -- consumers ----------------------------------------------------------
+
+    def claim(self, worker_id: str, lease_seconds: float) -> Job | None:
+        """Lease the next runnable job (fights before events), or None.
+
+        Jobs whose lease expired count as runnable again; one that has used up
+        its attempts that way (its worker kept dying) is failed instead.
+        """
+        now = time.time()
+        with self.transaction() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = ?, error = 'lease expired', "
+                "lease_owner = NULL, updated_at = ? "
+                "WHERE status = ? AND lease_expires < ? AND attempts >= ?",
+                (JOB_FAILED, now, LEASED, now, self.max_attempts),
+            )
+            row = conn.execute(
+                "SELECT job_id, kind, item_id, url, parent_id, attempts FROM jobs "
+                "WHERE (status = ? AND not_before <= ?) "
+                "OR (status = ? AND lease_expires < ?) "
+                "ORDER BY kind = 'event', job_id LIMIT 1",
+                (PENDING, now, LEASED, now),
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE jobs SET status = ?, attempts = attempts + 1, "
+                "lease_owner = ?, lease_expires = ?, updated_at = ? WHERE job_id = ?",
+                (LEASED, worker_id, now + lease_seconds, now, row[0]),
+            )
+        job_id, kind, item_id, url, parent_id, attempts = row
+        return Job(job_id, kind, item_id, url, parent_id, attempts + 1, worker_id)
+
+    def heartbeat(self, worker_id: str, lease_seconds: float) -> int:
+        """Extend every lease worker_id holds; returns how many it still holds."""
+        now = time.time()
+        with self.transaction() as conn:
+            cur = conn.execute(
+                "UPDATE jobs SET lease_expires = ? "
+                "WHERE status = ? AND lease_owner = ?",
+                (now + lease_seconds, LEASED, worker_id),
+            )
+            return cur.rowcount
+
+    # Matches only the lease `job` was claimed under: once it expires and the job
+    # is claimed again (attempts goes up), the old holder can no longer settle it.
+    _HELD = "job_id = ? AND status = ? AND lease_owner = ? AND attempts = ?"
+
+    def _held(self, job: Job) -> tuple:
+        return (job.job_id, LEASED, job.lease_owner, job.attempts)
+
+    def complete(self, job: Job, result: str | None = None) -> bool:
+        """Mark the job done; False if its lease was lost (the job was left alone)."""
+        with self.transaction() as conn:
+            cur = conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = NULL, "
+                f"lease_owner = NULL, updated_at = ? WHERE {self._HELD}",
+                (JOB_DONE, result, time.time(), *self._held(job)),
+            )
+            return cur.rowcount > 0
+
+    def fail(self, job: Job, error: str, retry_in: float = 0.0) -> bool:
+        """Return the job to the queue after retry_in seconds, or fail it for good.
+
+        It is retried while job.attempts < max_attempts. Returns False if the
+        lease was lost, in which case the job is left to its new holder.
+        """
+        retry = job.attempts < self.max_attempts
+        now = time.time()
+        with self.transaction() as conn:
+            cur = conn.execute(
+                "UPDATE jobs SET status = ?, not_before = ?, error = ?, "
+                f"lease_owner = NULL, updated_at = ? WHERE {self._HELD}",
+                (
+                    PENDING if retry else JOB_FAILED,
+                    now + retry_in,
+                    error,
+                    now,
+                    *self._held(job),
+                ),
+            )
+            return cur.rowcount > 0
+
+    def children_settled(self, parent_id: str) -> bool:
+        """True once the parent's job is done as "complete" and all its children are done."""
+        with self._lock:
+            parent = self._conn.execute(
+                "SELECT status, result FROM jobs WHERE kind = 'event' AND item_id = ?",
+                (parent_id,),
+            ).fetchone()
+            open_children = self._conn.execute(
+                "SELECT COUNT(*) FROM jobs WHERE parent_id = ? AND status != ?",
+                (parent_id, JOB_DONE),
+            ).fetchone()[0]
+        return parent == (JOB_DONE, "complete") and open_children == 0
+
+    # -- status -------------------------------------------------------------
+
+    def active(self) -> int:
+        """Jobs pending or leased (0 means the queue is drained)."""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM jobs WHERE status IN (?, ?)", (PENDING, LEASED)
+            ).fetchone()[0]
+
+    def counts(self) -> dict[tuple[str, str], int]:
+        """(kind, status) -> number of jobs."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT kind, status, COUNT(*) FROM jobs GROUP BY kind, status"
+            ).fetchall()
+        return {(k, s): n for k, s, n in rows}
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class SharedRateLimiter(AdaptiveRateLimiter):
+    """AdaptiveRateLimiter whose state lives in the queue file.
+
+    Every worker process reserves slots from the same `limiter` row, so the rate
+    and Retry-After pauses are global. reset=True (`scrape --enqueue`) starts the
+    row over from this config's rate.
+    """
+
+    def __init__(self, queue: WorkQueue, reset: bool = False, **kwargs):
+        super().__init__(**kwargs)
+        self.queue = queue
+        with queue.transaction() as conn:
+            conn.execute(
+                f"INSERT OR {'REPLACE' if reset else 'IGNORE'} INTO limiter "
+                "(id, rate, next_at, throttles) VALUES (0, ?, 0, 0)",
+                (self.rate,),
+            )
+            conn.execute(
+                "UPDATE limiter SET rate = MIN(MAX(rate, ?), ?) WHERE id = 0",
+                (self.min_rate, self.max_rate),
+            )
+            (self.rate,) = conn.execute(
+                "SELECT rate FROM limiter WHERE id = 0"
+            ).fetchone()
+
+    @classmethod
+    def from_config(  # type: ignore[override]
+        cls, config: ScrapeConfig, queue: WorkQueue, reset: bool = False
+    ) -> SharedRateLimiter:
+        rate = (
+            1.0 / config.rate_limit_seconds
+            if config.rate_limit_seconds > 0
+            else UNLIMITED_RATE
+        )
+        return cls(
+            queue,
+            reset,
+            rate=rate,
+            min_rate=config.min_rate,
+            max_rate=config.max_rate,
+            increase=config.rate_increase,
+            decrease=config.rate_decrease,
+            jitter=config.rate_limit_jitter,
+        )
+
+    def wait(self) -> float:
+        with self.queue.transaction() as conn:
+            rate, next_at = conn.execute(
+                "SELECT rate, next_at FROM limiter WHERE id = 0"
+            ).fetchone()
+            now = time.time()
+            # Jitter is part of the reservation, so later slots queue behind it.
+            slot = max(now, next_at) + random.uniform(0, self.jitter)
+            conn.execute(
+                "UPDATE limiter SET next_at = ? WHERE id = 0", (slot + 1.0 / rate,)
+            )
+        self.rate = rate
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+    def succeeded(self) -> None:
+        with self.queue.transaction() as conn:
+            (rate,) = conn.execute("SELECT rate FROM limiter WHERE id = 0").fetchone()
+            rate = min(self.max_rate, rate + self.increase / rate)
+            conn.execute("UPDATE limiter SET rate = ? WHERE id = 0", (rate,))
+        self.rate = rate
+
+    def throttled(self, retry_after: float | None = None) -> None:
+        with self.queue.transaction() as conn:
+            rate, next_at, throttles = conn.execute(
+                "SELECT rate, next_at, throttles FROM limiter WHERE id = 0"
+            ).fetchone()
+            rate = max(self.min_rate, rate * self.decrease)
+            # Like TokenBucket's token debt: queued slots move back too.
+            next_at = max(next_at, time.time()) + (retry_after or 0.0)
+            conn.execute(
+                "UPDATE limiter SET rate = ?, next_at = ?, throttles = ? WHERE id = 0",
+                (rate, next_at, throttles + 1),
+            )
+        self.rate = rate
+        self.throttles = throttles + 1
+
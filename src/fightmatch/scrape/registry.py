@@ -0,0 +1,65 @@
+"""Dense integer ids for fighter, bout and event slugs.
+
+build_dataset() interns every id it writes into `ids.json`; the columnar
+tables store these ints, so id columns join without touching strings. A
+rebuild only appends, so an id keeps its integer across builds.
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from fightmatch.cache.base import atomic_write
+
+REGISTRY_FILENAME = "ids.json"
+ENTITIES = ("fighter", "bout", "event")
+
+
+class IdRegistry:
+    """slug <-> dense int (0..n-1) per entity kind."""
+
+    def __init__(self, slugs: dict[str, list[str]] | None = None):
+        self._slugs: dict[str, list[str]] = {e: [] for e in ENTITIES}
+        self._ids: dict[str, dict[str, int]] = {e: {} for e in ENTITIES}
+        for entity, values in (slugs or {}).items():
+            for slug in values:
+                self.intern(entity, slug)
+
+    @classmethod
+    def load(cls, path: Path) -> IdRegistry:
+        """The registry saved at path, or an empty one if there is none."""
+        path = Path(path)
+        if not path.exists():
+            return cls()
+        data = json.loads(path.read_text(encoding="utf-8"))
+        return cls({e: data.get(e, []) for e in ENTITIES})
+
+    @classmethod
+    def for_processed_dir(cls, processed_dir: Path) -> IdRegistry:
+        return cls.load(Path(processed_dir) / REGISTRY_FILENAME)
+
+    def save(self, path: Path) -> None:
+        atomic_write(Path(path), json.dumps(self._slugs).encode("utf-8"))
+
+    def intern(self, entity: str, slug: str) -> int:
+        """The id of slug, assigning the next one on first sight."""
+        ids = self._ids[entity]
+        i = ids.get(slug)
+        if i is None:
+            i = ids[slug] = len(ids)
+            self._slugs[entity].append(slug)
+        return i
+
+    def get(self, entity: str, slug: str) -> int | None:
+        return self._ids[entity].get(slug)
+
+    def slug(self, entity: str, i: int) -> str:
+        return self._slugs[entity][i]
+
+    def slugs(self, entity: str) -> list[str]:
+        """Every slug of entity, indexed by id (do not mutate)."""
+        return self._slugs[entity]
+
+    def __len__(self) -> int:
+        return sum(len(v) for v in self._slugs.values())
@@ -0,0 +1,152 @@
+"""Offline stand-in for ufcstats.com: replay a recorded corpus through requests.
+
+ReplayAdapter is a requests transport adapter, so fetch() and scrape_since() run
+unchanged against it: same session, retries, rate limiter and cache. Latency,
+5xx errors and 429s are injected from a seeded RNG so benchmark runs repeat.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import random
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+
+from fightmatch.cache import DiskCache, PackCache
+from fightmatch.cache.pack import PACK_FILENAME
+from fightmatch.config import ScrapeConfig
+from fightmatch.rawstore import RawStore
+
+from .manifest import MANIFEST_FILENAME, ScrapeManifest
+
+
+def load_corpus(raw_dir: Path, config: ScrapeConfig | None = None) -> dict[str, bytes]:
+    """url -> body for every page a previous scrape recorded under raw_dir.
+
+    Event and fight pages come from the manifest (url + content hash) and the
+    raw store; the events index, which the manifest does not track, comes from
+    the HTTP cache even if expired.
+    """
+    config = config or ScrapeConfig()
+    base = Path(raw_dir) / "ufcstats"
+    if not (base / MANIFEST_FILENAME).exists():
+        raise FileNotFoundError(f"No scrape manifest under {base}")
+    manifest = ScrapeManifest.for_raw_dir(raw_dir)
+    raw_store = RawStore(base)
+    pages: dict[str, bytes] = {}
+    try:
+        for url, sha in manifest.pages():
+            body = raw_store.objects.get(sha)
+            if body is not None:
+                pages[url] = body
+        listing = f"{config.base_url}/statistics/events/completed?page=all"
+        caches: list[DiskCache | PackCache] = [
+            DiskCache(base, objects=raw_store.objects)
+        ]
+        if (base / PACK_FILENAME).exists():
+            caches.append(PackCache(base / PACK_FILENAME))
+        for cache in caches:
+            stale = cache.get_stale(listing)
+            if stale is not None:
+                pages.setdefault(listing, stale[0])
+            cache.close()
+    finally:
+        manifest.close()
+        raw_store.close()
+    return pages
+
+
+class ReplayAdapter(BaseAdapter):
+    """Serve `pages` with injected latency, 5xx errors and 429 throttling.
+
+    Each response gets a content-hash ETag and If-None-Match is honoured, so
+    cache revalidation is exercised too. Unknown URLs are 404. `requests` and
+    `statuses` count what was served.
+    """
+
+    def __init__(
+        self,
+        pages: dict[str, bytes],
+        latency: float = 0.0,
+        latency_jitter: float = 0.0,
+        error_rate: float = 0.0,
+        throttle_rate: float = 0.0,
+        retry_after: float = 1.0,
+        seed: int = 0,
+    ):
+        super().__init__()
+        self.pages = pages
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.requests = 0
+        self.bytes_sent = 0
+        self.statuses: Counter[int] = Counter()
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        with self._lock:
+            self.requests += 1
+            roll = self._rng.random()
+            delay = self.latency + self._rng.uniform(0, self.latency_jitter)
+        if delay > 0:
+            time.sleep(delay)
+        url = request.url or ""
+        body = self.pages.get(url)
+        headers: dict[str, str] = {}
+        if roll < self.throttle_rate:
+            status, content = 429, b""
+            headers["Retry-After"] = f"{self.retry_after:g}"
+        elif roll < self.throttle_rate + self.error_rate:
+            status, content = 503, b""
+        elif body is None:
+            status, content = 404, b""
+        else:
+            etag = f'"{hashlib.sha256(body).hexdigest()[:16]}"'
+            headers["ETag"] = etag
+            if request.headers.get("If-None-Match") == etag:
+                status, content = 304, b""
+            else:
+                status, content = 200, body
+        with self._lock:
+            self.statuses[status] += 1
+            self.bytes_sent += len(content)
+        return self._response(request, status, content, headers)
+
+    @staticmethod
+    def _response(
+        request: requests.PreparedRequest,
+        status: int,
+        content: bytes,
+        headers: dict[str, str],
+    ) -> requests.Response:
+        r = requests.Response()
+        r.status_code = status
+        r._content = content
+        r._content_consumed = True  # iter_content() slices _content
+        r.headers = CaseInsensitiveDict(headers)
+        r.url = request.url or ""
+        r.request = request
+        r.encoding = "utf-8"
+        return r
+
+    def close(self) -> None:
+        pass
+
+
+def replay_session(adapter: ReplayAdapter, config: ScrapeConfig) -> requests.Session:
+    """Session routed entirely through adapter (nothing reaches the network)."""
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers["User-Agent"] = config.user_agent
+    return session
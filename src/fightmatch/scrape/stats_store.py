@@ -0,0 +1,254 @@
+"""Fixed-width stats file with offset indexes, read through mmap.
+
+`stats.bin` holds every stats row as a fixed-width record, then CSR indexes
+by bout and by fighter id (IdRegistry ints), in native byte order:
+
+    header      magic, byte order, rows, #bouts, #fighters (64 bytes)
+    records     rows x _RECORD
+    by bout     int64 offsets[#bouts + 1], int32 rows[rows]   (8-byte aligned)
+    by fighter  int64 offsets[#fighters + 1], int32 rows[rows]
+"""
+
+from __future__ import annotations
+
+import math
+import mmap
+import os
+import struct
+import sys
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any
+
+from .registry import IdRegistry
+
+STATS_STORE_FILENAME = "stats.bin"
+MAGIC = b"FMSTAT1\n"
+INT32_NULL = -(2**31)
+
+_HEADER = struct.Struct("<8s8sQQQ")
+_HEADER_SIZE = 64
+# bout id, fighter id, corner code, pad, 8 counts, control time
+_RECORD = struct.Struct("<iib3x8id")
+_COUNT_FIELDS = (
+    "sig_str_landed",
+    "sig_str_att",
+    "total_str_landed",
+    "total_str_att",
+    "td_landed",
+    "td_att",
+    "sub_att",
+    "rev",
+)
+_CORNERS = ("red", "blue")
+# The two id fields of a record, read back to build the indexes.
+_IDS = struct.Struct(f"<ii{_RECORD.size - 8}x")
+
+
+def _align(n: int) -> int:
+    return (n + 7) & ~7
+
+
+def _index(records: memoryview, field: int, offsets: memoryview, rows: memoryview) -> None:
+    """Fill a CSR index in place: rows keyed k by id `field` go to rows[offsets[k]:offsets[k + 1]].
+
+    offsets must start zeroed. They double as fill cursors, so nothing is
+    allocated beyond the mapped arrays.
+    """
+    n = len(offsets) - 1
+    for ids in _IDS.iter_unpack(records):
+        if ids[field] >= 0:
+            offsets[ids[field] + 1] += 1
+    for k in range(n):
+        offsets[k + 1] += offsets[k]
+    # offsets[k] now starts key k; advancing it while filling leaves it at the
+    # start of key k + 1, so the array ends up shifted one place left.
+    for row, ids in enumerate(_IDS.iter_unpack(records)):
+        k = ids[field]
+        if k >= 0:
+            rows[offsets[k]] = row
+            offsets[k] += 1
+    for k in range(n, 0, -1):
+        offsets[k] = offsets[k - 1]
+    offsets[0] = 0
+
+
+class StatsStoreWriter:
+    """Appends stats records to a stats.bin file; same write/close/abort shape as ColumnarWriter.
+
+    Records go to a temp file as they come. close() reserves the index arrays
+    behind them and fills them through a mapping of that file, so memory does
+    not grow with the number of rows. Ids are interned into registry, which
+    the caller saves next to the file.
+    """
+
+    def __init__(self, path: Path, registry: IdRegistry):
+        self.path = Path(path)
+        self.registry = registry
+        self.count = 0
+        self._tmp = self.path.with_name(f".{self.path.name}.tmp")
+        self._fh = open(self._tmp, "w+b")
+        self._fh.write(bytes(_HEADER_SIZE))  # filled in by close()
+
+    def _id(self, entity: str, v: Any) -> int:
+        return self.registry.intern(entity, str(v)) if v else -1
+
+    def write(self, record: dict) -> None:
+        corner = record.get("corner")
+        counts = (record.get(name) for name in _COUNT_FIELDS)
+        ctrl = record.get("ctrl_time_seconds")
+        self._fh.write(
+            _RECORD.pack(
+                self._id("bout", record.get("bout_id")),
+                self._id("fighter", record.get("fighter_id")),
+                _CORNERS.index(corner) if corner in _CORNERS else -1,
+                *(INT32_NULL if c is None else int(c) for c in counts),
+                math.nan if ctrl is None else float(ctrl),
+            )
+        )
+        self.count += 1
+
+    def close(self) -> None:
+        fh = self._fh
+        rows = self.count
+        sizes = (len(self.registry.slugs("bout")), len(self.registry.slugs("fighter")))
+        try:
+            fh.seek(0)
+            fh.write(_HEADER.pack(MAGIC, sys.byteorder.encode(), rows, *sizes))
+            pos = _HEADER_SIZE + rows * _RECORD.size
+            sections = []
+            for n in sizes:
+                pos = _align(pos)
+                sections.append((pos, n))
+                pos += 8 * (n + 1) + 4 * rows
+            fh.truncate(pos)  # zero-filled
+            fh.flush()
+            with mmap.mmap(fh.fileno(), pos) as mm:
+                view = memoryview(mm)
+                records = view[_HEADER_SIZE : _HEADER_SIZE + rows * _RECORD.size]
+                for field, (at, n) in enumerate(sections):
+                    rows_at = at + 8 * (n + 1)
+                    offsets = view[at:rows_at].cast("q")
+                    row_numbers = view[rows_at : rows_at + 4 * rows].cast("i")
+                    _index(records, field, offsets, row_numbers)
+                    offsets.release()
+                    row_numbers.release()
+                records.release()
+                view.release()
+            fh.close()
+            os.replace(self._tmp, self.path)
+        except BaseException:
+            self.abort()
+            raise
+
+    def abort(self) -> None:
+        self._fh.close()
+        self._tmp.unlink(missing_ok=True)
+
+
+def write_stats_store(path: Path, records: Iterable[dict], registry: IdRegistry) -> int:
+    """Write stats records as a stats.bin file; returns the row count."""
+    writer = StatsStoreWriter(path, registry)
+    try:
+        for r in records:
+            writer.write(r)
+    except BaseException:
+        writer.abort()
+        raise
+    writer.close()
+    return writer.count
+
+
+class StatsStore:
+    """Random access to stats rows by bout or fighter over a memory-mapped stats.bin.
+
+    Row-number views returned by rows_for_*() point into the mapping and are
+    valid until close().
+    """
+
+    def __init__(self, path: Path, registry: IdRegistry):
+        self.registry = registry
+        self._fh = open(path, "rb")
+        self._mm = mmap.mmap(self._fh.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._mm)
+        magic, order, rows, n_bouts, n_fighters = _HEADER.unpack_from(self._view)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a stats store")
+        if order.rstrip(b"\0").decode() != sys.byteorder:
+            self.close()
+            raise ValueError(f"{path} was built with another byte order; rebuild it")
+        self.rows = rows
+        self._records = self._view[_HEADER_SIZE : _HEADER_SIZE + rows * _RECORD.size]
+        pos = _HEADER_SIZE + rows * _RECORD.size
+        self._indexes: dict[str, tuple[memoryview, memoryview]] = {}
+        for entity, n in (("bout", n_bouts), ("fighter", n_fighters)):
+            pos = _align(pos)
+            offsets = self._view[pos : pos + 8 * (n + 1)].cast("q")
+            pos += 8 * (n + 1)
+            row_numbers = self._view[pos : pos + 4 * rows].cast("i")
+            pos += 4 * rows
+            self._indexes[entity] = (offsets, row_numbers)
+
+    @classmethod
+    def for_processed_dir(
+        cls, processed_dir: Path, registry: IdRegistry | None = None
+    ) -> StatsStore:
+        processed_dir = Path(processed_dir)
+        if registry is None:
+            registry = IdRegistry.for_processed_dir(processed_dir)
+        return cls(processed_dir / STATS_STORE_FILENAME, registry)
+
+    def _rows(self, entity: str, slug: str) -> memoryview:
+        offsets, row_numbers = self._indexes[entity]
+        i = self.registry.get(entity, slug)
+        if i is None or i + 1 >= len(offsets):
+            return row_numbers[0:0]
+        return row_numbers[offsets[i] : offsets[i + 1]]
+
+    def rows_for_fighter(self, fighter_id: str) -> memoryview:
+        """Row numbers (int32 view into the file) of the fighter's stats, in build order."""
+        return self._rows("fighter", fighter_id)
+
+    def rows_for_bout(self, bout_id: str) -> memoryview:
+        return self._rows("bout", bout_id)
+
+    def raw(self, row: int) -> tuple:
+        """The fixed-width record as stored: registry ids, corner code, nulls as sentinels."""
+        return _RECORD.unpack_from(self._records, row * _RECORD.size)
+
+    def record(self, row: int) -> dict[str, Any]:
+        """Row as a stats.jsonl-style dict (slugs restored, None for nulls)."""
+        bout, fighter, corner, *values = self.raw(row)
+        ctrl = values.pop()
+        rec: dict[str, Any] = {
+            "bout_id": self.registry.slug("bout", bout) if bout >= 0 else None,
+            "fighter_id": self.registry.slug("fighter", fighter) if fighter >= 0 else None,
+            "corner": _CORNERS[corner] if corner >= 0 else None,
+        }
+        for name, v in zip(_COUNT_FIELDS, values):
+            rec[name] = None if v == INT32_NULL else v
+        rec["ctrl_time_seconds"] = None if math.isnan(ctrl) else ctrl
+        return rec
+
+    def for_fighter(self, fighter_id: str) -> list[dict[str, Any]]:
+        return [self.record(r) for r in self.rows_for_fighter(fighter_id)]
+
+    def for_bout(self, bout_id: str) -> list[dict[str, Any]]:
+        return [self.record(r) for r in self.rows_for_bout(bout_id)]
+
+    def close(self) -> None:
+        for offsets, row_numbers in getattr(self, "_indexes", {}).values():
+            offsets.release()
+            row_numbers.release()
+        if hasattr(self, "_records"):
+            self._records.release()
+        self._view.release()
+        self._mm.close()
+        self._fh.close()
+
+    def __enter__(self) -> StatsStore:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
@@ -3,13 +3,32 @@
 from __future__ import annotations
 
 import json
+import os
 import re
+import sys
+from collections import deque
+from collections.abc import Callable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
 from datetime import datetime
+from functools import partial
 from pathlib import Path
+from typing import Any
 
 from fightmatch.config import normalize_division
+from fightmatch.rawstore import RawStore
 from fightmatch.utils.log import log
-from .parse import parse_event_page, parse_fight_details
+from .parse import (
+    parse_event_page,
+    parse_fight_details,
+    parse_fighter_page,
+    parser_backend,
+    set_parser_backend,
+)
+from .columnar import ColumnarWriter, table_path
+from .parse_cache import ParseCache
+from .registry import REGISTRY_FILENAME, IdRegistry
+from .stats_store import STATS_STORE_FILENAME, StatsStoreWriter
 
 
 def _normalize_date(s: str | None) -> str | None:
@@ -27,119 +46,370 @@ def _normalize_date(s: str | None) -> str | None:
     return s
 
 
-def build_dataset(raw_dir: Path, out_dir: Path, division: str = "") -> None:
-    """Read raw_dir/ufcstats (events/*.html, fights/*.html). Keep all events; if division set, only emit bouts/stats for that weight class."""
+class _PageReader:
+    """Parses raw pages, reusing parse-cache results for unchanged content.
+
+    The cache is only read here; results parsed fresh are collected in `fresh`
+    as (kind, item_id, sha, result) for the caller to store, so pool workers
+    never write to the cache file concurrently.
+    """
+
+    def __init__(self, raw_store: RawStore, cache: ParseCache | None):
+        self.raw_store = raw_store
+        self.cache = cache
+        self.fresh: list[tuple[str, str, str, Any]] = []
+
+    def parse(self, kind: str, item_id: str, parse: Callable[[str], Any]) -> Any | None:
+        """parse(html) of a raw page; unchanged pages come from the cache unread."""
+        cache = self.cache
+        sha = self.raw_store.sha(kind, item_id) if cache is not None else None
+        if sha is not None:
+            cached = cache.get(kind, item_id, sha)
+            if cached is not None:
+                return cached
+        html = self.raw_store.read_text(kind, item_id)
+        if html is None:
+            return None
+        result = parse(html)
+        if sha is not None:
+            self.fresh.append((kind, item_id, sha, result))
+        return result
+
+    def take(self) -> tuple[list[tuple[str, str, str, Any]], int, int]:
+        """(fresh results, cache hits, cache misses) since the last take()."""
+        fresh, self.fresh = self.fresh, []
+        if self.cache is None:
+            return fresh, 0, 0
+        hits, misses = self.cache.hits, self.cache.misses
+        self.cache.hits = self.cache.misses = 0
+        return fresh, hits, misses
+
+
+@dataclass
+class _EventUnit:
+    """Everything one event contributes to the dataset, in page order."""
+
+    event_info: dict
+    bouts: list[dict]  # bouts kept by the division filter
+    fights: list[tuple[dict | None, dict | None, list[dict]]]  # parsed fight pages
+    fresh: list[tuple[str, str, str, Any]] = field(default_factory=list)
+    cache_hits: int = 0
+    cache_misses: int = 0
+
+
+def _parse_event(
+    reader: _PageReader, event_id: str, target_division: str
+) -> _EventUnit | None:
+    """Parse one event page and the fight pages of its kept bouts."""
+    parsed = reader.parse(
+        "events", event_id, lambda html: parse_event_page(html, event_id)
+    )
+    if parsed is None:
+        return None
+    event_info, bouts, fight_links = parsed
+    kept = [
+        b
+        for b in bouts
+        if b.get("bout_id")
+        and (
+            not target_division
+            or normalize_division(b.get("weight_class")) == target_division
+        )
+    ]
+    fights = []
+    for fl in fight_links:
+        bout_id = fl.get("bout_id")
+        if not bout_id:
+            continue
+        if target_division:
+            # Only process fights for bouts we kept
+            matching = next((x for x in bouts if x.get("bout_id") == bout_id), None)
+            if (
+                not matching
+                or normalize_division(matching.get("weight_class")) != target_division
+            ):
+                continue
+        try:
+            fight = reader.parse(
+                "fights", bout_id, lambda html: parse_fight_details(html, bout_id)
+            )
+        except Exception:
+            continue
+        if fight is not None:
+            fights.append(tuple(fight))
+    fresh, hits, misses = reader.take()
+    return _EventUnit(event_info, kept, fights, fresh, hits, misses)
+
+
+def _parse_fighter(reader: _PageReader, fid: str) -> dict | None:
+    try:
+        return reader.parse(
+            "fighters", fid, lambda html: parse_fighter_page(html, fid)
+        )
+    except Exception:
+        return None
+
+
+# Per-process state of build_dataset(jobs > 1) pool workers.
+_worker_reader: _PageReader | None = None
+
+
+def _init_worker(
+    raw_base: Path, raw_dir: Path, parse_cache: bool, backend: str
+) -> None:
+    global _worker_reader
+    set_parser_backend(backend)  # spawned workers would not inherit it
+    cache = ParseCache.for_raw_dir(raw_dir) if parse_cache else None
+    _worker_reader = _PageReader(RawStore(raw_base), cache)
+
+
+def _worker_event(event_id: str, target_division: str) -> _EventUnit | None:
+    assert _worker_reader is not None
+    return _parse_event(_worker_reader, event_id, target_division)
+
+
+def _worker_fighter(fid: str) -> tuple[dict | None, list, int, int]:
+    assert _worker_reader is not None
+    details = _parse_fighter(_worker_reader, fid)
+    return (details, *_worker_reader.take())
+
+
+def _new_fighter(fid: str) -> dict:
+    return {
+        "fighter_id": fid,
+        "name": fid,
+        "height": None,
+        "reach": None,
+        "stance": None,
+        "dob": None,
+    }
+
+
+class _StreamWriter:
+    """Writes records to a temp file as they come; close() moves it into place.
+
+    Arrays come out byte-identical to json.dumps(records, indent=2), lines as
+    one json.dumps(record) per line, without holding the records in memory.
+    abort() drops the temp file, leaving any previous output untouched.
+    """
+
+    def __init__(self, path: Path, lines: bool = False):
+        self.path = path
+        self.lines = lines
+        self.count = 0
+        self._tmp = path.with_name(f".{path.name}.tmp")
+        self._fh = open(self._tmp, "w", encoding="utf-8")
+
+    def write(self, record: Any) -> None:
+        if self.lines:
+            self._fh.write(json.dumps(record) + "\n")
+        else:
+            # JSON strings escape newlines, so every raw newline is structural.
+            self._fh.write(",\n  " if self.count else "[\n  ")
+            self._fh.write(json.dumps(record, indent=2).replace("\n", "\n  "))
+        self.count += 1
+
+    def close(self) -> None:
+        if not self.lines:
+            self._fh.write("\n]" if self.count else "[]")
+        self._fh.close()
+        os.replace(self._tmp, self.path)
+
+    def abort(self) -> None:
+        self._fh.close()
+        self._tmp.unlink(missing_ok=True)
+
+
+class _Tee:
+    """Feeds each record to several writers (JSON, columnar and stats.bin copies of a table)."""
+
+    def __init__(self, *writers: _StreamWriter | ColumnarWriter | StatsStoreWriter):
+        self.writers = writers
+
+    @property
+    def count(self) -> int:
+        return self.writers[0].count
+
+    def write(self, record: Any) -> None:
+        for w in self.writers:
+            w.write(record)
+
+    def close(self) -> None:
+        for w in self.writers:
+            w.close()
+
+    def abort(self) -> None:
+        for w in self.writers:
+            w.abort()
+
+
+def _output(
+    out_dir: Path, table: str, filename: str, registry: IdRegistry, lines: bool = False
+) -> _Tee:
+    writers: list[_StreamWriter | ColumnarWriter | StatsStoreWriter] = [
+        _StreamWriter(out_dir / filename, lines=lines),
+        ColumnarWriter(table_path(out_dir, table), table, registry),
+    ]
+    if table == "stats":
+        writers.append(StatsStoreWriter(out_dir / STATS_STORE_FILENAME, registry))
+    return _Tee(*writers)
+
+
+def _ordered_map(
+    pool: ProcessPoolExecutor, fn: Callable[[Any], Any], items: list, window: int
+) -> Iterator[Any]:
+    """pool.map() that keeps at most `window` tasks in flight.
+
+    Executor.map() submits everything up front, so results finished ahead of a
+    slow task pile up in memory; here the parent stays at most `window` behind.
+    """
+    pending: deque[Future] = deque()
+    for item in items:
+        pending.append(pool.submit(fn, item))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def build_dataset(
+    raw_dir: Path,
+    out_dir: Path,
+    division: str = "",
+    parse_cache: bool = True,
+    jobs: int = 1,
+) -> None:
+    """Read raw_dir/ufcstats through RawStore; if division set, only emit bouts/stats for that weight class.
+
+    Parse results are reused from parsed.sqlite (parse_cache); jobs > 1 parses in
+    a process pool with byte-identical output. Records are streamed to disk and
+    files replaced only on success; each table also gets a `<table>.col` copy
+    and stats a stats.bin (see StatsStore).
+    """
     raw_base = Path(raw_dir) / "ufcstats"
-    events_dir = raw_base / "events"
-    fights_dir = raw_base / "fights"
     out_dir = Path(out_dir)
     out_dir.mkdir(parents=True, exist_ok=True)
 
     target_division = normalize_division(division) if division else ""
     fighters_by_id: dict[str, dict] = {}
-    events_list: list[dict] = []
-    bouts_list: list[dict] = []
-    stats_list: list[dict] = []
-
-    if events_dir.exists():
-        for p in sorted(events_dir.glob("*.html")):
-            event_id = p.stem
-            html = p.read_text(encoding="utf-8", errors="replace")
-            event_info, bouts, fight_links = parse_event_page(html, event_id)
-            events_list.append(event_info)
-            for b in bouts:
-                if (
-                    target_division
-                    and normalize_division(b.get("weight_class")) != target_division
-                ):
-                    continue
-                if not b.get("bout_id"):
-                    continue
-                bouts_list.append(b)
-                for fid in (b.get("red_fighter_id"), b.get("blue_fighter_id")):
-                    if fid and fid not in fighters_by_id:
-                        fighters_by_id[fid] = {
-                            "fighter_id": fid,
-                            "name": fid,
-                            "height": None,
-                            "reach": None,
-                            "stance": None,
-                            "dob": None,
-                        }
-
-            for fl in fight_links:
-                bout_id = fl.get("bout_id")
-                if not bout_id:
-                    continue
-                if target_division:
-                    # Only process fights for bouts we kept
-                    matching = next(
-                        (x for x in bouts if x.get("bout_id") == bout_id), None
-                    )
-                    if (
-                        not matching
-                        or normalize_division(matching.get("weight_class"))
-                        != target_division
-                    ):
-                        continue
-                fight_path = fights_dir / f"{bout_id}.html"
-                if not fight_path.exists():
+    seen_events: set[str] = set()
+    registry = IdRegistry.for_processed_dir(out_dir)
+    events_out = _output(out_dir, "events", "events.json", registry)
+    bouts_out = _output(out_dir, "bouts", "bouts.json", registry)
+    stats_out = _output(out_dir, "stats", "stats.jsonl", registry, lines=True)
+    fighters_out = _output(out_dir, "fighters", "fighters.json", registry)
+    writers = (fighters_out, events_out, bouts_out, stats_out)
+
+    def fighter(fid: str) -> dict:
+        entry = fighters_by_id.get(fid)
+        if entry is None:
+            fid = sys.intern(fid)
+            entry = fighters_by_id[fid] = _new_fighter(fid)
+        return entry
+
+    raw_store = RawStore(raw_base) if raw_base.exists() else None
+    cache = ParseCache.for_raw_dir(raw_dir) if raw_store and parse_cache else None
+    pool = None
+    hits = misses = 0
+    try:
+        if raw_store is not None:
+            event_ids = raw_store.ids("events")
+            reader = _PageReader(raw_store, cache)
+            if jobs > 1 and event_ids:
+                pool = ProcessPoolExecutor(
+                    max_workers=jobs,
+                    initializer=_init_worker,
+                    initargs=(
+                        raw_base,
+                        Path(raw_dir),
+                        cache is not None,
+                        parser_backend(),
+                    ),
+                )
+            if pool is None:
+                units = (
+                    _parse_event(reader, eid, target_division) for eid in event_ids
+                )
+            else:
+                units = _ordered_map(
+                    pool,
+                    partial(_worker_event, target_division=target_division),
+                    event_ids,
+                    window=jobs * 8,
+                )
+            for unit in units:
+                if unit is None:
                     continue
-                try:
-                    fight_html = fight_path.read_text(
-                        encoding="utf-8", errors="replace"
-                    )
-                    red_s, blue_s, fighter_infos = parse_fight_details(
-                        fight_html, bout_id
-                    )
+                hits += unit.cache_hits
+                misses += unit.cache_misses
+                for entry in unit.fresh:
+                    cache.put(*entry)
+                e = unit.event_info
+                eid = e.get("event_id")
+                if eid and eid not in seen_events:
+                    seen_events.add(eid)
+                    if e.get("date"):
+                        e = {**e, "date": _normalize_date(e["date"])}
+                    events_out.write(e)
+                for b in unit.bouts:
+                    bouts_out.write(b)
+                    for fid in (b.get("red_fighter_id"), b.get("blue_fighter_id")):
+                        if fid:
+                            fighter(fid)
+                for red_s, blue_s, fighter_infos in unit.fights:
                     for info in fighter_infos:
                         fid = info.get("fighter_id")
                         if fid:
-                            fighters_by_id.setdefault(
-                                fid,
-                                {
-                                    "fighter_id": fid,
-                                    "name": fid,
-                                    "height": None,
-                                    "reach": None,
-                                    "stance": None,
-                                    "dob": None,
-                                },
-                            )["name"] = info.get("name", fid)
+                            fighter(fid)["name"] = info.get("name", fid)
                     if red_s and red_s.get("fighter_id"):
-                        stats_list.append(red_s)
+                        stats_out.write(red_s)
                     if blue_s and blue_s.get("fighter_id"):
-                        stats_list.append(blue_s)
-                except Exception:
-                    continue
+                        stats_out.write(blue_s)
 
-    seen_events: set[str] = set()
-    unique_events: list[dict] = []
-    for e in events_list:
-        eid = e.get("event_id")
-        if eid and eid not in seen_events:
-            seen_events.add(eid)
-            if e.get("date"):
-                e = {**e, "date": _normalize_date(e["date"])}
-            unique_events.append(e)
-
-    fighters_out = list(fighters_by_id.values())
-    (out_dir / "fighters.json").write_text(
-        json.dumps(fighters_out, indent=2), encoding="utf-8"
-    )
-    (out_dir / "events.json").write_text(
-        json.dumps(unique_events, indent=2), encoding="utf-8"
-    )
-    (out_dir / "bouts.json").write_text(
-        json.dumps(bouts_list, indent=2), encoding="utf-8"
-    )
-    with open(out_dir / "stats.jsonl", "w", encoding="utf-8") as f:
-        for s in stats_list:
-            f.write(json.dumps(s) + "\n")
+            fighter_ids = list(fighters_by_id)
+            if pool is None:
+
+                def parse_fighters() -> Iterator[tuple]:
+                    for fid in fighter_ids:
+                        details = _parse_fighter(reader, fid)
+                        yield (details, *reader.take())
+
+                results = parse_fighters()
+            else:
+                results = _ordered_map(pool, _worker_fighter, fighter_ids, jobs * 8)
+            for fid, (details, fresh, fhits, fmisses) in zip(fighter_ids, results):
+                hits += fhits
+                misses += fmisses
+                for entry in fresh:
+                    cache.put(*entry)
+                if details is None:
+                    continue
+                entry = fighters_by_id[fid]
+                for k, v in details.items():
+                    if v is not None:
+                        entry[k] = v
+        for f in fighters_by_id.values():
+            fighters_out.write(f)
+    except BaseException:
+        for w in writers:
+            w.abort()
+        raise
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+        if raw_store is not None:
+            raw_store.close()
+        if cache is not None:
+            log(f"Parse cache: {hits} pages reused, {misses} parsed")
+            cache.close()
+    # Append-only, so saving it first keeps any previous .col files decodable.
+    registry.save(out_dir / REGISTRY_FILENAME)
+    for w in writers:
+        w.close()
 
     # Defensive logging for pipeline visibility
     div_label = division or "All"
     log(
-        f"Dataset: events={len(unique_events)}, bouts_kept={len(bouts_list)}, "
-        f"fighters={len(fighters_out)}, stats_rows={len(stats_list)} (division={div_label})"
+        f"Dataset: events={events_out.count}, bouts_kept={bouts_out.count}, "
+        f"fighters={fighters_out.count}, stats_rows={stats_out.count} (division={div_label})"
     )
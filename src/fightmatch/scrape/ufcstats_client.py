@@ -1,17 +1,44 @@
-"""UFCStats HTTP client: rate limit, retries, cache."""
+"""UFCStats HTTP client: rate limit, retries, cache, concurrent fetch engine."""
 
 from __future__ import annotations
 
 import random
+import re
+import threading
 import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import replace
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 import requests
+from requests.adapters import HTTPAdapter
 
-from fightmatch.cache import DiskCache
-from fightmatch.config import ScrapeConfig
+from fightmatch.cache import VALIDATOR_HEADERS, Cache, MemoryCache, open_cache
+from fightmatch.config import CacheConfig, ScrapeConfig
+from fightmatch.rawstore import CHUNK_SIZE, Body, ObjectStore, RawStore
 from fightmatch.utils.log import log
 
+from .manifest import DONE, FAILED, PARTIAL, ScrapeManifest
+from .metrics import (
+    HIT,
+    MISS,
+    REVALIDATED,
+    FetchRecord,
+    FetchRecorder,
+    format_summary,
+    url_class,
+    write_run_report,
+)
+
+if TYPE_CHECKING:
+    from .pipeline import ParsePipeline
+
+# Stand-in rate when rate_limit_seconds <= 0 (tests, offline benchmarks).
+UNLIMITED_RATE = 1e9
+
 
 class RateLimiter:
     """Sleep + jitter between requests."""
@@ -21,7 +48,8 @@ class RateLimiter:
         self.jitter = jitter
         self._last = 0.0
 
-    def wait(self) -> None:
+    def wait(self) -> float:
+        """Sleep until the next request may go; returns the seconds slept."""
         elapsed = time.monotonic() - self._last
         delay = max(0, self.interval - elapsed)
         if self.jitter:
@@ -29,129 +57,712 @@ class RateLimiter:
         if delay > 0:
             time.sleep(delay)
         self._last = time.monotonic()
+        return delay
+
+
+class TokenBucket:
+    """Thread-safe token bucket shared by every fetch worker.
+
+    Each wait() reserves one token plus its jitter (as token debt); callers that
+    find the bucket empty sleep until their reserved slot, outside the lock, so
+    N workers together never exceed `rate` requests per second and keep the
+    same jitter between requests as RateLimiter.
+    """
+
+    def __init__(self, rate: float = 1.0, capacity: float = 1.0, jitter: float = 0.0):
+        self.rate = rate
+        self.capacity = capacity
+        self.jitter = jitter
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config: ScrapeConfig) -> TokenBucket:
+        """Same politeness as RateLimiter(rate_limit_seconds, rate_limit_jitter)."""
+        rate = (
+            1.0 / config.rate_limit_seconds
+            if config.rate_limit_seconds > 0
+            else UNLIMITED_RATE
+        )
+        return cls(rate=rate, capacity=1.0, jitter=config.rate_limit_jitter)
+
+    def _refill(self) -> None:
+        """Credit tokens earned since the last update; caller holds the lock."""
+        now = time.monotonic()
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+
+    def wait(self) -> float:
+        """Reserve a token, sleeping until it is due; returns the seconds slept."""
+        with self._lock:
+            self._refill()
+            self._tokens -= 1.0 + random.uniform(0, self.jitter) * self.rate
+            delay = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+    def succeeded(self) -> None:
+        """Feedback hook: the last request got a healthy response."""
+
+    def throttled(self, retry_after: float | None = None) -> None:
+        """Server pushed back (429/5xx): pause every worker for retry_after seconds.
+
+        The pause is a token debt, so requests already queued behind the bucket
+        are pushed back too instead of firing the moment it ends.
+        """
+        with self._lock:
+            self._refill()
+            self._tokens = min(self._tokens, 0.0) - (retry_after or 0.0) * self.rate
+
+
+class AdaptiveRateLimiter(TokenBucket):
+    """TokenBucket whose rate follows server health (additive increase, multiplicative decrease).
+
+    Healthy responses raise the rate up to max_rate (default: the starting rate);
+    429/5xx multiply it by `decrease`, down to min_rate.
+    """
+
+    def __init__(
+        self,
+        rate: float = 1.0,
+        min_rate: float = 0.1,
+        max_rate: float | None = None,
+        increase: float = 0.1,
+        decrease: float = 0.5,
+        capacity: float = 1.0,
+        jitter: float = 0.0,
+    ):
+        super().__init__(rate=rate, capacity=capacity, jitter=jitter)
+        self.min_rate = min(min_rate, rate)
+        self.max_rate = rate if max_rate is None else max(max_rate, rate)
+        self.increase = increase
+        self.decrease = decrease
+        self.throttles = 0
+
+    @classmethod
+    def from_config(cls, config: ScrapeConfig) -> AdaptiveRateLimiter:
+        rate = (
+            1.0 / config.rate_limit_seconds
+            if config.rate_limit_seconds > 0
+            else UNLIMITED_RATE
+        )
+        return cls(
+            rate=rate,
+            min_rate=config.min_rate,
+            max_rate=config.max_rate,
+            increase=config.rate_increase,
+            decrease=config.rate_decrease,
+            jitter=config.rate_limit_jitter,
+        )
+
+    def succeeded(self) -> None:
+        with self._lock:
+            self._refill()
+            self.rate = min(self.max_rate, self.rate + self.increase / self.rate)
+
+    def throttled(self, retry_after: float | None = None) -> None:
+        with self._lock:
+            self._refill()
+            self.rate = max(self.min_rate, self.rate * self.decrease)
+            self.throttles += 1
+        super().throttled(retry_after)
+
+
+def make_session(config: ScrapeConfig, pool_size: int = 1) -> requests.Session:
+    """Keep-alive session with a connection pool sized for `pool_size` workers."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(1, pool_size))
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers["User-Agent"] = config.user_agent
+    return session
+
+
+def _response_validators(r: requests.Response) -> dict[str, str]:
+    return {h: r.headers[h] for h in VALIDATOR_HEADERS if r.headers.get(h)}
+
+
+def _retry_after(r: requests.Response, limit: float) -> float | None:
+    """Retry-After as seconds (delta or HTTP-date form), capped at limit."""
+    value = (r.headers.get("Retry-After") or "").strip()
+    if not value:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            seconds = parsedate_to_datetime(value).timestamp() - time.time()
+        except (TypeError, ValueError):
+            return None
+    return min(max(0.0, seconds), limit)
+
+
+def _is_throttle(status_code: int) -> bool:
+    return status_code == 429 or status_code >= 500
+
+
+def _conditional_headers(validators: dict[str, str]) -> dict[str, str]:
+    headers: dict[str, str] = {}
+    if validators.get("ETag"):
+        headers["If-None-Match"] = validators["ETag"]
+    if validators.get("Last-Modified"):
+        headers["If-Modified-Since"] = validators["Last-Modified"]
+    return headers
 
 
 def fetch(
     url: str,
     config: ScrapeConfig,
-    cache: DiskCache | None,
-    rate_limiter: RateLimiter | None,
+    cache: Cache | None,
+    rate_limiter: RateLimiter | TokenBucket | None,
+    session: requests.Session | None = None,
+    recorder: FetchRecorder | None = None,
 ) -> bytes:
-    """Fetch URL with cache, rate limit, retries. Returns response body bytes."""
-    if cache:
-        cached = cache.get_or_none(url)
+    """Fetch URL with cache, rate limit, retries. Returns response body bytes.
+
+    Expired entries with validators are revalidated with a conditional GET.
+    429/5xx responses slow the limiter and are retried; other errors back off
+    exponentially. If recorder is given, every call adds a FetchRecord.
+    """
+    return _recorded(url, config, cache, rate_limiter, session, recorder).read()
+
+
+def fetch_body(
+    url: str,
+    config: ScrapeConfig,
+    cache: Cache | None,
+    rate_limiter: RateLimiter | TokenBucket | None,
+    objects: ObjectStore,
+    session: requests.Session | None = None,
+    recorder: FetchRecorder | None = None,
+    spool: bool = False,
+) -> Body:
+    """fetch() that streams network bodies into `objects` instead of memory.
+
+    With spool=True the Body also keeps an uncompressed temp copy for view();
+    close the Body when done with it.
+    """
+    return _recorded(url, config, cache, rate_limiter, session, recorder, objects, spool)
+
+
+def _recorded(
+    url: str,
+    config: ScrapeConfig,
+    cache: Cache | None,
+    rate_limiter: RateLimiter | TokenBucket | None,
+    session: requests.Session | None,
+    recorder: FetchRecorder | None,
+    objects: ObjectStore | None = None,
+    spool: bool = False,
+) -> Body:
+    rec = FetchRecord(url, url_class(url))
+    start = time.monotonic()
+    try:
+        return _fetch(url, config, cache, rate_limiter, session, rec, objects, spool)
+    finally:
+        rec.seconds = time.monotonic() - start
+        if recorder is not None:
+            recorder.add(rec)
+
+
+def _fetch(
+    url: str,
+    config: ScrapeConfig,
+    cache: Cache | None,
+    rate_limiter: RateLimiter | TokenBucket | None,
+    session: requests.Session | None,
+    rec: FetchRecord,
+    objects: ObjectStore | None,
+    spool: bool,
+) -> Body:
+    """fetch() body; fills rec with outcome, status, bytes and the time split.
+
+    On a cache miss the URL's cache lock is held through the download, so
+    concurrent misses (other threads, or other processes sharing the cache dir)
+    wait and then find the entry the first one wrote.
+    """
+    if cache is None:
+        return _download(url, config, None, None, rate_limiter, session, rec, objects, spool)
+    t0 = time.monotonic()
+    cached = cache.get_or_none(url)
+    rec.cache_seconds += time.monotonic() - t0
+    if cached is not None:
+        rec.outcome, rec.bytes = HIT, len(cached)
+        return Body(cached)
+    t0 = time.monotonic()
+    with cache.lock(url):
+        cached = cache.peek(url)
+        stale = cache.get_stale(url) if cached is None else None
+        rec.cache_seconds += time.monotonic() - t0
         if cached is not None:
-            return cached
-    if rate_limiter:
-        rate_limiter.wait()
+            rec.outcome, rec.bytes = HIT, len(cached)
+            return Body(cached)
+        return _download(
+            url, config, cache, stale, rate_limiter, session, rec, objects, spool
+        )
+
+
+def _download(
+    url: str,
+    config: ScrapeConfig,
+    cache: Cache | None,
+    stale: tuple[bytes, dict[str, str]] | None,
+    rate_limiter: RateLimiter | TokenBucket | None,
+    session: requests.Session | None,
+    rec: FetchRecord,
+    objects: ObjectStore | None,
+    spool: bool,
+) -> Body:
+    """Network part of _fetch(): conditional GET, retries, cache write."""
+    get = session.get if session is not None else requests.get
     headers = {"User-Agent": config.user_agent}
+    if stale:
+        headers.update(_conditional_headers(stale[1]))
+    bucket = rate_limiter if isinstance(rate_limiter, TokenBucket) else None
     last_error: Exception | None = None
     for attempt in range(config.max_retries):
+        rec.attempts = attempt + 1
+        if rate_limiter:
+            rec.wait_seconds += rate_limiter.wait()
+        retry_after: float | None = None
         try:
-            r = requests.get(
-                url,
-                headers=headers,
-                timeout=config.request_timeout,
-            )
-            r.raise_for_status()
-            body = r.content
-            if cache:
-                cache.set(url, body)
+            t0 = time.monotonic()
+            try:
+                if objects is None:
+                    r = get(url, headers=headers, timeout=config.request_timeout)
+                else:
+                    r = get(
+                        url,
+                        headers=headers,
+                        timeout=config.request_timeout,
+                        stream=True,
+                    )
+            finally:
+                rec.network_seconds += time.monotonic() - t0
+            rec.status = r.status_code
+            try:
+                if _is_throttle(r.status_code):
+                    retry_after = _retry_after(r, config.max_retry_after)
+                    if bucket is not None:
+                        bucket.throttled(retry_after)
+                        log(
+                            f"Throttled ({r.status_code}) on {url}; "
+                            f"rate now {bucket.rate:.2f} req/s"
+                        )
+                if r.status_code == 304 and stale and cache is not None:
+                    if bucket is not None:
+                        bucket.succeeded()
+                    t0 = time.monotonic()
+                    cache.revalidated(url)
+                    rec.cache_seconds += time.monotonic() - t0
+                    rec.outcome, rec.bytes = REVALIDATED, 0
+                    return Body(stale[0])
+                r.raise_for_status()
+                if bucket is not None:
+                    bucket.succeeded()
+                if objects is None:
+                    body = Body(r.content)
+                else:
+                    # Download and compress together: counted as network time.
+                    t0 = time.monotonic()
+                    try:
+                        body = objects.put_stream(r.iter_content(CHUNK_SIZE), spool)
+                    finally:
+                        rec.network_seconds += time.monotonic() - t0
+            finally:
+                # Streamed responses hold a pooled connection until closed; that
+                # includes throttled, failed and 304 ones whose body is never read.
+                r.close()
+            rec.outcome, rec.bytes = MISS, body.size
+            if cache is not None:
+                t0 = time.monotonic()
+                if objects is None:
+                    cache.set(url, body.read(), _response_validators(r))
+                else:
+                    cache.set_body(url, body, _response_validators(r))
+                rec.cache_seconds += time.monotonic() - t0
             return body
         except requests.RequestException as e:
             last_error = e
             if attempt < config.max_retries - 1:
-                backoff = config.retry_backoff_base**attempt
+                if bucket is not None and retry_after is not None:
+                    continue  # the shared bucket already holds every worker back
+                backoff = max(config.retry_backoff_base**attempt, retry_after or 0.0)
                 time.sleep(backoff)
+                rec.backoff_seconds += backoff
     raise last_error or RuntimeError("fetch failed")
 
 
 def discover_events_since(
     since_date: str,
     config: ScrapeConfig,
-    cache: DiskCache | None,
-    rate_limiter: RateLimiter | None,
+    cache: Cache | None,
+    rate_limiter: RateLimiter | TokenBucket | None,
+    session: requests.Session | None = None,
+    recorder: FetchRecorder | None = None,
+    objects: ObjectStore | None = None,
 ) -> list[dict]:
-    """Load events list page and return events on or after since_date (YYYY-MM-DD)."""
+    """Load events list page and return events on or after since_date (YYYY-MM-DD).
+
+    Upcoming (future-dated) events are skipped. With objects given, the index
+    page is streamed to disk and parsed from a memory-mapped view.
+    """
     from .parse import parse_events_list
 
     url = f"{config.base_url}/statistics/events/completed?page=all"
-    html = fetch(url, config, cache, rate_limiter).decode("utf-8", errors="replace")
+    if objects is None:
+        html = fetch(url, config, cache, rate_limiter, session, recorder).decode(
+            "utf-8", errors="replace"
+        )
+    else:
+        with fetch_body(
+            url, config, cache, rate_limiter, objects, session, recorder, spool=True
+        ) as body:
+            html = body.text()
     events = parse_events_list(html, config.base_url)
+    today = datetime.now(timezone.utc).date().isoformat()
     out = []
     for e in events:
-        d = e.get("date")
-        if not d:
+        d = _normalize_date(e.get("date"))
+        if d is None:
             out.append(e)
-            continue
-        # Normalize date: YYYY-MM-DD or "Mon DD, YYYY"
-        import re
+        elif since_date <= d <= today:
+            e["date"] = d
+            out.append(e)
+    return out
 
-        m = re.search(r"(\d{4})-(\d{2})-(\d{2})", d)
-        if not m:
-            # try "Jan 1, 2024"
-            from datetime import datetime
 
-            try:
-                dt = datetime.strptime(d.strip(), "%B %d, %Y")
-                d = dt.strftime("%Y-%m-%d")
-            except ValueError:
-                try:
-                    dt = datetime.strptime(d.strip(), "%b %d, %Y")
-                    d = dt.strftime("%Y-%m-%d")
-                except ValueError:
-                    out.append(e)
+def discover_new_events(
+    since_date: str,
+    config: ScrapeConfig,
+    cache: Cache | None,
+    rate_limiter: RateLimiter | TokenBucket | None,
+    session: requests.Session | None = None,
+    recorder: FetchRecorder | None = None,
+    known: set[str] | frozenset[str] = frozenset(),
+    max_pages: int = 1000,
+) -> list[dict]:
+    """Incremental discover_events_since(): only events on/after since_date not in known.
+
+    Walks the listing newest-first and stops at the first event older than
+    since_date or already known, so a poll with nothing new costs one page.
+    """
+    from .parse import parse_events_list
+
+    today = datetime.now(timezone.utc).date().isoformat()
+    out: list[dict] = []
+    seen: set[str] = set()
+    for page in range(1, max_pages + 1):
+        url = f"{config.base_url}/statistics/events/completed?page={page}"
+        html = fetch(url, config, cache, rate_limiter, session, recorder).decode(
+            "utf-8", errors="replace"
+        )
+        rows = [
+            e
+            for e in parse_events_list(html, config.base_url)
+            if e["event_id"] not in seen
+        ]
+        if not rows:
+            break
+        for e in rows:
+            seen.add(e["event_id"])
+            d = _normalize_date(e.get("date"))
+            if d is not None:
+                e["date"] = d
+                if d > today:
                     continue
-        else:
-            d = f"{m.group(1)}-{m.group(2)}-{m.group(3)}"
-        if d >= since_date:
-            e["date"] = d
+            if e["event_id"] in known or (d is not None and d < since_date):
+                return out
             out.append(e)
     return out
 
 
+def _normalize_date(d: str | None) -> str | None:
+    """Listing date (YYYY-MM-DD or "Mon DD, YYYY") as YYYY-MM-DD; None if unknown."""
+    if not d:
+        return None
+    m = re.search(r"(\d{4})-(\d{2})-(\d{2})", d)
+    if m:
+        return f"{m.group(1)}-{m.group(2)}-{m.group(3)}"
+    for fmt in ("%B %d, %Y", "%b %d, %Y"):
+        try:
+            return datetime.strptime(d.strip(), fmt).strftime("%Y-%m-%d")
+        except ValueError:
+            continue
+    return None
+
+
+def event_page_final(event_info: dict | None, fight_links: list[dict]) -> bool:
+    """True once an event page can no longer change: results posted, date past.
+
+    Only final pages may stay in the cache for good (see DEFAULT_TTL_POLICY);
+    callers invalidate() the others so the next scrape fetches them again.
+    """
+    if not fight_links:
+        return False
+    d = _normalize_date((event_info or {}).get("date"))
+    return d is None or d < datetime.now(timezone.utc).date().isoformat()
+
+
+def _on_base(url: str, base_url: str) -> str:
+    """A URL parsed against the parsers' DEFAULT_BASE_URL, moved onto base_url."""
+    from .parse import DEFAULT_BASE_URL
+
+    if url.startswith(DEFAULT_BASE_URL):
+        return base_url.rstrip("/") + url[len(DEFAULT_BASE_URL) :]
+    return url
+
+
+def open_stores(
+    raw_dir: Path, cache_config: CacheConfig | None = None
+) -> tuple[RawStore, Cache]:
+    """RawStore + HTTP cache for raw_dir/ufcstats; file caches share its objects."""
+    base = Path(raw_dir) / "ufcstats"
+    raw_store = RawStore(base)
+    cache_config = replace(cache_config or CacheConfig(), dir=base)
+    return raw_store, open_cache(cache_config, objects=raw_store.objects)
+
+
+def warm_cache(
+    urls: list[str],
+    cache: Cache,
+    config: ScrapeConfig | None = None,
+    concurrency: int | None = None,
+) -> int:
+    """Fetch every url not fresh in cache (same engine as scrape). Returns # fetched."""
+    config = config or ScrapeConfig()
+    concurrency = max(1, concurrency or config.concurrency)
+    todo = [u for u in urls if cache.get_or_none(u) is None]
+    rate_limiter = AdaptiveRateLimiter.from_config(config)
+    session = make_session(config, pool_size=concurrency)
+    fetched = 0
+    try:
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            futures = [
+                pool.submit(fetch, u, config, cache, rate_limiter, session)
+                for u in todo
+            ]
+            for u, fut in zip(todo, futures):
+                try:
+                    fut.result()
+                    fetched += 1
+                except Exception as e:
+                    log(f"Skip {u}: {e}")
+    finally:
+        session.close()
+    return fetched
+
+
+def scrape_fighter_page(
+    fighter_id: str,
+    config: ScrapeConfig,
+    cache: Cache,
+    rate_limiter: TokenBucket,
+    raw_store: RawStore,
+    manifest: ScrapeManifest,
+    session: requests.Session,
+    recorder: FetchRecorder,
+    pipeline: ParsePipeline | None = None,
+) -> bool:
+    """Fetch + save one fighter-details page and record it in the manifest.
+
+    Shared by scrape_since(), scrape_fighters() and queue workers; failures are
+    logged and marked failed, not raised. With a pipeline the page is also
+    queued for parsing.
+    """
+    url = f"{config.base_url}/fighter-details/{fighter_id}"
+    body = None
+    try:
+        body = fetch_body(
+            url,
+            config,
+            cache,
+            rate_limiter,
+            raw_store.objects,
+            session,
+            recorder,
+            spool=pipeline is not None,
+        )
+        t0 = time.monotonic()
+        raw_store.put_body("fighters", fighter_id, body)
+    except Exception as e:
+        if body is not None:
+            body.close()
+        log(f"Skip fighter {fighter_id}: {e}")
+        manifest.mark("fighter", fighter_id, FAILED, url=url, error=str(e))
+        return False
+    manifest.mark("fighter", fighter_id, DONE, url=url, sha256=body.sha)
+    recorder.add_store_time(time.monotonic() - t0)
+    if pipeline is not None:
+        pipeline.submit("fighters", fighter_id, body)
+    return True
+
+
+def _log_manifest(manifest: ScrapeManifest) -> None:
+    counts = manifest.counts()
+    log(
+        f"Manifest: events done={counts.get(('event', DONE), 0)}, "
+        f"partial={counts.get(('event', PARTIAL), 0)}, "
+        f"fights done={counts.get(('fight', DONE), 0)}, "
+        f"failed={counts.get(('fight', FAILED), 0)}, "
+        f"fighters done={counts.get(('fighter', DONE), 0)}, "
+        f"failed={counts.get(('fighter', FAILED), 0)}"
+    )
+
+
+def fighter_ids_in_raw(raw_store: RawStore) -> list[str]:
+    """Every fighter id in a bout of a stored event page, deduplicated and sorted."""
+    from .parse import parse_event_page
+
+    ids: set[str] = set()
+    for event_id in raw_store.ids("events"):
+        html = raw_store.read_text("events", event_id)
+        if html is None:
+            continue
+        _, bouts, _ = parse_event_page(html, event_id)
+        for b in bouts:
+            ids.update(
+                fid for fid in (b.get("red_fighter_id"), b.get("blue_fighter_id")) if fid
+            )
+    return sorted(ids)
+
+
+def scrape_fighters(
+    raw_dir: Path,
+    config: ScrapeConfig | None = None,
+    concurrency: int | None = None,
+    resume: bool = False,
+    cache_config: CacheConfig | None = None,
+    session: requests.Session | None = None,
+) -> int:
+    """Backfill fighter-details pages for every fighter in already-scraped events.
+
+    Same engine as scrape_since(): one pool, one shared rate limiter, the cache
+    in front (so only expired pages are re-fetched). With resume=True fighters
+    the manifest has as done are skipped outright. Returns # pages saved.
+    """
+    config = config or ScrapeConfig()
+    concurrency = max(1, concurrency or config.concurrency)
+    recorder = FetchRecorder()
+    raw_store, cache = open_stores(raw_dir, cache_config)
+    rate_limiter = AdaptiveRateLimiter.from_config(config)
+    session = session or make_session(config, pool_size=concurrency)
+    manifest = ScrapeManifest.for_raw_dir(raw_dir)
+    try:
+        ids = fighter_ids_in_raw(raw_store)
+        if resume:
+            done = manifest.ids_with_status("fighter", DONE)
+            ids = [fid for fid in ids if fid not in done]
+        log(f"Fighters to fetch: {len(ids)}")
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            saved = sum(
+                pool.map(
+                    lambda fid: scrape_fighter_page(
+                        fid,
+                        config,
+                        cache,
+                        rate_limiter,
+                        raw_store,
+                        manifest,
+                        session,
+                        recorder,
+                    ),
+                    ids,
+                )
+            )
+        log(format_summary(recorder.summary()))
+        _log_manifest(manifest)
+        return saved
+    finally:
+        session.close()
+        manifest.close()
+        cache.close()
+        raw_store.close()
+
+
 def scrape_since(
     since_date: str,
     raw_dir: Path,
     config: ScrapeConfig | None = None,
     division: str = "",
+    concurrency: int | None = None,
+    resume: bool = False,
+    cache_config: CacheConfig | None = None,
+    session: requests.Session | None = None,
+    recorder: FetchRecorder | None = None,
+    incremental: bool = False,
+    fighters: bool = True,
+    pipeline: ParsePipeline | None = None,
 ) -> None:
-    """
-    Scrape events since date; save raw HTML under raw_dir/ufcstats/.
+    """Scrape events since date; save raw HTML under raw_dir/ufcstats/ (see RawStore).
     Event pages are always cached. If division is set, only fetch/save fight pages for that weight class.
+
+    Pages are fetched by `concurrency` workers sharing one session and one
+    AdaptiveRateLimiter, and recorded in the scrape manifest: resume=True skips
+    done pages, incremental=True stops discovery at the first known event.
+    fighters=True also fetches each kept bout's fighter pages. Each run writes a
+    report to raw_dir/ufcstats/runs/; pipeline receives every saved page.
     """
     from fightmatch.config import normalize_division
 
     config = config or ScrapeConfig()
-    cache = DiskCache(
-        Path(raw_dir) / "ufcstats",
-        ttl_seconds=config.rate_limit_seconds * 0 + 86400 * 7,
-    )
-    rate_limiter = RateLimiter(config.rate_limit_seconds, config.rate_limit_jitter)
-
-    events = discover_events_since(since_date, config, cache, rate_limiter)
-    log(f"Found {len(events)} events since {since_date}")
-
-    events_dir = Path(raw_dir) / "ufcstats" / "events"
-    fights_dir = Path(raw_dir) / "ufcstats" / "fights"
-    events_dir.mkdir(parents=True, exist_ok=True)
-    fights_dir.mkdir(parents=True, exist_ok=True)
+    concurrency = max(1, concurrency or config.concurrency)
+    recorder = recorder or FetchRecorder()
+    started_at = datetime.now(timezone.utc)
+    start = time.monotonic()
+    raw_store, cache = open_stores(raw_dir, cache_config)
+    objects = raw_store.objects
+    rate_limiter = AdaptiveRateLimiter.from_config(config)
+    session = session or make_session(config, pool_size=concurrency)
+    manifest = ScrapeManifest.for_raw_dir(raw_dir)
+    done_events = manifest.ids_with_status("event", DONE) if resume else set()
+    done_fights = manifest.ids_with_status("fight", DONE) if resume else set()
+    done_fighters = manifest.ids_with_status("fighter", DONE) if resume else set()
 
     from .parse import parse_event_page
 
     target_division = normalize_division(division) if division else ""
 
-    for ev in events:
-        event_id = ev.get("event_id")
-        url = ev.get("url")
-        if not url:
-            continue
+    def scrape_event(ev: dict) -> tuple[list[tuple[str, str]], set[str], bool]:
+        """Fetch + save one event page.
+
+        Returns ((bout_id, url) fight jobs, fighter ids of kept bouts, complete).
+        """
+        event_id = ev["event_id"]
         log(f"Event: {event_id}")
-        html = fetch(url, config, cache, rate_limiter).decode("utf-8", errors="replace")
-        (events_dir / f"{event_id}.html").write_text(html, encoding="utf-8")
-        event_info, bouts, fight_links = parse_event_page(
-            html, event_id, config.base_url
-        )
+        try:
+            body = fetch_body(
+                ev["url"],
+                config,
+                cache,
+                rate_limiter,
+                objects,
+                session,
+                recorder,
+                spool=True,
+            )
+        except Exception as e:
+            manifest.mark("event", event_id, FAILED, url=ev["url"], error=str(e))
+            raise
+        with body:
+            html = body.text()
+            t0 = time.monotonic()
+            # The body is already a stored object; put_body() only records the ref.
+            raw_store.put_body("events", event_id, body)
+        # Fetched, but not done until its fights are.
+        manifest.mark("event", event_id, PARTIAL, url=ev["url"], sha256=body.sha)
+        recorder.add_store_time(time.monotonic() - t0)
+        # Parsed exactly as build_dataset() parses it, so the result can be cached
+        # for it; fight URLs are moved onto config.base_url below.
+        event_info, bouts, fight_links = parse_event_page(html, event_id)
+        if not event_page_final(event_info, fight_links):
+            cache.invalidate(ev["url"])
+        if pipeline is not None:
+            pipeline.parsed("events", event_id, body.sha, (event_info, bouts, fight_links))
         # If division filter: only fetch fights for bouts in that weight class
         bout_ids_in_division = set()
         if target_division:
@@ -161,17 +772,172 @@ def scrape_since(
                     and normalize_division(b.get("weight_class")) == target_division
                 ):
                     bout_ids_in_division.add(b["bout_id"])
+        fighter_ids = {
+            fid
+            for b in bouts
+            if not target_division or b.get("bout_id") in bout_ids_in_division
+            for fid in (b.get("red_fighter_id"), b.get("blue_fighter_id"))
+            if fid
+        }
+        jobs: list[tuple[str, str]] = []
+        # No fight links yet (results not posted): leave partial so it is retried.
+        complete = bool(fight_links)
         for fl in fight_links:
             bout_id = fl.get("bout_id")
             if not bout_id:
                 continue
             if target_division and bout_id not in bout_ids_in_division:
+                complete = False
                 continue
             u = fl.get("url")
             if not u:
                 continue
-            try:
-                body = fetch(u, config, cache, rate_limiter)
-                (fights_dir / f"{bout_id}.html").write_bytes(body)
-            except Exception as e:
-                log(f"Skip fight {bout_id}: {e}")
+            if bout_id in done_fights:
+                continue
+            jobs.append((bout_id, _on_base(u, config.base_url)))
+        return jobs, fighter_ids, complete
+
+    def scrape_fight(event_id: str, bout_id: str, url: str) -> bool:
+        body = None
+        try:
+            body = fetch_body(
+                url,
+                config,
+                cache,
+                rate_limiter,
+                objects,
+                session,
+                recorder,
+                spool=pipeline is not None,
+            )
+            t0 = time.monotonic()
+            raw_store.put_body("fights", bout_id, body)
+        except Exception as e:
+            if body is not None:
+                body.close()
+            log(f"Skip fight {bout_id}: {e}")
+            manifest.mark(
+                "fight", bout_id, FAILED, url=url, parent_id=event_id, error=str(e)
+            )
+            return False
+        manifest.mark(
+            "fight", bout_id, DONE, url=url, parent_id=event_id, sha256=body.sha
+        )
+        recorder.add_store_time(time.monotonic() - t0)
+        if pipeline is not None:
+            pipeline.submit("fights", bout_id, body)
+        return True
+
+    def scrape_fighter(fighter_id: str) -> bool:
+        return scrape_fighter_page(
+            fighter_id,
+            config,
+            cache,
+            rate_limiter,
+            raw_store,
+            manifest,
+            session,
+            recorder,
+            pipeline,
+        )
+
+    completed = False
+    try:
+        if incremental:
+            known = manifest.ids_with_status("event", DONE)
+            events = discover_new_events(
+                since_date, config, cache, rate_limiter, session, recorder, known
+            )
+            log(f"Found {len(events)} new events since {since_date}")
+        else:
+            events = discover_events_since(
+                since_date, config, cache, rate_limiter, session, recorder, objects
+            )
+            log(f"Found {len(events)} events since {since_date}")
+        todo = [e for e in events if e.get("url") and e.get("event_id")]
+        if resume:
+            todo = [e for e in todo if e["event_id"] not in done_events]
+            log(f"Resume: {len(events) - len(todo)} events already done")
+        # Per-event bookkeeping, only touched from this thread.
+        remaining: dict[str, int] = {}
+        complete: dict[str, bool] = {}
+
+        def settle(event_id: str) -> None:
+            if remaining[event_id] == 0:
+                status = DONE if complete[event_id] else PARTIAL
+                manifest.mark("event", event_id, status)
+
+        queued_fighters = set(done_fighters)
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            owner: dict[Future, str] = {}
+            event_futures = {
+                pool.submit(scrape_event, ev): ev["event_id"] for ev in todo
+            }
+            pending: set[Future] = set(event_futures)
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    if fut in owner:
+                        event_id = owner.pop(fut)
+                        complete[event_id] = complete[event_id] and fut.result()
+                        remaining[event_id] -= 1
+                        settle(event_id)
+                        continue
+                    if fut not in event_futures:
+                        continue  # fighter page; its outcome is in the manifest
+                    if fut.exception() is not None:
+                        # Event pages are required: abort like the serial scraper did.
+                        for other in pending:
+                            other.cancel()
+                        raise fut.exception()
+                    event_id = event_futures[fut]
+                    jobs, fighter_ids, complete[event_id] = fut.result()
+                    remaining[event_id] = len(jobs)
+                    for bout_id, u in jobs:
+                        f = pool.submit(scrape_fight, event_id, bout_id, u)
+                        owner[f] = event_id
+                        pending.add(f)
+                    settle(event_id)
+                    if fighters:
+                        for fid in sorted(fighter_ids - queued_fighters):
+                            queued_fighters.add(fid)
+                            pending.add(pool.submit(scrape_fighter, fid))
+        rate = (
+            "unlimited"
+            if rate_limiter.rate >= UNLIMITED_RATE
+            else f"{rate_limiter.rate:.2f} req/s"
+        )
+        log(f"Rate limiter: {rate}, throttled {rate_limiter.throttles}x")
+        if isinstance(cache, MemoryCache):
+            log(
+                f"Memory cache: hits={cache.hits}, misses={cache.misses}, "
+                f"entries={cache.entries}, bytes={cache.bytes}"
+            )
+        _log_manifest(manifest)
+        completed = True
+    finally:
+        summary = recorder.summary()
+        log(format_summary(summary))
+        report = recorder.report(
+            command="scrape",
+            since=since_date,
+            division=division,
+            concurrency=concurrency,
+            resume=resume,
+            cache_backend=(cache_config or CacheConfig()).backend,
+            started_at=started_at.isoformat(timespec="seconds"),
+            wall_seconds=round(time.monotonic() - start, 3),
+            completed=completed,
+            final_rate=rate_limiter.rate,
+            throttles=rate_limiter.throttles,
+            manifest={f"{k}/{st}": n for (k, st), n in manifest.counts().items()},
+        )
+        try:
+            path = write_run_report(Path(raw_dir) / "ufcstats", report, started_at)
+            log(f"Run report: {path}")
+        except OSError as e:
+            log(f"Could not write run report: {e}")
+        session.close()
+        manifest.close()
+        cache.close()
+        raw_store.close()
@@ -0,0 +1,341 @@
+"""Queue-mode scraping: `scrape --enqueue` seeds a WorkQueue, `scrape-worker` drains it."""
+
+from __future__ import annotations
+
+import os
+import socket
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import requests
+
+from fightmatch.config import CacheConfig, ScrapeConfig, normalize_division
+from fightmatch.utils.log import log
+
+from .manifest import DONE, FAILED, PARTIAL, ScrapeManifest
+from .metrics import FetchRecorder, format_summary, write_run_report
+from .queue import DEFAULT_LEASE_SECONDS, Job, SharedRateLimiter, WorkQueue
+from .ufcstats_client import (
+    _on_base,
+    discover_events_since,
+    discover_new_events,
+    event_page_final,
+    fetch_body,
+    make_session,
+    open_stores,
+    scrape_fighter_page,
+)
+
+
+def enqueue_since(
+    since_date: str,
+    raw_dir: Path,
+    config: ScrapeConfig | None = None,
+    division: str = "",
+    resume: bool = False,
+    incremental: bool = False,
+    fighters: bool = True,
+    cache_config: CacheConfig | None = None,
+    session: requests.Session | None = None,
+) -> int:
+    """Discover events like scrape_since() and queue one job per event; returns the count.
+
+    Starts a new queue generation; workers queue fight and fighter jobs as they
+    parse event pages.
+    """
+    config = config or ScrapeConfig()
+    raw_store, cache = open_stores(raw_dir, cache_config)
+    queue = WorkQueue.for_raw_dir(raw_dir)
+    manifest = ScrapeManifest.for_raw_dir(raw_dir)
+    rate_limiter = SharedRateLimiter.from_config(config, queue, reset=True)
+    session = session or make_session(config)
+    recorder = FetchRecorder()
+    try:
+        if incremental:
+            known = manifest.ids_with_status("event", DONE)
+            events = discover_new_events(
+                since_date, config, cache, rate_limiter, session, recorder, known
+            )
+        else:
+            events = discover_events_since(
+                since_date,
+                config,
+                cache,
+                rate_limiter,
+                session,
+                recorder,
+                raw_store.objects,
+            )
+        todo = [e for e in events if e.get("url") and e.get("event_id")]
+        if resume:
+            done = manifest.ids_with_status("event", DONE)
+            todo = [e for e in todo if e["event_id"] not in done]
+        generation = queue.new_generation()
+        queue.set_meta(
+            since=since_date,
+            division=division,
+            resume="1" if resume else "",
+            fighters="1" if fighters else "",
+        )
+        queued = sum(
+            queue.enqueue("event", e["event_id"], e["url"], generation=generation)
+            for e in todo
+        )
+        log(f"Queued {queued} of {len(events)} events since {since_date}")
+        return queued
+    finally:
+        session.close()
+        manifest.close()
+        queue.close()
+        cache.close()
+        raw_store.close()
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def run_worker(
+    raw_dir: Path,
+    config: ScrapeConfig | None = None,
+    concurrency: int | None = None,
+    cache_config: CacheConfig | None = None,
+    session: requests.Session | None = None,
+    recorder: FetchRecorder | None = None,
+    worker_id: str | None = None,
+    lease_seconds: float = DEFAULT_LEASE_SECONDS,
+    poll_seconds: float = 1.0,
+) -> int:
+    """Claim and run queued jobs until the queue is drained; returns jobs completed.
+
+    `concurrency` threads claim one job at a time while a heartbeat renews their
+    leases. Failed jobs are retried with exponential backoff; a thread whose
+    claim keeps failing stops after max_retries tries. Like scrape_since(), the
+    run logs a fetch summary and writes a run report.
+    """
+    config = config or ScrapeConfig()
+    concurrency = max(1, concurrency or config.concurrency)
+    recorder = recorder or FetchRecorder()
+    worker_id = worker_id or default_worker_id()
+    started_at = datetime.now(timezone.utc)
+    start = time.monotonic()
+    raw_store, cache = open_stores(raw_dir, cache_config)
+    queue = WorkQueue.for_raw_dir(raw_dir)
+    manifest = ScrapeManifest.for_raw_dir(raw_dir)
+    rate_limiter = SharedRateLimiter.from_config(config, queue)
+    session = session or make_session(config, pool_size=concurrency)
+    meta = queue.meta()
+    target_division = normalize_division(meta["division"]) if meta.get("division") else ""
+    with_fighters = bool(meta.get("fighters", "1"))
+    done_fights = manifest.ids_with_status("fight", DONE) if meta.get("resume") else set()
+
+    from .parse import parse_event_page
+
+    def run_event(job: Job) -> str:
+        try:
+            body = fetch_body(
+                job.url,
+                config,
+                cache,
+                rate_limiter,
+                raw_store.objects,
+                session,
+                recorder,
+                spool=True,
+            )
+        except Exception as e:
+            manifest.mark("event", job.item_id, FAILED, url=job.url, error=str(e))
+            raise
+        with body:
+            html = body.text()
+            raw_store.put_body("events", job.item_id, body)
+        manifest.mark("event", job.item_id, PARTIAL, url=job.url, sha256=body.sha)
+        # Parsed against the default base, like scrape_since(), then moved onto ours.
+        event_info, bouts, fight_links = parse_event_page(html, job.item_id)
+        if not event_page_final(event_info, fight_links):
+            cache.invalidate(job.url)
+        kept = {
+            b["bout_id"]
+            for b in bouts
+            if b.get("bout_id")
+            and (
+                not target_division
+                or normalize_division(b.get("weight_class")) == target_division
+            )
+        }
+        generation = queue.generation()
+        # No fight links yet (results not posted): leave partial so it is retried.
+        complete = bool(fight_links)
+        for fl in fight_links:
+            bout_id = fl.get("bout_id")
+            if not bout_id or not fl.get("url"):
+                continue
+            if bout_id not in kept:
+                complete = False
+                continue
+            if bout_id not in done_fights:
+                queue.enqueue(
+                    "fight",
+                    bout_id,
+                    _on_base(fl["url"], config.base_url),
+                    job.item_id,
+                    generation,
+                )
+        if with_fighters:
+            for b in bouts:
+                if b.get("bout_id") not in kept:
+                    continue
+                for fid in (b.get("red_fighter_id"), b.get("blue_fighter_id")):
+                    if fid:
+                        queue.enqueue(
+                            "fighter",
+                            fid,
+                            f"{config.base_url}/fighter-details/{fid}",
+                            generation=generation,
+                        )
+        return "complete" if complete else "partial"
+
+    def run_fight(job: Job) -> None:
+        try:
+            body = fetch_body(
+                job.url, config, cache, rate_limiter, raw_store.objects, session, recorder
+            )
+            raw_store.put_body("fights", job.item_id, body)
+        except Exception as e:
+            manifest.mark(
+                "fight",
+                job.item_id,
+                FAILED,
+                url=job.url,
+                parent_id=job.parent_id,
+                error=str(e),
+            )
+            raise
+        manifest.mark(
+            "fight",
+            job.item_id,
+            DONE,
+            url=job.url,
+            parent_id=job.parent_id,
+            sha256=body.sha,
+        )
+
+    def run_fighter(job: Job) -> None:
+        if not scrape_fighter_page(
+            job.item_id,
+            config,
+            cache,
+            rate_limiter,
+            raw_store,
+            manifest,
+            session,
+            recorder,
+        ):
+            raise RuntimeError(f"fighter {job.item_id} failed")
+
+    def settle(event_id: str | None) -> None:
+        if event_id and queue.children_settled(event_id):
+            manifest.mark("event", event_id, DONE)
+
+    completed_jobs = 0
+    count_lock = threading.Lock()
+    stop = threading.Event()
+
+    def work() -> None:
+        nonlocal completed_jobs
+        claim_errors = 0
+        while not stop.is_set():
+            try:
+                job = queue.claim(worker_id, lease_seconds)
+            except Exception as e:
+                # e.g. the queue database stayed locked past its timeout.
+                claim_errors += 1
+                if claim_errors > config.max_retries:
+                    log(f"Worker thread stopping: could not claim a job: {e}")
+                    return
+                log(f"Could not claim a job ({e}); retry in {poll_seconds:g}s")
+                stop.wait(poll_seconds)
+                continue
+            claim_errors = 0
+            if job is None:
+                if queue.active() == 0:
+                    return
+                stop.wait(poll_seconds)
+                continue
+            result = None
+            try:
+                if job.kind == "event":
+                    result = run_event(job)
+                elif job.kind == "fight":
+                    run_fight(job)
+                else:
+                    run_fighter(job)
+            except Exception as e:
+                backoff = config.retry_backoff_base ** job.attempts
+                if not queue.fail(job, str(e), retry_in=backoff):
+                    log(f"Job {job.kind} {job.item_id} failed after losing its lease: {e}")
+                    continue
+                retry = job.attempts < queue.max_attempts
+                log(
+                    f"Job {job.kind} {job.item_id} failed (attempt {job.attempts}): {e}"
+                    + (f"; retry in {backoff:g}s" if retry else "; giving up")
+                )
+                continue
+            if not queue.complete(job, result):
+                # The lease expired and another worker claimed the job; it settles it.
+                log(f"Job {job.kind} {job.item_id} finished after losing its lease")
+                continue
+            settle(job.item_id if job.kind == "event" else job.parent_id)
+            with count_lock:
+                completed_jobs += 1
+
+    def heartbeat() -> None:
+        while not stop.wait(lease_seconds / 3):
+            queue.heartbeat(worker_id, lease_seconds)
+
+    log(f"Worker {worker_id}: {concurrency} threads, lease {lease_seconds:g}s")
+    beat = threading.Thread(target=heartbeat, daemon=True)
+    beat.start()
+    finished = False
+    try:
+        threads = [threading.Thread(target=work) for _ in range(concurrency)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        finished = True
+    finally:
+        stop.set()
+        beat.join()
+        counts = queue.counts()
+        log(
+            f"Worker {worker_id}: {completed_jobs} jobs done; queue "
+            + ", ".join(f"{k}/{s}={n}" for (k, s), n in sorted(counts.items()))
+        )
+        log(format_summary(recorder.summary()))
+        report = recorder.report(
+            command="scrape-worker",
+            worker_id=worker_id,
+            concurrency=concurrency,
+            cache_backend=(cache_config or CacheConfig()).backend,
+            started_at=started_at.isoformat(timespec="seconds"),
+            wall_seconds=round(time.monotonic() - start, 3),
+            completed=finished,
+            jobs_completed=completed_jobs,
+            final_rate=rate_limiter.rate,
+            throttles=rate_limiter.throttles,
+            queue={f"{k}/{s}": n for (k, s), n in counts.items()},
+        )
+        try:
+            path = write_run_report(Path(raw_dir) / "ufcstats", report, started_at)
+            log(f"Run report: {path}")
+        except OSError as e:
+            log(f"Could not write run report: {e}")
+        session.close()
+        manifest.close()
+        queue.close()
+        cache.close()
+        raw_store.close()
+    return completed_jobs
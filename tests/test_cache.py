@@ -1,12 +1,17 @@
 """Test DiskCache TTL behavior."""
 
+import multiprocessing
+import os
 import time
 from pathlib import Path
 import tempfile
 
 import pytest
 
-from fightmatch.cache import DiskCache, cache_key
+from fightmatch.cache import DiskCache, MemoryCache, PackCache, cache_key, open_cache
+from fightmatch.cache.disk import ENTRY_HEADER_SIZE
+from fightmatch.config import CacheConfig
+from fightmatch.rawstore import ObjectStore, RawStore
 
 
 def test_cache_key():
@@ -32,3 +37,339 @@ def test_cache_get_set_by_url():
         cache.set("https://example.com/page", b"body")
         assert cache.get_or_none("https://example.com/page") == b"body"
         assert cache.get_or_none("https://other.com") is None
+
+
+def test_cache_keeps_validators_and_stale_body_after_expiry():
+    with tempfile.TemporaryDirectory() as d:
+        cache = DiskCache(Path(d), ttl_seconds=1)
+        url = "https://example.com/event"
+        cache.set(url, b"body", {"ETag": '"v1"'})
+        time.sleep(1.1)
+        assert cache.get_or_none(url) is None
+        assert cache.get_stale(url) == (b"body", {"ETag": '"v1"'})
+        cache.revalidated(url)
+        assert cache.get_or_none(url) == b"body"
+
+
+def test_cache_ttl_policy_by_url_class():
+    with tempfile.TemporaryDirectory() as d:
+        cache = DiskCache.from_config(CacheConfig(dir=Path(d)))
+        base = "http://www.ufcstats.com"
+        assert cache.ttl_for(f"{base}/statistics/events/completed?page=all") == 3600
+        assert cache.ttl_for(f"{base}/event-details/abc123") == float("inf")
+        assert cache.ttl_for(f"{base}/fight-details/bout1") == float("inf")
+        assert cache.ttl_for(f"{base}/something-else") == 86400 * 7
+
+        cache.ttl_seconds = -1
+        cache.set(f"{base}/event-details/abc123", b"event")
+        cache.set(f"{base}/something-else", b"other")
+        assert cache.get_or_none(f"{base}/event-details/abc123") == b"event"
+        assert cache.get_or_none(f"{base}/something-else") is None
+
+
+def test_object_store_dedupes_and_compresses(tmp_path: Path):
+    store = ObjectStore(tmp_path / "objects")
+    body = b"<html>" + b"<tr><td>row</td></tr>" * 500 + b"</html>"
+    sha = store.put(body)
+    assert store.put(body) == sha
+    assert store.get(sha) == body
+    assert store.path(sha).stat().st_size < len(body) // 5
+
+
+def test_cache_entries_reference_object_store(tmp_path: Path):
+    store = RawStore(tmp_path)
+    cache = DiskCache(tmp_path, ttl_seconds=60, objects=store.objects)
+    cache.set("https://example.com/event-details/e1", b"event html")
+    store.put("events", "e1", b"event html")
+    assert cache.get_or_none("https://example.com/event-details/e1") == b"event html"
+    assert store.get("events", "e1") == b"event html"
+    assert len(list((tmp_path / "objects").rglob("*.gz"))) == 1
+
+    # Pre-object-store views are still readable.
+    (tmp_path / "events").mkdir()
+    (tmp_path / "events" / "e0.html").write_bytes(b"legacy")
+    assert store.ids("events") == ["e0", "e1"]
+    assert store.read_text("events", "e0") == "legacy"
+    store.close()
+
+
+def test_ref_entries_count_and_free_their_objects(tmp_path: Path):
+    store = RawStore(tmp_path)
+    cache = DiskCache(tmp_path, ttl_seconds=60, objects=store.objects)
+    bodies = {f"https://example.com/{i}": os.urandom(2000) for i in range(4)}
+    for i, (url, body) in enumerate(bodies.items()):
+        cache.set(url, body)
+        ref = cache._path(cache_key(url))
+        os.utime(ref, (time.time() - 100 + i, ref.stat().st_mtime))
+    store.put("events", "e0", bodies["https://example.com/0"])
+    objects = sorted((tmp_path / "objects").rglob("*.gz"))
+    on_disk = sum(p.stat().st_size for p in objects)
+    assert cache.stats().bytes == on_disk
+
+    # Evicting 0 and 1 deletes 1's object; the raw store still holds 0's.
+    removed, freed = cache.prune(max_bytes=on_disk // 2)
+    assert removed == 2 and cache.stats().bytes == on_disk - freed
+    assert cache.get_or_none("https://example.com/1") is None
+    assert store.get("events", "e0") == bodies["https://example.com/0"]
+    assert len(list((tmp_path / "objects").rglob("*.gz"))) == 3
+    cache.close()
+    store.close()
+
+
+def test_pack_cache_matches_disk_cache_api(tmp_path: Path):
+    cache = open_cache(CacheConfig(dir=tmp_path, backend="sqlite", memory_bytes=0))
+    assert isinstance(cache, PackCache)
+    url = "http://www.ufcstats.com/fight-details/bout1"
+    assert cache.get_or_none(url) is None
+    cache.set(url, b"fight", {"ETag": '"f1"'})
+    assert cache.get_or_none(url) == b"fight"
+    assert cache.ttl_for(url) == float("inf")
+
+    cache.ttl_policy = []
+    cache.ttl_seconds = -1
+    assert cache.get_or_none(url) is None
+    assert cache.get_stale(url) == (b"fight", {"ETag": '"f1"'})
+    cache.ttl_seconds = 60
+    cache.revalidated(url)
+    assert cache.get_or_none(url) == b"fight"
+    cache.close()
+
+    reopened = PackCache(tmp_path / "cache.sqlite")
+    assert reopened.get_or_none(url) == b"fight"
+    assert (tmp_path / "cache.sqlite").exists()
+    assert not list(tmp_path.glob("*.cache"))
+    reopened.close()
+
+
+def test_disk_cache_lru_eviction_and_counters(tmp_path: Path):
+    cache = DiskCache(tmp_path, ttl_seconds=60)
+    for i in range(4):
+        cache.set(f"https://example.com/{i}", b"x" * 100)
+        entry = cache._path(cache_key(f"https://example.com/{i}"))
+        os.utime(entry, (time.time() - 100 + i, entry.stat().st_mtime))
+    # Touch 0 so 1 becomes least recently used.
+    cache.get_or_none("https://example.com/0")
+    cache.get_or_none("https://example.com/missing")
+    st = cache.stats()
+    size = 100 + ENTRY_HEADER_SIZE  # bytes on disk per entry
+    assert (st.entries, st.bytes, st.hits, st.misses) == (4, 4 * size, 1, 1)
+    assert st.age_histogram["<1h"] == 4
+
+    removed, freed = cache.prune(max_bytes=int(2.5 * size))
+    assert (removed, freed) == (2, 2 * size)
+    assert cache.get_or_none("https://example.com/0") == b"x" * 100
+    assert cache.get_or_none("https://example.com/1") is None
+    cache.close()
+
+    # Counters survive the process.
+    again = DiskCache(tmp_path, ttl_seconds=60)
+    assert (again.stats().hits, again.stats().misses) == (2, 2)
+
+
+def test_prune_expired_uses_per_url_ttl(tmp_path: Path):
+    cache = DiskCache.from_config(CacheConfig(dir=tmp_path, ttl_seconds=-1))
+    cache.set("http://www.ufcstats.com/fight-details/b1", b"fight")
+    cache.set("http://www.ufcstats.com/other", b"other")
+    assert cache.stats().expired == 1
+    assert cache.prune(expired=True) == (1, len(b"other") + ENTRY_HEADER_SIZE)
+    assert cache.get_or_none("http://www.ufcstats.com/fight-details/b1") == b"fight"
+
+
+def test_pack_cache_budget_and_verify(tmp_path: Path):
+    cache = PackCache(tmp_path / "cache.sqlite", ttl_seconds=60, max_bytes=10_000)
+    for i in range(30):
+        cache.set(f"https://example.com/{i}", b"y" * 1000)
+    assert cache.stats().bytes <= 10_000
+    assert cache.verify() == []
+    cache._conn.execute("UPDATE entries SET body = ? WHERE url = ?", (b"bad", "https://example.com/29"))
+    assert len(cache.verify(repair=True)) == 1
+    assert cache.get_or_none("https://example.com/29") is None
+    cache.close()
+
+
+def test_memory_cache_serves_hits_without_backend(tmp_path: Path):
+    cache = open_cache(CacheConfig(dir=tmp_path, memory_bytes=1024))
+    assert isinstance(cache, MemoryCache)
+    cache.set("https://example.com/a", b"page")
+    (tmp_path / f"{cache_key('https://example.com/a')}.cache").unlink()
+    assert cache.get_or_none("https://example.com/a") == b"page"
+    assert (cache.hits, cache.misses) == (1, 0)
+    assert cache.stats().entries == 0  # admin calls go to the backend
+    cache.close()
+
+
+def test_memory_cache_evicts_least_recently_used_by_bytes(tmp_path: Path):
+    cache = MemoryCache(DiskCache(tmp_path, ttl_seconds=60), capacity=250)
+    for i in range(3):
+        cache.set(f"https://example.com/{i}", b"x" * 100)
+    assert (cache.entries, cache.bytes) == (2, 200)
+    cache.set("https://example.com/big", b"y" * 300)  # larger than the tier: disk only
+    assert cache.entries == 2
+    assert cache.get_or_none("https://example.com/0") == b"x" * 100  # from disk
+    assert (cache.hits, cache.misses) == (0, 1)
+
+
+def test_memory_cache_honours_backend_ttl(tmp_path: Path):
+    backend = DiskCache(tmp_path, ttl_seconds=60)
+    cache = MemoryCache(backend, capacity=1024)
+    cache.set("https://example.com/a", b"page")
+    backend.ttl_seconds = -1
+    assert cache.get_or_none("https://example.com/a") is None
+    assert cache.entries == 0
+
+
+
+@pytest.mark.parametrize("backend_name", ["files", "sqlite"])
+def test_memory_cache_keeps_backend_fetch_time(tmp_path: Path, backend_name: str):
+    config = CacheConfig(dir=tmp_path, backend=backend_name, ttl_seconds=60, memory_bytes=0)
+    backend = open_cache(config)
+    backend.set("https://example.com/a", b"page")
+    # Fetched 59.8s ago: loading it into memory must not restart its TTL.
+    fetched_at = time.time() - 59.8
+    if backend_name == "files":
+        entry = backend._path(cache_key("https://example.com/a"))
+        os.utime(entry, (fetched_at, fetched_at))
+    else:
+        backend._conn.execute("UPDATE entries SET fetched_at = ?", (fetched_at,))
+        backend._conn.commit()
+    cache = MemoryCache(backend, capacity=1024)
+    assert cache.get_or_none("https://example.com/a") == b"page"
+    time.sleep(0.3)
+    assert cache.get_or_none("https://example.com/a") is None
+    assert cache.entries == 0
+    cache.close()
+
+def test_object_store_put_stream_dedupes_and_spools(tmp_path: Path):
+    objects = ObjectStore(tmp_path)
+    with objects.put_stream([b"<html>", b"page", b"</html>"], spool=True) as body:
+        assert body.sha == objects.put(b"<html>page</html>")
+        with body.view() as buf:
+            assert buf[:6] == b"<html>" and len(buf) == body.size == 17
+        assert body.text() == "<html>page</html>"
+        spool = body.path
+    assert not spool.exists()
+    again = objects.put_stream(iter([b"<html>page</html>"]))
+    assert again.path is None and again.read() == b"<html>page</html>"
+    assert not any(objects.tmp_dir.iterdir())
+    assert len(list(tmp_path.rglob("*.gz"))) == 1
+
+
+def test_object_store_removes_stale_temp_files_on_open(tmp_path: Path):
+    objects = ObjectStore(tmp_path)
+    stale = [objects.tmp_dir / "killed.tmp", objects.tmp_dir / "killed.spool", tmp_path / "old.tmp"]
+    fresh = objects.tmp_dir / "writing.tmp"
+    for p in [*stale, fresh]:
+        p.write_bytes(b"partial")
+    two_hours_ago = time.time() - 7200
+    for p in stale:
+        os.utime(p, (two_hours_ago, two_hours_ago))
+    ObjectStore(tmp_path)
+    assert [p.exists() for p in stale] == [False, False, False]
+    assert fresh.exists()
+
+
+def test_pack_cache_set_body_streams_blob(tmp_path: Path):
+    objects = ObjectStore(tmp_path / "objects")
+    cache = PackCache(tmp_path / "cache.sqlite", ttl_seconds=60)
+    body = objects.put_stream([b"x" * 100_000, b"y" * 50_000], spool=True)
+    cache.set_body("https://example.com/big", body, {"ETag": '"e"'})
+    body.close()
+    assert cache.get_or_none("https://example.com/big") == b"x" * 100_000 + b"y" * 50_000
+    assert cache.verify() == []
+    cache.close()
+
+
+def test_disk_cache_torn_or_corrupt_entry_reads_as_miss(tmp_path: Path):
+    url = "https://example.com/page"
+    cache = DiskCache(tmp_path, ttl_seconds=60)
+    cache.set(url, b"<html>" + b"x" * 100 + b"</html>")
+    entry = cache._path(cache_key(url))
+    entry.write_bytes(entry.read_bytes()[:-20])  # writer killed mid-body
+    assert cache.get_or_none(url) is None
+    assert cache.get_stale(url) is None
+    assert cache.verify(repair=True) == [cache_key(url)]
+    assert not entry.exists()
+
+
+def test_disk_cache_writes_leave_no_temp_files(tmp_path: Path):
+    cache = DiskCache(tmp_path, ttl_seconds=60)
+    cache.set("https://example.com/a", b"a", {"ETag": '"1"'})
+    cache.set("https://example.com/a", b"b", {"ETag": '"2"'})
+    assert not list(tmp_path.glob(".*.tmp"))
+    assert cache.get_or_none("https://example.com/a") == b"b"
+
+
+def _hold_lock(cache_dir: str, url: str, started, seconds: float) -> None:
+    with DiskCache(Path(cache_dir)).lock(url):
+        started.set()
+        time.sleep(seconds)
+
+
+def _hold_pack_lock(path: str, url: str, started, seconds: float) -> None:
+    with PackCache(Path(path)).lock(url):
+        started.set()
+        time.sleep(seconds)
+
+
+def test_cache_lock_excludes_other_processes(tmp_path: Path):
+    url = "https://example.com/shared"
+    started = multiprocessing.Event()
+    proc = multiprocessing.Process(
+        target=_hold_lock, args=(str(tmp_path), url, started, 0.5)
+    )
+    proc.start()
+    assert started.wait(10)
+    t0 = time.monotonic()
+    with DiskCache(tmp_path).lock(url):
+        waited = time.monotonic() - t0
+    proc.join()
+    assert waited >= 0.2
+
+
+
+def test_cache_locks_use_a_fixed_set_of_stripes(tmp_path: Path):
+    from fightmatch.cache.base import LOCK_STRIPES
+
+    cache = DiskCache(tmp_path)
+    for i in range(500):
+        with cache.lock(f"https://example.com/{i}"):
+            pass
+    assert (tmp_path / "cache.lock").is_file()
+    assert not (tmp_path / "locks").exists()
+    assert len(cache._locks._shared.threads) == LOCK_STRIPES
+    cache.close()
+
+    # The pack cache stays one database file plus one lock file.
+    pack = PackCache(tmp_path / "pack" / "cache.sqlite")
+    with pack.lock("https://example.com/0"):
+        pass
+    pack.close()
+    names = {p.name for p in (tmp_path / "pack").iterdir()}
+    assert names - {"cache.sqlite-wal", "cache.sqlite-shm"} == {"cache.sqlite", "cache.sqlite.lock"}
+
+
+def test_pack_cache_lock_excludes_other_processes(tmp_path: Path):
+    url = "https://example.com/shared"
+    started = multiprocessing.Event()
+    proc = multiprocessing.Process(
+        target=_hold_pack_lock, args=(str(tmp_path / "cache.sqlite"), url, started, 0.5)
+    )
+    proc.start()
+    assert started.wait(10)
+    t0 = time.monotonic()
+    # A second cache object in this process shares the lock file, so it waits too.
+    with PackCache(tmp_path / "cache.sqlite").lock(url):
+        waited = time.monotonic() - t0
+    proc.join()
+    assert waited >= 0.2
+
+
+def test_cache_backend_missing_admin_hooks_fails_at_creation():
+    from fightmatch.cache.base import CacheAdminMixin
+
+    class Partial(CacheAdminMixin):
+        def iter_entries(self):
+            return iter(())
+
+    with pytest.raises(TypeError, match="remove"):
+        Partial()
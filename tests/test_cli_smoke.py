@@ -222,3 +222,52 @@ def test_cli_demo_uses_existing_data(raw_dir_from_fixtures: Path, tmp_path: Path
     )
     assert proc.returncode == 0, (proc.stdout, proc.stderr)
     assert (reports / "summary.md").exists()
+
+
+def test_cli_cache_stats_and_prune(tmp_path: Path) -> None:
+    """cache stats reports entries; cache prune --max-bytes enforces the budget."""
+    from fightmatch.cache import DiskCache
+
+    cache = DiskCache(tmp_path / "raw" / "ufcstats")
+    for i in range(5):
+        cache.set(f"http://www.ufcstats.com/fight-details/b{i}", b"z" * 900)
+    proc = _run_fightmatch("cache", "stats", "--raw", str(tmp_path / "raw"))
+    assert proc.returncode == 0, (proc.stdout, proc.stderr)
+    assert "Entries:  5" in proc.stdout
+    proc = _run_fightmatch("cache", "prune", "--raw", str(tmp_path / "raw"), "--max-bytes", "2K")
+    assert proc.returncode == 0, (proc.stdout, proc.stderr)
+    assert "Pruned 3 entries" in proc.stdout
+
+
+def test_cli_bench_scrape_replays_recorded_corpus(fixtures_dir: Path, tmp_path: Path) -> None:
+    """bench scrape replays a recorded raw dir offline and reports JSON metrics."""
+    from fightmatch.config import ScrapeConfig
+    from fightmatch.scrape.replay import ReplayAdapter, replay_session
+    from fightmatch.scrape.ufcstats_client import scrape_since
+
+    base = "http://www.ufcstats.com"
+    pages = {
+        f"{base}/statistics/events/completed?page=all": (fixtures_dir / "events_list.html").read_bytes(),
+        f"{base}/event-details/def456": (fixtures_dir / "event_abc123.html").read_bytes(),
+        f"{base}/fight-details/bout1": (fixtures_dir / "fight_bout1.html").read_bytes(),
+        f"{base}/fight-details/bout2": (fixtures_dir / "fight_bout1.html").read_bytes(),
+        **{
+            f"{base}/fighter-details/{fid}": (fixtures_dir / "fighter_fred1.html").read_bytes()
+            for fid in ("fred1", "barney2", "jane3", "john4")
+        },
+    }
+    config = ScrapeConfig(rate_limit_seconds=0, rate_limit_jitter=0)
+    raw = tmp_path / "raw"
+    scrape_since("2024-04-01", raw, config=config, session=replay_session(ReplayAdapter(pages), config))
+
+    proc = _run_fightmatch(
+        "bench", "scrape",
+        "--corpus", str(raw),
+        "--since", "2024-04-01",
+        "--latency-ms", "1",
+        "--json",
+    )
+    assert proc.returncode == 0, (proc.stdout, proc.stderr)
+    cold, warm = json.loads(proc.stdout)
+    assert cold["requests"] > 0 and cold["pages_per_sec"] > 0
+    assert warm["requests"] == 0 and warm["cache_hit_rate"] == 1.0
@@ -5,9 +5,12 @@ from pathlib import Path
 import pytest
 
 from fightmatch.scrape.parse import (
+    available_backends,
     parse_events_list,
     parse_event_page,
     parse_fight_details,
+    parse_fighter_page,
+    set_parser_backend,
 )
 
 FIXTURES = Path(__file__).parent / "fixtures"
@@ -49,3 +52,110 @@ def test_parse_fight_details():
     assert red_s.get("td_landed") == 2
     assert red_s.get("td_att") == 5
     assert len(fighter_infos) == 2
+
+
+def test_parse_fighter_page():
+    html = (FIXTURES / "fighter_fred1.html").read_text()
+    fighter = parse_fighter_page(html, "fred1")
+    assert fighter["fighter_id"] == "fred1"
+    assert fighter["name"] == "Fred Smith"
+    assert fighter["height"] == "6' 0\""
+    assert fighter["reach"] == '74"'
+    assert fighter["stance"] == "Southpaw"
+    assert fighter["dob"] == "1990-07-22"
+
+
+def test_parse_fighter_page_missing_values_are_none():
+    html = (FIXTURES / "fighter_fred1.html").read_text()
+    html = html.replace("Southpaw", "--").replace("Jul 22, 1990", "--")
+    fighter = parse_fighter_page(html, "fred1")
+    assert fighter["stance"] is None
+    assert fighter["dob"] is None
+
+
+def test_parse_fight_details_reads_only_stats_tables_and_fighter_links():
+    html = """<html><head><script>var s = "<td>Takedowns</td>";</script></head><body>
+    <a href="http://www.ufcstats.com/fighter-details/aa11/"> Jos&eacute; <b>Aldo</b> </a>
+    <a href="/fighter-details/bb22">Max Holloway</a><a href="/fighter-details/cc33">x</a>
+    <table class="b-fight-details__table"><thead><tr><th>Label</th><th>R</th></tr></thead>
+    <tr><td><p>Sig. Str.</p></td><td> <span>12</span> of 30 </td><td>7 of 21</td></tr>
+    <tr><td>TD</td><td>1 of 2</td><td>0 of 0</td></tr>
+    <tr><td>Ctrl</td><td>3:05</td><td>--</td></tr>
+    </table>
+    <table><tr><td>Significant Strikes</td><td>999 of 999</td><td>9 of 9</td></tr></table>
+    </body></html>"""
+    red_s, blue_s, fighter_infos = parse_fight_details(html, "b9")
+    assert fighter_infos == [
+        {"fighter_id": "aa11", "name": "José Aldo"},
+        {"fighter_id": "bb22", "name": "Max Holloway"},
+    ]
+    assert (red_s["fighter_id"], blue_s["fighter_id"]) == ("aa11", "bb22")
+    assert (red_s["sig_str_landed"], red_s["sig_str_att"]) == (12, 30)
+    assert (blue_s["td_landed"], blue_s["td_att"]) == (0, 0)
+    assert red_s["ctrl_time_seconds"] == 185
+    assert blue_s["ctrl_time_seconds"] is None
+
+
+
+def test_parse_fight_details_matches_labels_across_lines():
+    html = """<table class="b-fight-details__table">
+    <tr><td>Grappling
+    TD</td><td>3 of 7</td><td>1 of 4</td></tr>
+    <tr><td>Grappling
+    TD sub</td><td>2</td><td>0</td></tr>
+    </table>"""
+    red_s, blue_s, _ = parse_fight_details(html, "b1")
+    assert (red_s["td_landed"], red_s["td_att"], blue_s["td_att"]) == (3, 7, 4)
+    assert (red_s["sub_att"], blue_s["sub_att"]) == (2, 0)
+
+
+def test_parse_fight_details_nested_tables_read_like_a_tree():
+    # A cell holding another stats table: its rows count too, and the outer
+    # cell's text includes the inner table's (as BeautifulSoup's get_text()).
+    html = """<a href="/fighter-details/r1">Red</a><a href="/fighter-details/b1">Blue</a>
+    <table class="b-fight-details__table"><tbody>
+    <tr><td>Sig. str.</td><td>10 of 20</td><td>
+      <table class="b-fight-details__table"><tr><td>Rev.</td><td>1</td><td>2</td></tr></table>
+    </td></tr>
+    </tbody></table>"""
+    red_s, blue_s, _ = parse_fight_details(html, "b1")
+    assert (red_s["sig_str_landed"], red_s["sig_str_att"]) == (10, 20)
+    assert (red_s["rev"], blue_s["rev"]) == (1, 2)
+    assert (blue_s["sig_str_landed"], blue_s["sig_str_att"]) == (12, None)  # "Rev.12"
+    assert (red_s["fighter_id"], blue_s["fighter_id"]) == ("r1", "b1")
+
+
+def test_parse_fight_details_unclosed_cells_read_like_a_tree():
+    html = """<table class="b-fight-details__table">
+    <tr><td>TD<td>1 of 2<td>0 of 3</tr>
+    </table>"""
+    red_s, blue_s, _ = parse_fight_details(html, "b1")
+    # html.parser nests unclosed cells, so the first cell's text runs on.
+    assert red_s["td_landed"] == 1 and red_s["td_att"] == 20
+    assert blue_s["td_landed"] == 0 and blue_s["td_att"] == 3
+
+
+def _parse_all_fixtures() -> dict:
+    return {
+        "events": parse_events_list((FIXTURES / "events_list.html").read_text()),
+        "event": parse_event_page((FIXTURES / "event_abc123.html").read_text(), "abc123"),
+        "fight": parse_fight_details((FIXTURES / "fight_bout1.html").read_text(), "bout1"),
+        "fighter": parse_fighter_page((FIXTURES / "fighter_fred1.html").read_text(), "fred1"),
+    }
+
+
+def test_parser_backends_produce_identical_records():
+    pytest.importorskip("lxml")
+    previous = set_parser_backend("html.parser")
+    try:
+        reference = _parse_all_fixtures()
+        set_parser_backend("lxml")
+        assert _parse_all_fixtures() == reference
+    finally:
+        set_parser_backend(previous)
+
+
+def test_set_parser_backend_rejects_unknown_backend():
+    assert "html.parser" in available_backends()
+    with pytest.raises(ValueError):
+        set_parser_backend("no-such-parser")
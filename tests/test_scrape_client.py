@@ -0,0 +1,815 @@
+"""Test the UFCStats fetch engine against an in-memory fake session (no network)."""
+
+from __future__ import annotations
+
+import json
+import re
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+import requests
+
+from fightmatch.cache import DiskCache, cache_key
+from fightmatch.config import CacheConfig, ScrapeConfig
+from fightmatch.rawstore import RawStore
+from fightmatch.scrape.bench import bench_scrape
+from fightmatch.scrape.manifest import DONE, FAILED, PARTIAL, ScrapeManifest
+from fightmatch.scrape.metrics import HIT, MISS, FetchRecorder
+from fightmatch.scrape.parse import parse_event_page
+from fightmatch.scrape.parse_cache import ParseCache
+from fightmatch.scrape.pipeline import ingest_since
+from fightmatch.scrape.queue import JOB_DONE, JOB_FAILED, LEASED, SharedRateLimiter, WorkQueue
+from fightmatch.scrape.replay import ReplayAdapter, load_corpus, replay_session
+from fightmatch.scrape.store import build_dataset
+from fightmatch.scrape.ufcstats_client import (
+    AdaptiveRateLimiter,
+    TokenBucket,
+    discover_new_events,
+    fetch,
+    fetch_body,
+    open_stores,
+    scrape_fighters,
+    scrape_since,
+)
+from fightmatch.scrape.worker import enqueue_since, run_worker
+
+FIXTURES = Path(__file__).parent / "fixtures"
+BASE = "http://www.ufcstats.com"
+
+
+class _FakeResponse:
+    def __init__(self, url: str, status_code: int, body: bytes, headers: dict | None = None):
+        self.url = url
+        self.status_code = status_code
+        self.content = body
+        self.headers: dict[str, str] = headers or {}
+
+    def iter_content(self, chunk_size: int = 1):
+        for i in range(0, len(self.content), chunk_size):
+            yield self.content[i : i + chunk_size]
+
+    def close(self) -> None:
+        pass
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} for {self.url}", response=self)
+
+
+class _FakeSession:
+    """Serves fixture pages by URL and records every request (thread-safe)."""
+
+    def __init__(self, pages: dict[str, bytes], etag: str | None = None):
+        self.pages = pages
+        self.etag = etag
+        self.requests: list[str] = []
+        self.not_modified = 0
+        self._lock = threading.Lock()
+
+    def get(self, url: str, headers=None, timeout=None, stream=False) -> _FakeResponse:
+        with self._lock:
+            self.requests.append(url)
+        if url not in self.pages:
+            return _FakeResponse(url, 404, b"")
+        if self.etag and (headers or {}).get("If-None-Match") == self.etag:
+            with self._lock:
+                self.not_modified += 1
+            return _FakeResponse(url, 304, b"")
+        return _FakeResponse(url, 200, self.pages[url], {"ETag": self.etag} if self.etag else None)
+
+    def close(self) -> None:
+        pass
+
+
+@pytest.fixture
+def fixture_pages() -> dict[str, bytes]:
+    event = (FIXTURES / "event_abc123.html").read_bytes()
+    fight = (FIXTURES / "fight_bout1.html").read_bytes()
+    fighter = (FIXTURES / "fighter_fred1.html").read_bytes()
+    return {
+        f"{BASE}/statistics/events/completed?page=all": (FIXTURES / "events_list.html").read_bytes(),
+        f"{BASE}/event-details/abc123": event,
+        f"{BASE}/event-details/def456": event,
+        f"{BASE}/fight-details/bout1": fight,
+        f"{BASE}/fight-details/bout2": fight,
+        **{
+            f"{BASE}/fighter-details/{fid}": fighter
+            for fid in ("fred1", "barney2", "jane3", "john4")
+        },
+    }
+
+
+def _fast_config() -> ScrapeConfig:
+    return ScrapeConfig(rate_limit_seconds=0, rate_limit_jitter=0, max_retries=1)
+
+
+def test_token_bucket_spaces_requests_across_threads():
+    bucket = TokenBucket(rate=20.0, capacity=1.0)
+    stamps: list[float] = []
+    lock = threading.Lock()
+
+    def worker():
+        bucket.wait()
+        with lock:
+            stamps.append(time.monotonic())
+
+    start = time.monotonic()
+    threads = [threading.Thread(target=worker) for _ in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    # 1 immediate token + 5 more at 20/s -> at least ~0.25s total regardless of thread count.
+    assert max(stamps) - start >= 0.2
+
+
+def test_token_bucket_jitter_spaces_requests_too(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr("random.uniform", lambda a, b: b)
+    bucket = TokenBucket(rate=100.0, capacity=1.0, jitter=0.05)
+    start = time.monotonic()
+    threads = [threading.Thread(target=bucket.wait) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    # Each request's jitter delays the ones queued behind it: 4 x 0.05s + 3 x 0.01s.
+    assert time.monotonic() - start >= 0.2
+
+
+def test_adaptive_limiter_defaults_to_the_configured_rate():
+    limiter = AdaptiveRateLimiter.from_config(ScrapeConfig(rate_limit_seconds=2.0))
+    for _ in range(10):
+        limiter.succeeded()
+    assert limiter.rate == limiter.max_rate == 0.5
+
+def test_adaptive_limiter_speeds_up_and_backs_off():
+    limiter = AdaptiveRateLimiter(rate=1.0, min_rate=0.25, max_rate=2.0, increase=0.5)
+    for _ in range(10):
+        limiter.succeeded()
+    assert limiter.rate == 2.0
+    limiter.throttled()
+    limiter.throttled()
+    limiter.throttled()
+    assert (limiter.rate, limiter.throttles) == (0.25, 3)
+
+
+def test_fetch_honours_retry_after_for_all_workers():
+    url = f"{BASE}/event-details/abc123"
+
+    class ThrottlingSession(_FakeSession):
+        def get(self, url: str, headers=None, timeout=None) -> _FakeResponse:
+            with self._lock:
+                self.requests.append(url)
+                first = len(self.requests) == 1
+            if first:
+                return _FakeResponse(url, 429, b"", {"Retry-After": "0.3"})
+            return _FakeResponse(url, 200, self.pages[url])
+
+    session = ThrottlingSession({url: b"event"})
+    limiter = AdaptiveRateLimiter(rate=100.0, min_rate=1.0, max_rate=100.0)
+    config = ScrapeConfig(rate_limit_jitter=0, max_retries=2, retry_backoff_base=10.0)
+    start = time.monotonic()
+    assert fetch(url, config, None, limiter, session) == b"event"
+    # Waited for Retry-After (not the 10s backoff), and the rate was halved.
+    assert 0.3 <= time.monotonic() - start < 2.0
+    assert limiter.throttles == 1
+    assert limiter.rate < 100.0
+    assert len(session.requests) == 2
+
+
+def test_fetch_records_outcome_retries_and_time_split(tmp_path: Path):
+    url = f"{BASE}/fight-details/bout1"
+    session = _FakeSession({url: b"fight"})
+    cache = DiskCache(tmp_path, ttl_seconds=60)
+    recorder = FetchRecorder()
+    fetch(url, _fast_config(), cache, TokenBucket(rate=1e9), session, recorder)
+    fetch(url, _fast_config(), cache, TokenBucket(rate=1e9), session, recorder)
+    with pytest.raises(requests.HTTPError):
+        fetch(f"{BASE}/fight-details/nope", _fast_config(), None, None, session, recorder)
+
+    miss, hit, error = recorder.records
+    assert (miss.url_class, miss.outcome, miss.status, miss.bytes, miss.attempts) == ("fight", MISS, 200, 5, 1)
+    assert hit.outcome == HIT and hit.network_seconds == 0 and hit.attempts == 0
+    assert (error.outcome, error.status) == ("error", 404)
+    summary = recorder.summary()
+    assert summary["outcomes"] == {"hit": 1, "miss": 1, "revalidated": 0, "error": 1}
+    assert summary["by_class"]["fight"]["network_bytes"] == 5
+    assert summary["bound_by"] in {"network", "rate_limit", "backoff", "disk"}
+
+
+def test_scrape_since_writes_json_run_report(
+    tmp_path: Path, fixture_pages: dict[str, bytes], monkeypatch: pytest.MonkeyPatch
+):
+    session = _FakeSession(fixture_pages)
+    monkeypatch.setattr("fightmatch.scrape.ufcstats_client.make_session", lambda *a, **k: session)
+    scrape_since("2024-04-01", tmp_path, config=_fast_config())
+
+    (path,) = (tmp_path / "ufcstats" / "runs").glob("scrape-*.json")
+    report = json.loads(path.read_text())
+    assert report["run"]["completed"] is True
+    assert report["run"]["manifest"]["fight/done"] == 2
+    assert report["summary"]["requests"] == len(report["requests"]) == len(session.requests)
+    assert set(report["summary"]["by_class"]) == {
+        "events_index",
+        "event",
+        "fight",
+        "fighter",
+    }
+
+
+def test_fetch_cache_hit_skips_rate_limiter(tmp_path: Path):
+    class CountingLimiter:
+        calls = 0
+
+        def wait(self) -> None:
+            CountingLimiter.calls += 1
+
+    cache = DiskCache(tmp_path, ttl_seconds=60)
+    cache.set(f"{BASE}/x", b"cached")
+    session = _FakeSession({})
+    assert fetch(f"{BASE}/x", _fast_config(), cache, CountingLimiter(), session) == b"cached"
+    assert CountingLimiter.calls == 0
+    assert session.requests == []
+
+
+def test_scrape_since_concurrent_writes_events_and_fights(
+    tmp_path: Path, fixture_pages: dict[str, bytes], monkeypatch: pytest.MonkeyPatch
+):
+    session = _FakeSession(fixture_pages)
+    monkeypatch.setattr("fightmatch.scrape.ufcstats_client.make_session", lambda *a, **k: session)
+    scrape_since("2024-01-01", tmp_path, config=_fast_config(), concurrency=4)
+
+    raw_store = RawStore(tmp_path / "ufcstats")
+    assert raw_store.ids("events") == ["abc123", "def456"]
+    assert raw_store.ids("fights") == ["bout1", "bout2"]
+    assert raw_store.get("fights", "bout1") == fixture_pages[f"{BASE}/fight-details/bout1"]
+    assert raw_store.ids("fighters") == ["barney2", "fred1", "jane3", "john4"]
+    raw_store.close()
+    # One compressed object per distinct body: listing, event, fight, fighter page.
+    assert len(list((tmp_path / "ufcstats" / "objects").rglob("*.gz"))) == 4
+    assert not list((tmp_path / "ufcstats").glob("*.cache"))
+    first_run = len(session.requests)
+
+    # Warm cache: a second run never touches the network.
+    scrape_since("2024-01-01", tmp_path, config=_fast_config(), concurrency=4)
+    assert len(session.requests) == first_run
+
+
+def test_scrape_since_fetches_each_fighter_once_and_fills_dataset(
+    tmp_path: Path, fixture_pages: dict[str, bytes], monkeypatch: pytest.MonkeyPatch
+):
+    session = _FakeSession(fixture_pages)
+    monkeypatch.setattr("fightmatch.scrape.ufcstats_client.make_session", lambda *a, **k: session)
+    # Both events list the same four fighters; each page is fetched once.
+    scrape_since("2024-01-01", tmp_path, config=_fast_config(), concurrency=4)
+    fighter_requests = [u for u in session.requests if "/fighter-details/" in u]
+    assert sorted(fighter_requests) == sorted(set(fighter_requests))
+    assert len(fighter_requests) == 4
+
+    build_dataset(tmp_path, tmp_path / "processed")
+    fighters = json.loads((tmp_path / "processed" / "fighters.json").read_text())
+    fred = next(f for f in fighters if f["fighter_id"] == "fred1")
+    assert fred["reach"] == '74"'
+    assert fred["stance"] == "Southpaw"
+    assert fred["dob"] == "1990-07-22"
+
+
+def test_scrape_fighters_backfills_and_resumes(
+    tmp_path: Path, fixture_pages: dict[str, bytes], monkeypatch: pytest.MonkeyPatch
+):
+    session = _FakeSession(fixture_pages)
+    monkeypatch.setattr("fightmatch.scrape.ufcstats_client.make_session", lambda *a, **k: session)
+    scrape_since("2024-01-01", tmp_path, config=_fast_config(), fighters=False)
+    assert not [u for u in session.requests if "/fighter-details/" in u]
+
+    assert scrape_fighters(tmp_path, config=_fast_config(), session=session) == 4
+    session.requests.clear()
+    assert scrape_fighters(tmp_path, config=_fast_config(), session=session, resume=True) == 0
+    assert session.requests == []
+
+
+def test_concurrent_misses_on_one_url_collapse_to_one_request(tmp_path: Path):
+    url = f"{BASE}/event-details/abc123"
+
+    class SlowSession(_FakeSession):
+        def get(self, *args, **kwargs):
+            time.sleep(0.05)
+            return super().get(*args, **kwargs)
+
+    session = SlowSession({url: b"<html>event</html>"})
+    # Separate cache instances stand in for separate processes sharing the dir.
+    caches = [DiskCache(tmp_path, ttl_seconds=60) for _ in range(4)]
+    recorder = FetchRecorder()
+    threads = [
+        threading.Thread(
+            target=fetch, args=(url, _fast_config(), c, None, session, recorder)
+        )
+        for c in caches
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert session.requests == [url]
+    assert recorder.outcomes()[HIT] == 3
+
+
+def test_fetch_revalidates_expired_entry_with_etag(tmp_path: Path):
+    url = f"{BASE}/event-details/abc123"
+    session = _FakeSession({url: b"<html>event</html>"}, etag='"abc"')
+    cache = DiskCache(tmp_path, ttl_seconds=60)
+    assert fetch(url, _fast_config(), cache, None, session) == b"<html>event</html>"
+
+    cache.ttl_seconds = -1  # everything is expired now
+    assert fetch(url, _fast_config(), cache, None, session) == b"<html>event</html>"
+    assert session.not_modified == 1
+    cache.ttl_seconds = 60
+    assert cache.get_or_none(url) == b"<html>event</html>"
+
+
+def test_scrape_since_resume_retries_only_failed_fights(
+    tmp_path: Path, fixture_pages: dict[str, bytes], monkeypatch: pytest.MonkeyPatch
+):
+    bout2 = fixture_pages.pop(f"{BASE}/fight-details/bout2")
+    session = _FakeSession(fixture_pages)
+    monkeypatch.setattr("fightmatch.scrape.ufcstats_client.make_session", lambda *a, **k: session)
+    # Only def456 (2024-04-13) is on or after this date.
+    scrape_since("2024-04-01", tmp_path, config=_fast_config(), concurrency=2)
+
+    manifest = ScrapeManifest.for_raw_dir(tmp_path)
+    assert manifest.status("event", "def456") == PARTIAL
+    assert manifest.status("fight", "bout1") == DONE
+    assert manifest.status("fight", "bout2") == FAILED
+    manifest.close()
+
+    fixture_pages[f"{BASE}/fight-details/bout2"] = bout2
+    session.requests.clear()
+    scrape_since("2024-04-01", tmp_path, config=_fast_config(), concurrency=2, resume=True)
+    assert session.requests == [f"{BASE}/fight-details/bout2"]
+
+    manifest = ScrapeManifest.for_raw_dir(tmp_path)
+    assert manifest.status("event", "def456") == DONE
+    assert manifest.status("fight", "bout2") == DONE
+    manifest.close()
+
+    session.requests.clear()
+    scrape_since("2024-04-01", tmp_path, config=_fast_config(), resume=True)
+    assert session.requests == []
+
+
+def test_scrape_since_with_sqlite_cache_backend(
+    tmp_path: Path, fixture_pages: dict[str, bytes], monkeypatch: pytest.MonkeyPatch
+):
+    session = _FakeSession(fixture_pages)
+    monkeypatch.setattr("fightmatch.scrape.ufcstats_client.make_session", lambda *a, **k: session)
+    pack = CacheConfig(backend="sqlite")
+    scrape_since("2024-04-01", tmp_path, config=_fast_config(), cache_config=pack)
+    assert (tmp_path / "ufcstats" / "cache.sqlite").exists()
+    first_run = len(session.requests)
+    scrape_since("2024-04-01", tmp_path, config=_fast_config(), cache_config=pack)
+    assert len(session.requests) == first_run
+
+
+def test_replay_adapter_records_and_replays_corpus(tmp_path: Path, fixture_pages: dict[str, bytes]):
+    config = _fast_config()
+    adapter = ReplayAdapter(fixture_pages)
+    recorder = FetchRecorder()
+    scrape_since(
+        "2024-01-01", tmp_path, config=config, session=replay_session(adapter, config), recorder=recorder
+    )
+    assert recorder.outcomes()[MISS] == adapter.requests
+    # The raw dir is itself the recording: every page the scrape saw comes back.
+    assert load_corpus(tmp_path) == fixture_pages
+
+
+def test_replay_adapter_injects_throttling_and_revalidates():
+    url = f"{BASE}/event-details/abc123"
+    adapter = ReplayAdapter({url: b"event"}, throttle_rate=1.0, retry_after=0)
+    session = replay_session(adapter, _fast_config())
+    with pytest.raises(requests.HTTPError):
+        fetch(url, _fast_config(), None, None, session)
+    assert adapter.statuses[429] == 1
+
+    adapter.throttle_rate = 0.0
+    r = session.get(url)
+    assert session.get(url, headers={"If-None-Match": r.headers["ETag"]}).status_code == 304
+
+
+def test_bench_scrape_cold_then_warm(fixture_pages: dict[str, bytes]):
+    cold, warm = bench_scrape(fixture_pages, concurrency=2)
+    assert cold.requests > 0 and cold.outcomes[MISS] > 0
+    assert cold.p50_ms is not None and cold.p99_ms >= cold.p50_ms
+    assert warm.requests == 0
+    assert warm.outcomes[HIT] == warm.pages and warm.cache_hit_rate == 1.0
+
+
+def test_fetch_body_streams_without_buffering_whole_page(tmp_path: Path):
+    import tracemalloc
+
+    url = f"{BASE}/statistics/events/completed?page=all"
+    chunk = b"<tr>" + b"x" * (64 * 1024 - 4)
+
+    class StreamingResponse(_FakeResponse):
+        def iter_content(self, chunk_size: int = 1):
+            for _ in range(320):  # 20 MiB, generated lazily
+                yield chunk
+
+    class StreamingSession(_FakeSession):
+        def get(self, url, headers=None, timeout=None, stream=False):
+            assert stream
+            return StreamingResponse(url, 200, b"")
+
+    raw_store, cache = open_stores(tmp_path, CacheConfig(memory_bytes=0))
+    tracemalloc.start()
+    body = fetch_body(url, _fast_config(), cache, None, raw_store.objects, StreamingSession({}))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert body.size == 320 * len(chunk)
+    assert peak < 4 * 1024 * 1024
+    # Cache and raw store both point at the single streamed object.
+    raw_store.put_body("events", "index", body)
+    assert len(list((tmp_path / "ufcstats" / "objects").rglob("*.gz"))) == 1
+    assert (tmp_path / "ufcstats" / f"{cache_key(url)}.ref").read_text() == body.sha
+    cache.close()
+    raw_store.close()
+
+
+def test_fetch_body_closes_every_streamed_response(tmp_path: Path):
+    url = f"{BASE}/event-details/abc123"
+    statuses = [429, 503, 200, 304, 404]
+    responses: list[_FakeResponse] = []
+
+    class ClosingResponse(_FakeResponse):
+        closed = False
+
+        def close(self) -> None:
+            self.closed = True
+
+    class FlakySession(_FakeSession):
+        def get(self, url, headers=None, timeout=None, stream=False):
+            assert stream
+            headers = {"ETag": '"e"', "Retry-After": "0"}
+            responses.append(ClosingResponse(url, statuses[len(responses)], b"event", headers))
+            return responses[-1]
+
+    config = ScrapeConfig(rate_limit_jitter=0, max_retries=3)
+    limiter = TokenBucket(rate=1e9)
+    raw_store, cache = open_stores(tmp_path, CacheConfig(memory_bytes=0))
+    session = FlakySession({})
+    assert fetch_body(url, config, cache, limiter, raw_store.objects, session).read() == b"event"
+    cache.ttl_seconds, cache.ttl_policy = -1, []  # expired: revalidated with a 304
+    assert fetch_body(url, config, cache, limiter, raw_store.objects, session).read() == b"event"
+    cache.invalidate(url)
+    with pytest.raises(requests.HTTPError):
+        fetch_body(url, _fast_config(), cache, limiter, raw_store.objects, session)
+    assert [r.status_code for r in responses] == statuses
+    assert all(r.closed for r in responses)
+    cache.close()
+    raw_store.close()
+
+
+def _listing(*rows: tuple[str, str]) -> bytes:
+    cells = "".join(
+        f'<tr><td><a href="/event-details/{eid}">Event {eid}</a></td><td>{date}</td></tr>' for eid, date in rows
+    )
+    return f"<html><body><table>{cells}</table></body></html>".encode()
+
+
+@pytest.fixture
+def paged_listing(fixture_pages: dict[str, bytes]) -> dict[str, bytes]:
+    """Newest-first paginated listing: an upcoming card, then def456, then abc123, then older."""
+    listing = f"{BASE}/statistics/events/completed"
+    return {
+        **fixture_pages,
+        f"{listing}?page=1": _listing(("next1", "2999-01-01"), ("def456", "2024-04-13")),
+        f"{listing}?page=2": _listing(("abc123", "2024-01-15"), ("old1", "2023-06-01")),
+        f"{listing}?page=3": _listing(("old2", "2022-01-01")),
+    }
+
+
+def test_discover_new_events_stops_at_since_or_known(paged_listing: dict[str, bytes]):
+    session = _FakeSession(paged_listing)
+    events = discover_new_events("2024-01-01", _fast_config(), None, None, session)
+    assert [e["event_id"] for e in events] == ["def456", "abc123"]  # upcoming card skipped
+    assert session.requests[-1].endswith("?page=2")  # old1 is before since: page 3 never read
+
+    session.requests.clear()
+    events = discover_new_events("2020-01-01", _fast_config(), None, None, session, known={"def456"})
+    assert events == []
+    assert [u.rsplit("?", 1)[1] for u in session.requests] == ["page=1"]
+
+
+def test_scrape_since_incremental_fetches_only_new_events(
+    tmp_path: Path, paged_listing: dict[str, bytes], monkeypatch: pytest.MonkeyPatch
+):
+    session = _FakeSession(paged_listing)
+    monkeypatch.setattr("fightmatch.scrape.ufcstats_client.make_session", lambda *a, **k: session)
+    scrape_since("2024-04-01", tmp_path, config=_fast_config(), incremental=True)
+    manifest = ScrapeManifest.for_raw_dir(tmp_path)
+    assert manifest.ids_with_status("event") == {"def456"}
+    manifest.close()
+
+    # Next poll: page 1 is re-read (short TTL), def456 is known, nothing else is fetched.
+    expire_listing = CacheConfig(ttl_policy=[(r"\?page=", -1)])
+    session.requests.clear()
+    scrape_since("2024-04-01", tmp_path, config=_fast_config(), incremental=True, cache_config=expire_listing)
+    assert session.requests == [f"{BASE}/statistics/events/completed?page=1"]
+
+
+def test_pending_event_page_is_refetched_until_results_are_posted(
+    tmp_path: Path, fixture_pages: dict[str, bytes], monkeypatch: pytest.MonkeyPatch
+):
+    today = datetime.now(timezone.utc).date().isoformat()
+    event = fixture_pages[f"{BASE}/event-details/abc123"]
+    pending = re.sub(rb'<a href="/fight-details/[^"]*">Details</a>', b"", event)
+    pages = {
+        **fixture_pages,
+        f"{BASE}/statistics/events/completed?page=all": _listing(
+            ("next1", "2999-01-01"), ("today1", today), ("abc123", "2024-01-15")
+        ),
+        f"{BASE}/event-details/today1": pending,
+    }
+    session = _FakeSession(pages)
+    monkeypatch.setattr("fightmatch.scrape.ufcstats_client.make_session", lambda *a, **k: session)
+    scrape_since("2024-01-01", tmp_path, config=_fast_config())
+    assert f"{BASE}/event-details/next1" not in session.requests  # upcoming card skipped
+    manifest = ScrapeManifest.for_raw_dir(tmp_path)
+    assert manifest.status("event", "today1") == PARTIAL
+    manifest.close()
+
+    # Results are posted: the event page is fetched again, not served from the cache.
+    pages[f"{BASE}/event-details/today1"] = event
+    session.requests.clear()
+    scrape_since("2024-01-01", tmp_path, config=_fast_config(), resume=True)
+    assert session.requests == [f"{BASE}/event-details/today1"]
+    manifest = ScrapeManifest.for_raw_dir(tmp_path)
+    assert manifest.status("event", "today1") == DONE
+    manifest.close()
+
+
+def test_work_queue_leases_expire_and_retries_run_out(tmp_path: Path):
+    queue = WorkQueue(tmp_path / "queue.sqlite", max_attempts=2)
+    gen = queue.new_generation()
+    assert queue.enqueue("fight", "b1", f"{BASE}/fight-details/b1", "e1", gen)
+    assert not queue.enqueue("fight", "b1", f"{BASE}/fight-details/b1", "e1", gen)
+
+    job = queue.claim("w1", lease_seconds=-1)  # lease already expired: w1 "died"
+    assert job is not None and job.attempts == 1
+    assert queue.heartbeat("w2", 60) == 0
+    again = queue.claim("w2", lease_seconds=60)
+    assert again is not None and again.job_id == job.job_id and again.attempts == 2
+    assert queue.heartbeat("w2", 60) == 1
+    assert queue.claim("w3", lease_seconds=60) is None  # w2 holds a live lease
+    assert queue.counts() == {("fight", LEASED): 1}
+    # w1 turns up late: its lease is gone, so it cannot settle w2's job.
+    assert not queue.complete(job)
+    assert not queue.fail(job, "late")
+    assert queue.counts() == {("fight", LEASED): 1}
+
+    assert queue.fail(again, "boom")  # second attempt was the last: failed for good
+    assert queue.counts() == {("fight", JOB_FAILED): 1}
+    assert queue.active() == 0
+    # A later enqueue run schedules finished jobs again.
+    assert queue.enqueue("fight", "b1", f"{BASE}/fight-details/b1", "e1", queue.new_generation())
+    job = queue.claim("w1", 60)
+    assert queue.complete(job)
+    assert queue.counts() == {("fight", JOB_DONE): 1}
+    queue.close()
+
+
+def test_shared_rate_limiter_spaces_requests_across_processes(tmp_path: Path):
+    config = ScrapeConfig(rate_limit_seconds=0.1, rate_limit_jitter=0)
+    # Two queue connections stand in for two worker processes.
+    limiters = [
+        SharedRateLimiter.from_config(config, WorkQueue(tmp_path / "queue.sqlite"))
+        for _ in range(2)
+    ]
+    start = time.monotonic()
+    for _ in range(3):
+        for limiter in limiters:
+            limiter.wait()
+    # 6 requests at 10/s: the first is free, the other five are spaced 0.1s apart.
+    assert time.monotonic() - start >= 0.45
+    limiters[0].throttled(retry_after=0.2)
+    assert limiters[0].throttles == 1
+    t0 = time.monotonic()
+    limiters[1].wait()
+    assert time.monotonic() - t0 >= 0.2
+
+
+def test_shared_rate_limiter_resets_when_a_run_starts(tmp_path: Path):
+    queue = WorkQueue(tmp_path / "queue.sqlite")
+    slow = ScrapeConfig(rate_limit_seconds=10, rate_limit_jitter=0, min_rate=0.01)
+    old = SharedRateLimiter.from_config(slow, queue)
+    old.throttled(retry_after=300)
+    assert old.rate == 0.05
+
+    # A new run (scrape --enqueue) starts from its own config, without the pause.
+    fast = ScrapeConfig(rate_limit_seconds=0.5, rate_limit_jitter=0, max_rate=4.0)
+    SharedRateLimiter.from_config(fast, queue, reset=True)
+    worker = SharedRateLimiter.from_config(fast, queue)
+    assert worker.rate == 2.0
+    assert worker.wait() < 1.0
+    # A worker with a lower --max-rate pulls the shared rate down to it.
+    capped = ScrapeConfig(rate_limit_seconds=1.0, rate_limit_jitter=0, max_rate=1.0)
+    assert SharedRateLimiter.from_config(capped, queue).rate == 1.0
+    queue.close()
+
+
+def test_enqueue_then_workers_drain_queue(
+    tmp_path: Path, fixture_pages: dict[str, bytes], monkeypatch: pytest.MonkeyPatch
+):
+    session = _FakeSession(fixture_pages)
+    monkeypatch.setattr("fightmatch.scrape.worker.make_session", lambda *a, **k: session)
+    config = _fast_config()
+    assert enqueue_since("2024-01-01", tmp_path, config=config) == 2
+
+    workers = [
+        threading.Thread(
+            target=run_worker,
+            args=(tmp_path,),
+            kwargs={"config": config, "concurrency": 2, "worker_id": f"w{i}"},
+        )
+        for i in range(2)
+    ]
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+
+    raw_store = RawStore(tmp_path / "ufcstats")
+    assert raw_store.ids("events") == ["abc123", "def456"]
+    assert raw_store.ids("fights") == ["bout1", "bout2"]
+    assert raw_store.ids("fighters") == ["barney2", "fred1", "jane3", "john4"]
+    raw_store.close()
+    manifest = ScrapeManifest.for_raw_dir(tmp_path)
+    assert manifest.ids_with_status("event", DONE) == {"abc123", "def456"}
+    manifest.close()
+    # Every page was requested once, however the two workers split the jobs.
+    assert sorted(session.requests) == sorted(set(session.requests))
+
+
+def test_worker_retries_failed_job_then_gives_up(
+    tmp_path: Path, fixture_pages: dict[str, bytes], monkeypatch: pytest.MonkeyPatch
+):
+    del fixture_pages[f"{BASE}/fight-details/bout2"]
+    session = _FakeSession(fixture_pages)
+    monkeypatch.setattr("fightmatch.scrape.worker.make_session", lambda *a, **k: session)
+    config = ScrapeConfig(
+        rate_limit_seconds=0, rate_limit_jitter=0, max_retries=1, retry_backoff_base=0
+    )
+    enqueue_since("2024-04-01", tmp_path, config=config, fighters=False)
+    run_worker(tmp_path, config=config, concurrency=1)
+
+    bout2 = f"{BASE}/fight-details/bout2"
+    assert session.requests.count(bout2) == 3  # DEFAULT_MAX_ATTEMPTS
+    queue = WorkQueue.for_raw_dir(tmp_path)
+    assert queue.counts()[("fight", JOB_FAILED)] == 1
+    queue.close()
+    manifest = ScrapeManifest.for_raw_dir(tmp_path)
+    assert manifest.status("event", "def456") == PARTIAL
+    assert manifest.status("fight", "bout2") == FAILED
+    manifest.close()
+
+
+def test_worker_survives_a_failed_claim(
+    tmp_path: Path, fixture_pages: dict[str, bytes], monkeypatch: pytest.MonkeyPatch
+):
+    session = _FakeSession(fixture_pages)
+    monkeypatch.setattr("fightmatch.scrape.worker.make_session", lambda *a, **k: session)
+    config = ScrapeConfig(rate_limit_seconds=0, rate_limit_jitter=0, max_retries=1)
+    enqueue_since("2024-04-01", tmp_path, config=config, fighters=False)
+    claim = WorkQueue.claim
+    failures = iter([sqlite3.OperationalError("database is locked")])
+
+    def flaky_claim(self, *args, **kwargs):
+        for e in failures:
+            raise e
+        return claim(self, *args, **kwargs)
+
+    monkeypatch.setattr(WorkQueue, "claim", flaky_claim)
+    assert run_worker(tmp_path, config=config, concurrency=1, poll_seconds=0) == 3
+    manifest = ScrapeManifest.for_raw_dir(tmp_path)
+    assert manifest.status("event", "def456") == DONE
+    manifest.close()
+
+def test_worker_marks_unfetchable_event_failed(
+    tmp_path: Path, fixture_pages: dict[str, bytes], monkeypatch: pytest.MonkeyPatch
+):
+    del fixture_pages[f"{BASE}/event-details/def456"]
+    session = _FakeSession(fixture_pages)
+    monkeypatch.setattr("fightmatch.scrape.worker.make_session", lambda *a, **k: session)
+    config = ScrapeConfig(
+        rate_limit_seconds=0, rate_limit_jitter=0, max_retries=1, retry_backoff_base=0
+    )
+    enqueue_since("2024-04-01", tmp_path, config=config)
+    run_worker(tmp_path, config=config, concurrency=1)
+
+    manifest = ScrapeManifest.for_raw_dir(tmp_path)
+    assert manifest.status("event", "def456") == FAILED
+    manifest.close()
+
+
+def test_build_dataset_reuses_parse_cache_for_unchanged_pages(
+    tmp_path: Path, fixture_pages: dict[str, bytes], monkeypatch: pytest.MonkeyPatch
+):
+    session = _FakeSession(fixture_pages)
+    monkeypatch.setattr("fightmatch.scrape.ufcstats_client.make_session", lambda *a, **k: session)
+    scrape_since("2024-01-01", tmp_path, config=_fast_config())
+    build_dataset(tmp_path, tmp_path / "first")
+
+    def must_not_parse(*args, **kwargs):
+        raise AssertionError("unchanged page was parsed again")
+
+    for name in ("parse_event_page", "parse_fight_details", "parse_fighter_page"):
+        monkeypatch.setattr(f"fightmatch.scrape.store.{name}", must_not_parse)
+    build_dataset(tmp_path, tmp_path / "second")
+    for name in ("fighters.json", "events.json", "bouts.json", "stats.jsonl"):
+        assert (tmp_path / "second" / name).read_bytes() == (tmp_path / "first" / name).read_bytes()
+
+    # Changed content misses the cache, and so does everything after a version bump.
+    cache = ParseCache.for_raw_dir(tmp_path)
+    assert cache.get("fights", "bout1", "0" * 64) is None
+    cache.close()
+    cache = ParseCache(tmp_path / "ufcstats" / "parsed.sqlite", version=cache.version + 1)
+    raw_store = RawStore(tmp_path / "ufcstats")
+    assert cache.get("fights", "bout1", raw_store.sha("fights", "bout1")) is None
+    raw_store.close()
+    cache.close()
+
+
+def test_build_dataset_jobs_output_matches_serial(
+    tmp_path: Path, fixture_pages: dict[str, bytes], monkeypatch: pytest.MonkeyPatch
+):
+    session = _FakeSession(fixture_pages)
+    monkeypatch.setattr("fightmatch.scrape.ufcstats_client.make_session", lambda *a, **k: session)
+    scrape_since("2024-01-01", tmp_path, config=_fast_config())
+    build_dataset(tmp_path, tmp_path / "serial", parse_cache=False)
+    build_dataset(tmp_path, tmp_path / "pool", jobs=2)
+    # Second pooled build reads every page back from the cache the first one filled.
+    build_dataset(tmp_path, tmp_path / "cached", jobs=2)
+    for name in ("fighters.json", "events.json", "bouts.json", "stats.jsonl"):
+        serial = (tmp_path / "serial" / name).read_bytes()
+        assert (tmp_path / "pool" / name).read_bytes() == serial
+        assert (tmp_path / "cached" / name).read_bytes() == serial
+    assert json.loads((tmp_path / "pool" / "fighters.json").read_text())
+
+
+def test_ingest_since_parses_each_page_once_and_matches_build_dataset(
+    tmp_path: Path, fixture_pages: dict[str, bytes], monkeypatch: pytest.MonkeyPatch
+):
+    session = _FakeSession(fixture_pages)
+    monkeypatch.setattr("fightmatch.scrape.ufcstats_client.make_session", lambda *a, **k: session)
+    scrape_since("2024-01-01", tmp_path / "a", config=_fast_config())
+    build_dataset(tmp_path / "a", tmp_path / "a" / "processed", parse_cache=False)
+
+    def must_not_parse(*args, **kwargs):
+        raise AssertionError("page parsed again after ingest")
+
+    # The build at the end of ingest must find every page already parsed.
+    for name in ("parse_event_page", "parse_fight_details", "parse_fighter_page"):
+        monkeypatch.setattr(f"fightmatch.scrape.store.{name}", must_not_parse)
+    ingest_since(
+        "2024-01-01",
+        tmp_path / "b",
+        tmp_path / "b" / "processed",
+        config=_fast_config(),
+        parse_workers=2,
+        max_pending=1,
+    )
+    for name in ("fighters.json", "events.json", "bouts.json", "stats.jsonl"):
+        expected = (tmp_path / "a" / "processed" / name).read_bytes()
+        assert (tmp_path / "b" / "processed" / name).read_bytes() == expected
+    # The scraper's own event parse is cached exactly as build_dataset() computes it.
+    cache = ParseCache.for_raw_dir(tmp_path / "b")
+    raw_store = RawStore(tmp_path / "b" / "ufcstats")
+    html = raw_store.read_text("events", "abc123")
+    cached = cache.get("events", "abc123", raw_store.sha("events", "abc123"))
+    assert cached == json.loads(json.dumps(parse_event_page(html, "abc123")))
+    raw_store.close()
+    cache.close()
+
+
+def test_ingest_since_removes_spool_when_saving_a_page_fails(
+    tmp_path: Path, fixture_pages: dict[str, bytes], monkeypatch: pytest.MonkeyPatch
+):
+    session = _FakeSession(fixture_pages)
+    monkeypatch.setattr("fightmatch.scrape.ufcstats_client.make_session", lambda *a, **k: session)
+    put_body = RawStore.put_body
+
+    def failing_put_body(self, kind, item_id, body):
+        if kind != "events":
+            raise OSError("disk full")
+        return put_body(self, kind, item_id, body)
+
+    monkeypatch.setattr(RawStore, "put_body", failing_put_body)
+    ingest_since("2024-01-01", tmp_path, tmp_path / "processed", config=_fast_config())
+    manifest = ScrapeManifest.for_raw_dir(tmp_path)
+    assert manifest.status("fight", "bout1") == FAILED
+    assert manifest.status("fighter", "fred1") == FAILED
+    manifest.close()
+    assert not list(tmp_path.rglob("*.spool"))
@@ -0,0 +1,241 @@
+"""Test build_dataset outputs: streamed JSON, columnar tables, id registry, stats store."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from fightmatch.rawstore import RawStore
+from fightmatch.scrape.store import build_dataset
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+@pytest.fixture
+def raw_dir(tmp_path: Path) -> Path:
+    """Raw store as a scrape of the fixture site leaves it.
+
+    Two events share the fixture event page (Welterweight bout1, Lightweight
+    bout2), both bouts share the fight page and all four fighters the fighter page.
+    """
+    raw = tmp_path / "raw"
+    store = RawStore(raw / "ufcstats")
+    event = (FIXTURES / "event_abc123.html").read_bytes()
+    fight = (FIXTURES / "fight_bout1.html").read_bytes()
+    fighter = (FIXTURES / "fighter_fred1.html").read_bytes()
+    for event_id in ("abc123", "def456"):
+        store.put("events", event_id, event)
+    for bout_id in ("bout1", "bout2"):
+        store.put("fights", bout_id, fight)
+    for fighter_id in ("fred1", "barney2", "jane3", "john4"):
+        store.put("fighters", fighter_id, fighter)
+    store.close()
+    return raw
+
+
+def test_stream_writer_matches_json_dumps(tmp_path: Path):
+    from fightmatch.scrape.store import _StreamWriter
+
+    for records in ([], [{}], [{"a": [1, {"b": None}], "s": "x\ny"}, {"c": []}, 3]):
+        w = _StreamWriter(tmp_path / "out.json")
+        for r in records:
+            w.write(r)
+        w.close()
+        assert (tmp_path / "out.json").read_text() == json.dumps(records, indent=2)
+    assert [p.name for p in tmp_path.iterdir()] == ["out.json"]
+
+
+def test_build_dataset_failure_keeps_previous_output(
+    raw_dir: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    out = tmp_path / "processed"
+    build_dataset(raw_dir, out)
+    before = {p.name: p.read_bytes() for p in out.iterdir()}
+
+    def boom(*args, **kwargs):
+        raise RuntimeError("disk full")
+
+    monkeypatch.setattr("fightmatch.scrape.store._parse_fighter", boom)
+    with pytest.raises(RuntimeError):
+        build_dataset(raw_dir, out, parse_cache=False)
+    assert {p.name: p.read_bytes() for p in out.iterdir()} == before
+
+
+def test_build_dataset_writes_columnar_tables_matching_json(raw_dir: Path, tmp_path: Path):
+    from fightmatch.cli._util import detect_divisions, load_recent_pairs
+    from fightmatch.data import load_table
+    from fightmatch.match.features import build_features, load_processed
+    from fightmatch.scrape.columnar import SCHEMAS, table_path
+
+    out = tmp_path / "processed"
+    build_dataset(raw_dir, out)
+
+    bouts = load_table(out, "bouts")
+    assert bouts.rows == 4
+    assert bouts.raw("red_fighter_id").typecode == "i"
+    assert bouts.column("round") == [b["round"] for b in json.loads((out / "bouts.json").read_text())]
+    from_json = {
+        "fighters": json.loads((out / "fighters.json").read_text()),
+        "events": json.loads((out / "events.json").read_text()),
+        "bouts": json.loads((out / "bouts.json").read_text()),
+        "stats": [json.loads(line) for line in (out / "stats.jsonl").read_text().splitlines()],
+    }
+    for table, records in from_json.items():
+        assert load_table(out, table).records() == records
+
+    # Consumers give the same answers from the columnar tables as from JSON.
+    with_columns = (
+        load_recent_pairs(out),
+        detect_divisions(out),
+        [len(t) for t in load_processed(out)],
+    )
+    build_features(out, tmp_path / "col.csv")
+    for table in SCHEMAS:
+        table_path(out, table).unlink()
+    assert load_table(out, "bouts") is None
+    assert with_columns == (
+        load_recent_pairs(out),
+        detect_divisions(out),
+        [len(t) for t in load_processed(out)],
+    )
+    build_features(out, tmp_path / "json.csv")
+    assert (tmp_path / "col.csv").read_text() == (tmp_path / "json.csv").read_text()
+
+
+def test_columnar_tables_keep_json_shape_and_yield_to_newer_json(tmp_path: Path):
+    import os
+
+    from fightmatch.data import IdRegistry, load_table
+    from fightmatch.db.ingest import _load_processed
+    from fightmatch.scrape.columnar import table_path, write_table
+
+    records = [
+        {"event_id": "e1", "name": "UFC 1", "date": "1993-11-12", "location": "Denver"},
+        {"event_id": "e2", "name": "UFC 2"},
+    ]
+    (tmp_path / "events.json").write_text(json.dumps(records))
+    registry = IdRegistry()
+    write_table(table_path(tmp_path, "events"), "events", records, registry)
+    registry.save(tmp_path / "ids.json")
+    assert load_table(tmp_path, "events").records() == records
+
+    # A JSON file rewritten after the .col file wins over it.
+    edited = records[:1]
+    (tmp_path / "events.json").write_text(json.dumps(edited))
+    col_mtime = table_path(tmp_path, "events").stat().st_mtime_ns
+    os.utime(tmp_path / "events.json", ns=(col_mtime + 10**9, col_mtime + 10**9))
+    assert load_table(tmp_path, "events") is None
+    assert _load_processed(tmp_path, "events", "events.json") == edited
+
+def test_build_features_names_unnamed_fighters_by_id(raw_dir: Path, tmp_path: Path):
+    import csv
+
+    from fightmatch.match.features import build_features
+    from fightmatch.scrape.columnar import SCHEMAS, table_path
+
+    out = tmp_path / "processed"
+    build_dataset(raw_dir, out)
+    for table in SCHEMAS:
+        table_path(out, table).unlink()
+    fighters = json.loads((out / "fighters.json").read_text())
+    for f in fighters:
+        f["name"] = None
+    (out / "fighters.json").write_text(json.dumps(fighters))
+    build_features(out, tmp_path / "features.csv")
+    with open(tmp_path / "features.csv", newline="") as fh:
+        rows = list(csv.DictReader(fh))
+    assert rows and all(r["name"] == r["fighter_id"] for r in rows)
+
+
+def test_build_dataset_interns_ids_stably_across_rebuilds(raw_dir: Path, tmp_path: Path):
+    from fightmatch.data import IdRegistry, load_table
+
+    out = tmp_path / "processed"
+    build_dataset(raw_dir, out, division="Welterweight")
+    first = IdRegistry.for_processed_dir(out)
+    assert first.slugs("bout") == ["bout1"]
+    build_dataset(raw_dir, out)
+    registry = IdRegistry.for_processed_dir(out)
+    # Existing slugs keep their ints; new ones are appended after them.
+    for entity in ("fighter", "bout", "event"):
+        assert registry.slugs(entity)[: len(first.slugs(entity))] == first.slugs(entity)
+    bouts = load_table(out, "bouts")
+    fighters = load_table(out, "fighters", bouts.registry)
+    # One id space: bout corners join against the fighters table as ints.
+    assert set(bouts.raw("red_fighter_id")) | set(bouts.raw("blue_fighter_id")) <= set(
+        fighters.raw("fighter_id")
+    )
+    assert [registry.get("fighter", b["red_fighter_id"]) for b in bouts.records()] == list(
+        bouts.raw("red_fighter_id")
+    )
+
+
+def test_stats_store_looks_up_rows_by_fighter_and_bout(
+    raw_dir: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    from fightmatch.data import StatsStore
+    from fightmatch.scrape.columnar import SCHEMAS, ColumnTable
+
+    def must_not_load(*args, **kwargs):
+        raise AssertionError("stats table loaded back to build stats.bin")
+
+    # stats.bin is written as stats rows stream out, not from the finished table.
+    monkeypatch.setattr(ColumnTable, "read", must_not_load)
+    out = tmp_path / "processed"
+    build_dataset(raw_dir, out)
+    monkeypatch.undo()
+    names = [name for name, _ in SCHEMAS["stats"]]
+    stats = [
+        {k: r.get(k) for k in names}
+        for r in map(json.loads, (out / "stats.jsonl").read_text().splitlines())
+    ]
+    assert stats
+
+    with StatsStore.for_processed_dir(out) as store:
+        assert store.rows == len(stats)
+        for fid in {s["fighter_id"] for s in stats}:
+            assert store.for_fighter(fid) == [s for s in stats if s["fighter_id"] == fid]
+        for bid in {s["bout_id"] for s in stats}:
+            expected = [s for s in stats if s["bout_id"] == bid]
+            assert store.for_bout(bid) == expected
+            assert len(store.rows_for_bout(bid)) == len(expected)
+        assert store.for_fighter("nobody") == []
+        assert isinstance(store.rows_for_fighter(stats[0]["fighter_id"]), memoryview)
+
+
+def test_stats_store_lookup_reads_only_the_indexed_records(tmp_path: Path):
+    from fightmatch.data import IdRegistry, StatsStore
+    from fightmatch.scrape.stats_store import _HEADER_SIZE, _RECORD, write_stats_store
+
+    records = [
+        {
+            "bout_id": f"b{i // 2}",
+            "fighter_id": f"f{i % 3}",
+            "corner": ("red", "blue")[i % 2],
+            "sig_str_landed": i,
+            "ctrl_time_seconds": float(i),
+        }
+        for i in range(10)
+    ]
+    records.append({"bout_id": None, "fighter_id": "f0", "corner": "red"})
+    registry = IdRegistry()
+    path = tmp_path / "stats.bin"
+    assert write_stats_store(path, records, registry) == 11
+
+    # Scribble over every record that is not f1's: the offsets never lead there.
+    wanted = [i for i, r in enumerate(records) if r["fighter_id"] == "f1"]
+    data = bytearray(path.read_bytes())
+    for row in range(len(records)):
+        if row not in wanted:
+            at = _HEADER_SIZE + row * _RECORD.size
+            data[at : at + _RECORD.size] = b"\xff" * _RECORD.size
+    path.write_bytes(data)
+    with StatsStore(path, registry) as store:
+        assert list(store.rows_for_fighter("f1")) == wanted
+        assert [r["sig_str_landed"] for r in store.for_fighter("f1")] == wanted
+        assert store.for_fighter("f1")[0]["td_att"] is None
+        # A row without a bout id is still indexed under its fighter.
+        assert list(store.rows_for_fighter("f0")) == [0, 3, 6, 9, 10]
+        assert list(store.rows_for_bout("b4")) == [8, 9]